@@ -0,0 +1,184 @@
+#include <functional>
+#include <iostream>
+#include <stdexcept>
+#include <vector>
+using namespace std;
+template <class Compare>
+class ExtremumTracker
+{
+    private:
+        vector<int> extremes; // every push that matched or beat the extremum, oldest first
+    public:
+        void push(int value)
+        {
+            if (extremes.empty() || !Compare()(extremes.back(), value))
+            {
+                extremes.push_back(value);
+            }
+        } // records value if it is a new extremum or ties the current one
+
+        void pop(int value)
+        {
+            if (value == extremes.back())
+            {
+                extremes.pop_back();
+            }
+        } // forgets value, which has to be the value popped from the stack
+
+        int get()
+        {
+            return extremes.back();
+        } // the extremum of the values pushed and not popped
+
+        size_t memoryBytes()
+        {
+            return extremes.capacity() * sizeof(int);
+        } // bytes allocated for the recorded extremes
+}; // Extremum (the minimum with less<int>, the maximum with greater<int>) of a
+   // stack of ints. Only the pushes that change or tie it are recorded, so
+   // unsorted data needs far fewer entries than there are values, and even
+   // sorted data (every push a new extremum) needs no more than one per value
+
+class MinStack
+{
+    private:
+        vector<int> values;
+        ExtremumTracker<less<int>> minimum;
+    public:
+        bool isEmpty()
+        {
+            return values.empty();
+        } // checks if stack empty
+
+        int size()
+        {
+            return values.size();
+        } // returns size of a stack
+
+        void push(int val)
+        {
+            values.push_back(val);
+            minimum.push(val);
+        } // pushes val onto the stack
+
+        void pop()
+        {
+            if (values.empty())
+            {
+                throw out_of_range("pop on an empty MinStack");
+            }
+            minimum.pop(values.back());
+            values.pop_back();
+        } // removes the element on top of the stack
+
+        int top()
+        {
+            if (values.empty())
+            {
+                throw out_of_range("top on an empty MinStack");
+            }
+            return values.back();
+        } // the element on top of the stack
+
+        int getMin()
+        {
+            if (values.empty())
+            {
+                throw out_of_range("getMin on an empty MinStack");
+            }
+            return minimum.get();
+        } // the minimum element in the stack, in O(1)
+
+        size_t memoryBytes()
+        {
+            return values.capacity() * sizeof(int) + minimum.memoryBytes();
+        } // bytes allocated for the values and the recorded minimums
+}; // Stack of ints with an O(1) getMin that stores the minimum only when it
+   // changes instead of next to every element
+
+class MinMaxStack
+{
+    private:
+        vector<int> values;
+        ExtremumTracker<less<int>> minimum;
+        ExtremumTracker<greater<int>> maximum;
+    public:
+        bool isEmpty()
+        {
+            return values.empty();
+        } // checks if stack empty
+
+        int size()
+        {
+            return values.size();
+        } // returns size of a stack
+
+        void push(int val)
+        {
+            values.push_back(val);
+            minimum.push(val);
+            maximum.push(val);
+        } // pushes val onto the stack
+
+        void pop()
+        {
+            if (values.empty())
+            {
+                throw out_of_range("pop on an empty MinMaxStack");
+            }
+            minimum.pop(values.back());
+            maximum.pop(values.back());
+            values.pop_back();
+        } // removes the element on top of the stack
+
+        int top()
+        {
+            if (values.empty())
+            {
+                throw out_of_range("top on an empty MinMaxStack");
+            }
+            return values.back();
+        } // the element on top of the stack
+
+        int getMin()
+        {
+            if (values.empty())
+            {
+                throw out_of_range("getMin on an empty MinMaxStack");
+            }
+            return minimum.get();
+        } // the minimum element in the stack, in O(1)
+
+        int getMax()
+        {
+            if (values.empty())
+            {
+                throw out_of_range("getMax on an empty MinMaxStack");
+            }
+            return maximum.get();
+        } // the maximum element in the stack, in O(1)
+
+        size_t memoryBytes()
+        {
+            return values.capacity() * sizeof(int) + minimum.memoryBytes() + maximum.memoryBytes();
+        } // bytes allocated for the values and the recorded extremes
+}; // Stack of ints with O(1) getMin and getMax
+
+int main()
+{
+    MinStack minStack;
+    minStack.push(-2);
+    minStack.push(0);
+    minStack.push(-3);
+    cout << "min = " << minStack.getMin() << endl;
+    minStack.pop();
+    cout << "top = " << minStack.top() << endl;
+    cout << "min = " << minStack.getMin() << endl;
+
+    MinMaxStack minMaxStack;
+    for(int value : {3, 1, 4, 1, 5, 9, 2, 6})
+    {
+        minMaxStack.push(value);
+        cout << "pushed " << value << ", min = " << minMaxStack.getMin() << ", max = " << minMaxStack.getMax() << endl;
+    }
+}
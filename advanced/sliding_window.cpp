@@ -0,0 +1,139 @@
+#include <algorithm>
+#include <functional>
+#include <iostream>
+#include <stdexcept>
+#include <vector>
+using namespace std;
+template <class T>
+struct MinOf
+{
+    T operator()(const T& a, const T& b) const
+    {
+        return b < a ? b : a;
+    }
+};
+
+template <class T>
+struct MaxOf
+{
+    T operator()(const T& a, const T& b) const
+    {
+        return a < b ? b : a;
+    }
+};
+
+template <class T, class Op>
+class WindowAggregator
+{
+    private:
+        struct Entry
+        {
+            T value;
+            T aggregate; // this value combined with every newer value below it on the front stack
+        };
+
+        Op op;
+        vector<Entry> front; // older values, oldest on top, ready to be evicted
+        vector<T> back;      // newer values, newest on top
+        T backAggregate = T(); // all of back combined, oldest first (only valid if back is not empty)
+
+        void flip()
+        {
+            while (!back.empty())
+            {
+                T value = back.back();
+                back.pop_back();
+                front.push_back({value, front.empty() ? value : op(value, front.back().aggregate)});
+            }
+        } // moves back onto front, so the oldest value ends up on top of front
+    public:
+        explicit WindowAggregator(Op op = Op()) : op(op)
+        {
+        }
+
+        bool isEmpty()
+        {
+            return front.empty() && back.empty();
+        } // checks if the window is empty
+
+        int size()
+        {
+            return front.size() + back.size();
+        } // returns the number of values in the window
+
+        void push(const T& value)
+        {
+            backAggregate = back.empty() ? value : op(backAggregate, value);
+            back.push_back(value);
+        } // adds value as the newest one, O(1)
+
+        T evict()
+        {
+            if (front.empty())
+            {
+                if (back.empty())
+                {
+                    throw out_of_range("evict on an empty WindowAggregator");
+                }
+                flip();
+            }
+            T value = front.back().value;
+            front.pop_back();
+            return value;
+        } // removes and returns the oldest value, amortized O(1)
+
+        T query()
+        {
+            if (front.empty() && back.empty())
+            {
+                throw out_of_range("query on an empty WindowAggregator");
+            }
+            if (front.empty())
+            {
+                return backAggregate;
+            }
+            return back.empty() ? front.back().aggregate : op(front.back().aggregate, backAggregate);
+        } // all values combined with op from oldest to newest, O(1)
+}; // Queue made of two stacks that keeps op (any associative operation: min,
+   // max, sum, gcd, ...) of its values. New values go onto the back stack,
+   // which only keeps their running total; evictions pop the front stack,
+   // which is refilled from the back one at a time with the aggregate of each
+   // value and everything newer stored next to it, so every value is moved
+   // once and every operation is amortized O(1) instead of O(window)
+
+template <class T, class Op>
+vector<T> slidingAggregates(const vector<T>& values, size_t window, Op op = Op())
+{
+    vector<T> results;
+    if (window == 0 || values.size() < window)
+    {
+        return results;
+    }
+    results.reserve(values.size() - window + 1);
+    WindowAggregator<T, Op> aggregator(op);
+    for (size_t i = 0; i < values.size(); i++)
+    {
+        aggregator.push(values[i]);
+        if (i >= window)
+        {
+            aggregator.evict();
+        }
+        if (i + 1 >= window)
+        {
+            results.push_back(aggregator.query());
+        }
+    }
+    return results;
+} // op of every window of `window` consecutive values, in order
+
+int main()
+{
+    vector<int> readings = {5, 3, 8, 1, 9, 2, 7, 4, 6};
+    vector<int> minimums = slidingAggregates(readings, 3, MinOf<int>());
+    vector<int> maximums = slidingAggregates(readings, 3, MaxOf<int>());
+    vector<long long> sums = slidingAggregates(vector<long long>(readings.begin(), readings.end()), 3, plus<long long>());
+    for(size_t i = 0; i < minimums.size(); i++)
+    {
+        cout << "window " << i << ": min = " << minimums[i] << ", max = " << maximums[i] << ", sum = " << sums[i] << endl;
+    }
+}
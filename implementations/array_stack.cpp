@@ -0,0 +1,125 @@
+#include <algorithm>
+#include <cstddef>
+#include <iostream>
+#include <stdexcept>
+using namespace std;
+enum class CapacityMode
+{
+    Fixed,   // push on a full stack throws overflow_error
+    Growable // push on a full stack doubles the array
+};
+
+class ArrayStack
+{
+    private:
+        static const size_t DEFAULT_CAPACITY = 1000;
+
+        int* data;
+        size_t capacityLimit;
+        size_t count = 0;
+        CapacityMode mode;
+
+        void grow()
+        {
+            size_t newCapacity = max<size_t>(capacityLimit * 2, 1);
+            int* resized = new int[newCapacity];
+            copy(data, data + count, resized);
+            delete[] data;
+            data = resized;
+            capacityLimit = newCapacity;
+        } // moves the elements into an array twice as large
+    public:
+        explicit ArrayStack(size_t capacity = DEFAULT_CAPACITY, CapacityMode mode = CapacityMode::Fixed)
+            : data(new int[capacity]), capacityLimit(capacity), mode(mode)
+        {
+        } // stack holding capacity elements before it overflows (Fixed) or grows (Growable)
+
+        ArrayStack(const ArrayStack&) = delete;
+        ArrayStack& operator=(const ArrayStack&) = delete;
+
+        ~ArrayStack()
+        {
+            delete[] data;
+        }
+
+        bool isEmpty()
+        {
+            return count == 0;
+        } // checks if stack empty
+
+        int size()
+        {
+            return count;
+        } // returns size of a stack
+
+        size_t capacity()
+        {
+            return capacityLimit;
+        } // number of elements the array holds
+
+        bool isFull()
+        {
+            return count == capacityLimit;
+        } // checks if the next push overflows or grows
+
+        void push(int value)
+        {
+            if (count == capacityLimit)
+            {
+                if (mode == CapacityMode::Fixed)
+                {
+                    throw overflow_error("push on a full ArrayStack");
+                }
+                grow();
+            }
+            data[count++] = value;
+        } // pushes value to the top of stack
+
+        int peek()
+        {
+            if (count == 0)
+            {
+                throw underflow_error("peek on an empty ArrayStack");
+            }
+            return data[count - 1];
+        } // the top element of stack
+
+        int pop()
+        {
+            int value = peek();
+            count--;
+            return value;
+        } // removes and returns the top element
+}; // Stack of ints in an array sized at construction. In Fixed mode it never
+   // allocates after construction, so pick the capacity for the workload; in
+   // Growable mode it behaves like the vector in stack.cpp.
+
+int main()
+{
+    ArrayStack stack(100);
+    for(int i = 0; i < 100; i++)
+    {
+        stack.push(i);
+    }
+    cout << "size of a stack - " << stack.size() << endl;
+    try
+    {
+        stack.push(100);
+    }
+    catch (const overflow_error& error)
+    {
+        cout << "overflow: " << error.what() << endl;
+    }
+
+    ArrayStack growable(4, CapacityMode::Growable);
+    for(int i = 0; i < 100; i++)
+    {
+        growable.push(i);
+    }
+    cout << "capacity of a growable stack after 100 pushes = " << growable.capacity() << endl;
+
+    for(;stack.size();)
+    {
+        cout << "value from stack = " << stack.pop()  << endl;
+    }
+}
@@ -0,0 +1,159 @@
+#include <algorithm>
+#include <cstddef>
+#include <cstring>
+#include <iostream>
+#include <stdexcept>
+using namespace std;
+class ChunkedStack
+{
+    private:
+        static const size_t CHUNK_SIZE = 4096; // values per chunk (16 KiB of ints)
+
+        struct Chunk
+        {
+            Chunk* previous;
+            int values[CHUNK_SIZE];
+        };
+
+        Chunk* top = nullptr;  // chunk holding the top value
+        size_t topCount = 0;   // values used in the top chunk
+        size_t count = 0;
+        Chunk* spare = nullptr; // last emptied chunk, reused by the next push
+
+        void addChunk()
+        {
+            Chunk* chunk = spare ? spare : new Chunk;
+            spare = nullptr;
+            chunk->previous = top;
+            top = chunk;
+            topCount = 0;
+        } // starts a new top chunk, reusing the spare one if there is one
+
+        void dropChunk()
+        {
+            Chunk* empty = top;
+            top = top->previous;
+            topCount = top ? CHUNK_SIZE : 0;
+            delete spare;
+            spare = empty;
+        } // retires the emptied top chunk, keeping it as the spare
+    public:
+        ChunkedStack()
+        {
+        }
+
+        ChunkedStack(const ChunkedStack&) = delete;
+        ChunkedStack& operator=(const ChunkedStack&) = delete;
+
+        ~ChunkedStack()
+        {
+            while (top)
+            {
+                Chunk* previous = top->previous;
+                delete top;
+                top = previous;
+            }
+            delete spare;
+        }
+
+        bool isEmpty()
+        {
+            return count == 0;
+        } // checks if stack empty
+
+        int size()
+        {
+            return count;
+        } // returns size of a stack
+
+        void push(int value)
+        {
+            if (topCount == CHUNK_SIZE || !top)
+            {
+                addChunk();
+            }
+            top->values[topCount++] = value;
+            count++;
+        } // pushes value to the top of stack, never copies existing values
+
+        int peek()
+        {
+            if (count == 0)
+            {
+                throw out_of_range("peek on an empty ChunkedStack");
+            }
+            return top->values[topCount - 1];
+        } // the top element of stack
+
+        int pop()
+        {
+            int value = peek();
+            topCount--;
+            count--;
+            if (topCount == 0)
+            {
+                dropChunk();
+            }
+            return value;
+        } // removes and returns the top element
+
+        void pushRange(const int* values, size_t n)
+        {
+            while (n > 0)
+            {
+                if (topCount == CHUNK_SIZE || !top)
+                {
+                    addChunk();
+                }
+                size_t copied = min(n, CHUNK_SIZE - topCount);
+                memcpy(top->values + topCount, values, copied * sizeof(int));
+                topCount += copied;
+                count += copied;
+                values += copied;
+                n -= copied;
+            }
+        } // pushes n values chunk by chunk, the last one ends up on top
+
+        size_t popN(int* out, size_t n)
+        {
+            n = min(n, count);
+            for (size_t i = 0; i < n; )
+            {
+                size_t taken = min(n - i, topCount);
+                for (size_t j = 0; j < taken; j++)
+                {
+                    out[i + j] = top->values[topCount - 1 - j];
+                }
+                topCount -= taken;
+                count -= taken;
+                i += taken;
+                if (topCount == 0)
+                {
+                    dropChunk();
+                }
+            }
+            return n;
+        } // pops up to n values into out (top first), returns how many were popped
+}; // Stack of ints built from a linked list of fixed-size chunks: unlike the
+   // vector behind Stack it never reallocates and copies, so every push is
+   // O(1) in the worst case, at the cost of a pointer hop every CHUNK_SIZE values
+
+int main()
+{
+    ChunkedStack stack;
+    stack.push(10);
+    cout << "peek into stack = " << stack.peek() << endl;
+    for(int i = 0; i< 10000; i++) 
+    {
+        stack.push(i);
+    }
+    cout << "size of a stack - " << stack.size() << endl;
+
+    int top[5];
+    size_t popped = stack.popN(top, 5);
+    for(size_t i = 0; i < popped; i++)
+    {
+        cout << "value from stack = " << top[i] << endl;
+    }
+    cout << "size of a stack - " << stack.size() << endl;
+}
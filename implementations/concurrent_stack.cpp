@@ -0,0 +1,603 @@
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <iostream>
+#include <memory>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+using namespace std;
+class LockFreeStack
+{
+    private:
+        static const uint32_t NIL = UINT32_MAX;     // index meaning "no node"
+        static const unsigned FIRST_SEGMENT_BITS = 10; // the first segment has 1024 nodes
+        static const unsigned SEGMENTS = 32 - FIRST_SEGMENT_BITS;
+        static const uint32_t CAPACITY = (uint32_t) ((1ull << 32) - (1u << FIRST_SEGMENT_BITS)); // nodes the segments hold
+
+        struct Node
+        {
+            atomic<int> value;
+            atomic<uint32_t> next;
+        };
+
+        // Nodes live in segments of doubling size that are only freed by the
+        // destructor, so a thread that lost a race may still read a popped node
+        atomic<Node*> segments[SEGMENTS] = {};
+        atomic<uint32_t> fresh{0}; // nodes handed out from the segments so far
+
+        // Both lists pack (tag << 32 | index) into one word; the tag changes
+        // on every successful update, so a head that was popped and pushed
+        // back in the meantime (ABA) makes a stale compare-exchange fail
+        atomic<uint64_t> head{NIL};
+        atomic<uint64_t> freeHead{NIL};
+        atomic<int> count{0};
+
+        static uint32_t indexOf(uint64_t word)
+        {
+            return (uint32_t) word;
+        }
+
+        static uint64_t replaceIndex(uint64_t word, uint32_t index)
+        {
+            return ((word >> 32) + 1) << 32 | index;
+        } // the same list with a new head index and the next tag
+
+        Node& node(uint32_t index)
+        {
+            uint64_t position = (uint64_t) index + (1u << FIRST_SEGMENT_BITS);
+            unsigned segment = 63 - __builtin_clzll(position) - FIRST_SEGMENT_BITS;
+            return segments[segment].load(memory_order_acquire)[position - (1ull << (segment + FIRST_SEGMENT_BITS))];
+        } // segment k holds the 1024 << k nodes starting at index 1024 * (2^k - 1)
+
+        void pushIndex(atomic<uint64_t>& list, uint32_t index)
+        {
+            uint64_t top = list.load(memory_order_relaxed);
+            do
+            {
+                node(index).next.store(indexOf(top), memory_order_relaxed);
+            } while (!list.compare_exchange_weak(top, replaceIndex(top, index),
+                                                 memory_order_release, memory_order_relaxed));
+        } // links the node at index on top of list
+
+        uint32_t popIndex(atomic<uint64_t>& list)
+        {
+            uint64_t top = list.load(memory_order_acquire);
+            while (indexOf(top) != NIL)
+            {
+                uint32_t next = node(indexOf(top)).next.load(memory_order_relaxed);
+                if (list.compare_exchange_weak(top, replaceIndex(top, next),
+                                               memory_order_acquire, memory_order_acquire))
+                {
+                    return indexOf(top);
+                }
+            }
+            return NIL;
+        } // unlinks the top node of list and returns its index (NIL if empty)
+
+        uint32_t allocate()
+        {
+            uint32_t index = popIndex(freeHead);
+            if (index != NIL)
+            {
+                return index;
+            }
+            index = fresh.load(memory_order_relaxed);
+            do
+            {
+                if (index >= CAPACITY)
+                {
+                    throw length_error("LockFreeStack is out of node indices");
+                }
+            } while (!fresh.compare_exchange_weak(index, index + 1, memory_order_relaxed));
+            uint64_t position = (uint64_t) index + (1u << FIRST_SEGMENT_BITS);
+            unsigned segment = 63 - __builtin_clzll(position) - FIRST_SEGMENT_BITS;
+            if (!segments[segment].load(memory_order_acquire))
+            {
+                Node* created = new Node[(size_t) 1 << (segment + FIRST_SEGMENT_BITS)];
+                Node* expected = nullptr;
+                if (!segments[segment].compare_exchange_strong(expected, created, memory_order_acq_rel))
+                {
+                    delete[] created;
+                }
+            }
+            return index;
+        } // a recycled node, or a fresh one from the segments (allocating the segment if needed)
+    protected:
+        // Single attempts at the shared top for stacks that do something else
+        // when they lose a race (see EliminationStack)
+        enum class Attempt
+        {
+            Done,
+            Empty,
+            Contended // another thread changed the top first
+        };
+
+        uint32_t createNode(int value)
+        {
+            uint32_t index = allocate();
+            node(index).value.store(value, memory_order_relaxed);
+            return index;
+        } // a node holding value that is not on the stack yet
+
+        void destroyNode(uint32_t index)
+        {
+            pushIndex(freeHead, index);
+        } // recycles a node that never made it onto the stack
+
+        bool tryPushNode(uint32_t index)
+        {
+            uint64_t top = head.load(memory_order_relaxed);
+            node(index).next.store(indexOf(top), memory_order_relaxed);
+            if (!head.compare_exchange_strong(top, replaceIndex(top, index),
+                                              memory_order_release, memory_order_relaxed))
+            {
+                return false;
+            }
+            count.fetch_add(1, memory_order_relaxed);
+            return true;
+        } // one attempt to link the node on top, false if another thread got there first
+
+        Attempt tryPopOnce(int& value)
+        {
+            uint64_t top = head.load(memory_order_acquire);
+            if (indexOf(top) == NIL)
+            {
+                return Attempt::Empty;
+            }
+            uint32_t next = node(indexOf(top)).next.load(memory_order_relaxed);
+            if (!head.compare_exchange_strong(top, replaceIndex(top, next),
+                                              memory_order_acquire, memory_order_relaxed))
+            {
+                return Attempt::Contended;
+            }
+            count.fetch_sub(1, memory_order_relaxed);
+            value = node(indexOf(top)).value.load(memory_order_relaxed);
+            pushIndex(freeHead, indexOf(top));
+            return Attempt::Done;
+        } // one attempt to unlink the top node and read its value
+    public:
+        LockFreeStack()
+        {
+        }
+
+        LockFreeStack(const LockFreeStack&) = delete;
+        LockFreeStack& operator=(const LockFreeStack&) = delete;
+
+        ~LockFreeStack()
+        {
+            for (auto& segment : segments)
+            {
+                delete[] segment.load();
+            }
+        }
+
+        bool isEmpty()
+        {
+            return indexOf(head.load(memory_order_acquire)) == NIL;
+        } // checks if stack empty
+
+        int size()
+        {
+            return max(count.load(memory_order_relaxed), 0);
+        } // returns size of a stack (approximate while other threads push or pop)
+
+        void push(int value)
+        {
+            uint32_t index = createNode(value);
+            while (!tryPushNode(index))
+            {
+            }
+        } // pushes value to the top of stack
+
+        bool tryPop(int& value)
+        {
+            Attempt attempt;
+            do
+            {
+                attempt = tryPopOnce(value);
+            } while (attempt == Attempt::Contended);
+            return attempt == Attempt::Done;
+        } // pops the top element into value, returns false if the stack was empty
+
+        int peek()
+        {
+            uint64_t top = head.load(memory_order_acquire);
+            while (true)
+            {
+                if (indexOf(top) == NIL)
+                {
+                    throw out_of_range("peek on an empty LockFreeStack");
+                }
+                int value = node(indexOf(top)).value.load(memory_order_relaxed);
+                uint64_t again = head.load(memory_order_acquire);
+                if (again == top)
+                {
+                    return value;
+                }
+                top = again;
+            }
+        } // the top element of stack at some moment during the call
+
+        int pop()
+        {
+            int value;
+            if (!tryPop(value))
+            {
+                throw out_of_range("pop on an empty LockFreeStack");
+            }
+            return value;
+        } // removes and returns the top element
+}; // Treiber stack of ints that any number of threads can use at once without
+   // locks. Nodes are addressed by 32-bit indices so a tag fits next to the
+   // head index in one atomic word, and popped nodes are recycled through a
+   // second lock-free list instead of being freed, which keeps stale readers safe
+
+class EliminationStack : public LockFreeStack
+{
+    private:
+        static const unsigned SLOTS = 16;      // exchange slots; more threads need more
+        static const unsigned PATIENCE = 256;  // polls a waiting push makes before retrying the stack
+
+        // A slot is EMPTY, OFFERED by a waiting push (value in the low bits)
+        // or TAKEN by the pop that received that value
+        static const uint64_t EMPTY = 0;
+        static const uint64_t OFFERED = 1ull << 32;
+        static const uint64_t TAKEN = 2ull << 32;
+
+        struct alignas(64) Slot
+        {
+            atomic<uint64_t> state{EMPTY};
+        };
+
+        Slot slots[SLOTS];
+
+        static unsigned randomSlot()
+        {
+            static thread_local uint32_t state = 2463534242u ^ (uint32_t) (uintptr_t) &state;
+            state ^= state << 13;
+            state ^= state >> 17;
+            state ^= state << 5;
+            return state % SLOTS;
+        } // per-thread xorshift, so threads spread over the slots
+
+        bool offer(int value)
+        {
+            atomic<uint64_t>& state = slots[randomSlot()].state;
+            uint64_t expected = EMPTY;
+            uint64_t offered = OFFERED | (uint32_t) value;
+            if (!state.compare_exchange_strong(expected, offered, memory_order_acq_rel))
+            {
+                return false;
+            }
+            for (unsigned i = 0; i < PATIENCE; i++)
+            {
+                if (state.load(memory_order_acquire) == TAKEN)
+                {
+                    state.store(EMPTY, memory_order_release);
+                    return true;
+                }
+            }
+            if (state.compare_exchange_strong(offered, EMPTY, memory_order_acq_rel))
+            {
+                return false;
+            }
+            state.store(EMPTY, memory_order_release);
+            return true;
+        } // waits in a random slot for a pop to take value, true if one did
+
+        bool take(int& value)
+        {
+            atomic<uint64_t>& state = slots[randomSlot()].state;
+            uint64_t seen = state.load(memory_order_acquire);
+            if ((seen & ~0xFFFFFFFFull) != OFFERED
+                || !state.compare_exchange_strong(seen, TAKEN, memory_order_acq_rel))
+            {
+                return false;
+            }
+            value = (int) (uint32_t) seen;
+            return true;
+        } // takes the value waiting in a random slot, if there is one
+    public:
+        void push(int value)
+        {
+            uint32_t index = createNode(value);
+            while (!tryPushNode(index))
+            {
+                if (offer(value))
+                {
+                    destroyNode(index);
+                    return;
+                }
+            }
+        } // pushes value, or hands it straight to a concurrent pop when the top is contended
+
+        bool tryPop(int& value)
+        {
+            while (true)
+            {
+                Attempt attempt = tryPopOnce(value);
+                if (attempt != Attempt::Contended)
+                {
+                    return attempt == Attempt::Done || take(value);
+                }
+                if (take(value))
+                {
+                    return true;
+                }
+            }
+        } // pops the top element, or a value offered by a concurrent push, into value
+
+        int pop()
+        {
+            int value;
+            if (!tryPop(value))
+            {
+                throw out_of_range("pop on an empty EliminationStack");
+            }
+            return value;
+        } // removes and returns the top element
+}; // LockFreeStack with an elimination array in front: a push and a pop that
+   // both lose the race for the top meet in a random slot and cancel out,
+   // so under contention pairs complete without touching the shared top.
+   // size() only counts the values on the stack, not those being handed over
+
+class WorkStealingDeque
+{
+    private:
+        struct Ring
+        {
+            long long mask;
+            unique_ptr<atomic<int>[]> cells;
+
+            explicit Ring(long long capacity) : mask(capacity - 1), cells(new atomic<int>[capacity])
+            {
+            }
+
+            int get(long long i)
+            {
+                return cells[i & mask].load(memory_order_relaxed);
+            }
+
+            void put(long long i, int value)
+            {
+                cells[i & mask].store(value, memory_order_relaxed);
+            }
+        }; // circular buffer with a power-of-two capacity
+
+        alignas(64) atomic<long long> top{0};    // next index to steal, advanced by thieves
+        alignas(64) atomic<long long> bottom{0}; // next index to push, moved by the owner
+        atomic<Ring*> ring;
+        vector<unique_ptr<Ring>> rings; // every ring so far: a thief may still read an old one
+
+        Ring* grow(Ring* old, long long t, long long b)
+        {
+            rings.emplace_back(new Ring((old->mask + 1) * 2));
+            Ring* grown = rings.back().get();
+            for (long long i = t; i < b; i++)
+            {
+                grown->put(i, old->get(i));
+            }
+            ring.store(grown, memory_order_release);
+            return grown;
+        } // copies the live elements into a ring twice as large
+    public:
+        explicit WorkStealingDeque(long long capacity = 1024)
+        {
+            rings.emplace_back(new Ring(capacity));
+            ring.store(rings.back().get(), memory_order_relaxed);
+        } // capacity has to be a power of two
+
+        bool isEmpty()
+        {
+            return size() == 0;
+        } // checks if deque empty
+
+        int size()
+        {
+            long long b = bottom.load(memory_order_relaxed);
+            long long t = top.load(memory_order_relaxed);
+            return b > t ? (int) (b - t) : 0;
+        } // returns size of the deque (approximate while other threads steal)
+
+        void push(int value)
+        {
+            long long b = bottom.load(memory_order_relaxed);
+            long long t = top.load(memory_order_acquire);
+            Ring* r = ring.load(memory_order_relaxed);
+            if (b - t > r->mask)
+            {
+                r = grow(r, t, b);
+            }
+            r->put(b, value);
+            atomic_thread_fence(memory_order_release);
+            bottom.store(b + 1, memory_order_relaxed);
+        } // owner only: pushes value at the bottom
+
+        bool tryPop(int& value)
+        {
+            long long b = bottom.load(memory_order_relaxed) - 1;
+            Ring* r = ring.load(memory_order_relaxed);
+            bottom.store(b, memory_order_relaxed);
+            atomic_thread_fence(memory_order_seq_cst);
+            long long t = top.load(memory_order_relaxed);
+            if (t > b)
+            {
+                bottom.store(b + 1, memory_order_relaxed);
+                return false;
+            }
+            value = r->get(b);
+            if (t == b)
+            {
+                // Last element: race the thieves for it
+                bool won = top.compare_exchange_strong(t, t + 1, memory_order_seq_cst, memory_order_relaxed);
+                bottom.store(b + 1, memory_order_relaxed);
+                return won;
+            }
+            return true;
+        } // owner only: pops the newest value from the bottom, false if empty
+
+        bool trySteal(int& value)
+        {
+            long long t = top.load(memory_order_acquire);
+            atomic_thread_fence(memory_order_seq_cst);
+            long long b = bottom.load(memory_order_acquire);
+            if (t >= b)
+            {
+                return false;
+            }
+            value = ring.load(memory_order_acquire)->get(t);
+            return top.compare_exchange_strong(t, t + 1, memory_order_seq_cst, memory_order_relaxed);
+        } // any thread: takes the oldest value from the top, false if empty or another thread won it
+}; // Chase-Lev deque of ints: one owner thread uses the bottom like a stack
+   // without any compare-exchange except for the last element, while other
+   // threads steal from the top
+
+class ShardedStack
+{
+    private:
+        vector<unique_ptr<WorkStealingDeque>> shards;
+        atomic<int> registered{0};
+
+        bool trySteal(int thief, int& value)
+        {
+            int workers = min(registered.load(memory_order_acquire), (int) shards.size());
+            bool contended = true;
+            while (contended)
+            {
+                contended = false;
+                for (int i = 1; i < workers; i++)
+                {
+                    WorkStealingDeque& victim = *shards[(thief + i) % workers];
+                    if (victim.trySteal(value))
+                    {
+                        return true;
+                    }
+                    contended = contended || !victim.isEmpty();
+                }
+            }
+            return false;
+        } // steals from the other shards in turn until one gives a value or all are empty
+    public:
+        class Worker
+        {
+            private:
+                ShardedStack* stack;
+                int id;
+            public:
+                Worker(ShardedStack* stack, int id) : stack(stack), id(id)
+                {
+                }
+
+                int index()
+                {
+                    return id;
+                } // position of this worker's shard
+
+                void push(int value)
+                {
+                    stack->shards[id]->push(value);
+                } // pushes value onto this worker's shard
+
+                bool tryPop(int& value)
+                {
+                    return stack->shards[id]->tryPop(value) || stack->trySteal(id, value);
+                } // pops the newest value of this worker's shard, or steals the oldest of another
+
+                int pop()
+                {
+                    int value;
+                    if (!tryPop(value))
+                    {
+                        throw out_of_range("pop on an empty ShardedStack");
+                    }
+                    return value;
+                } // removes and returns a value, throws if every shard is empty
+        }; // handle through which one thread uses its own shard
+
+        explicit ShardedStack(int maxWorkers)
+        {
+            for (int i = 0; i < maxWorkers; i++)
+            {
+                shards.emplace_back(new WorkStealingDeque());
+            }
+        } // stack for up to maxWorkers threads
+
+        Worker registerWorker()
+        {
+            int id = registered.fetch_add(1, memory_order_acq_rel);
+            if (id >= (int) shards.size())
+            {
+                registered.fetch_sub(1, memory_order_acq_rel);
+                throw length_error("ShardedStack has no shard left for another worker");
+            }
+            return Worker(this, id);
+        } // gives the calling thread a shard of its own; keep the Worker for that thread only
+
+        bool isEmpty()
+        {
+            return size() == 0;
+        } // checks if every shard is empty
+
+        int size()
+        {
+            int total = 0;
+            for (auto& shard : shards)
+            {
+                total += shard->size();
+            }
+            return total;
+        } // returns the number of values in all shards (approximate while workers run)
+}; // Stack of ints split into one Chase-Lev deque per worker thread. Each worker
+   // pushes and pops its own shard in LIFO order without contention and steals
+   // the oldest values of other shards when its own runs dry, so there is no
+   // global LIFO order, only per-thread LIFO with load balancing
+
+int main()
+{
+    LockFreeStack stack;
+    vector<thread> threads;
+    for(int t = 0; t < 4; t++)
+    {
+        threads.emplace_back([&stack, t]() {
+            for(int i = 0; i < 1000; i++)
+            {
+                stack.push(t * 1000 + i);
+            }
+        });
+    }
+    for(auto& worker : threads)
+    {
+        worker.join();
+    }
+    cout << "size of a stack - " << stack.size() << endl;
+    cout << "peeking in stack = " << stack.peek() << endl;
+
+    int value;
+    int popped = 0;
+    while(stack.tryPop(value))
+    {
+        popped++;
+    }
+    cout << "values popped by one thread = " << popped << endl;
+
+    EliminationStack eliminating;
+    for(int i = 0; i < 100; i++)
+    {
+        eliminating.push(i);
+    }
+    cout << "peek into elimination stack = " << eliminating.peek() << endl;
+
+    ShardedStack sharded(2);
+    ShardedStack::Worker owner = sharded.registerWorker();
+    for(int i = 0; i < 100; i++)
+    {
+        owner.push(i);
+    }
+    thread thief([&sharded]() {
+        ShardedStack::Worker worker = sharded.registerWorker();
+        cout << "value stolen by another worker = " << worker.pop() << endl;
+    });
+    thief.join();
+    cout << "size of a sharded stack - " << sharded.size() << endl;
+}
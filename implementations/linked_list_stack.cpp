@@ -0,0 +1,187 @@
+#include <cstddef>
+#include <iostream>
+#include <stdexcept>
+using namespace std;
+struct Node
+{
+    int value;
+    Node* next;
+}; // one element of a LinkedListStack and the link to the element below it
+
+class NodePool
+{
+    private:
+        static const size_t SLAB_NODES = 256; // nodes allocated at once
+
+        struct Slab
+        {
+            Slab* next;
+            Node nodes[SLAB_NODES];
+        };
+
+        Slab* slabs = nullptr;    // every slab allocated so far
+        Node* freeList = nullptr; // released nodes, linked through next
+        size_t used = 0;          // nodes handed out from the newest slab
+
+        void addSlab()
+        {
+            Slab* slab = new Slab;
+            slab->next = slabs;
+            slabs = slab;
+            used = 0;
+        } // allocates a fresh slab to carve nodes from
+    public:
+        NodePool()
+        {
+        }
+
+        NodePool(const NodePool&) = delete;
+        NodePool& operator=(const NodePool&) = delete;
+
+        ~NodePool()
+        {
+            while (slabs)
+            {
+                Slab* next = slabs->next;
+                delete slabs;
+                slabs = next;
+            }
+        } // frees every slab, including nodes still in use
+
+        Node* allocate(int value, Node* next)
+        {
+            Node* node;
+            if (freeList)
+            {
+                node = freeList;
+                freeList = freeList->next;
+            }
+            else
+            {
+                if (!slabs || used == SLAB_NODES)
+                {
+                    addSlab();
+                }
+                node = &slabs->nodes[used++];
+            }
+            node->value = value;
+            node->next = next;
+            return node;
+        } // reuses the most recently released node, or takes the next one of the newest slab
+
+        void release(Node* node)
+        {
+            node->next = freeList;
+            freeList = node;
+        } // puts node back on the free list for the next allocate
+
+        size_t slabCount()
+        {
+            size_t count = 0;
+            for (Slab* slab = slabs; slab; slab = slab->next)
+            {
+                count++;
+            }
+            return count;
+        } // number of slabs allocated, SLAB_NODES nodes each
+}; // hands out Nodes from slabs and recycles released ones through a free list,
+   // so pushes and pops rarely reach malloc and neighbouring nodes share cache lines
+
+class LinkedListStack
+{
+    private:
+        NodePool ownPool;
+        NodePool* pool;
+        Node* top = nullptr;
+        int count = 0;
+    public:
+        LinkedListStack() : pool(&ownPool)
+        {
+        } // stack with a pool of its own
+
+        explicit LinkedListStack(NodePool& shared) : pool(&shared)
+        {
+        } // stack taking its nodes from a pool shared with other stacks; the
+          // pool has to outlive the stack
+
+        LinkedListStack(const LinkedListStack&) = delete;
+        LinkedListStack& operator=(const LinkedListStack&) = delete;
+
+        ~LinkedListStack()
+        {
+            if (pool == &ownPool)
+            {
+                return;
+            }
+            while (top)
+            {
+                Node* next = top->next;
+                pool->release(top);
+                top = next;
+            }
+        } // gives the remaining nodes back to a shared pool; an own pool frees them all at once
+
+        bool isEmpty()
+        {
+            return top == nullptr;
+        } // checks if stack empty
+
+        int size()
+        {
+            return count;
+        } // returns size of a stack
+
+        void push(int value)
+        {
+            top = pool->allocate(value, top);
+            count++;
+        } // pushes value to the top of stack
+
+        int peek()
+        {
+            if (!top)
+            {
+                throw underflow_error("peek on an empty LinkedListStack");
+            }
+            return top->value;
+        } // the top element of stack
+
+        int pop()
+        {
+            int value = peek();
+            Node* node = top;
+            top = top->next;
+            pool->release(node);
+            count--;
+            return value;
+        } // removes and returns the top element
+}; // Stack of ints as a singly linked list whose nodes come from a NodePool.
+   // Compared with the vector in stack.cpp it never copies elements to grow,
+   // but every element carries a pointer and walking it chases pointers.
+
+int main()
+{
+    LinkedListStack stack;
+    stack.push(10);
+    cout << "peek into stack = " << stack.peek() << endl;
+    for(int i = 0; i< 100; i++) 
+    {
+        stack.push(i);
+    }
+    cout << "size of a stack - " << stack.size() << endl;
+
+    NodePool shared;
+    LinkedListStack first(shared);
+    LinkedListStack second(shared);
+    for(int i = 0; i < 1000; i++)
+    {
+        first.push(i);
+        second.push(first.pop());
+    }
+    cout << "slabs used by two stacks sharing a pool = " << shared.slabCount() << endl;
+
+    for(;stack.size();)
+    {
+        cout << "value from stack = " << stack.pop()  << endl;
+    }
+}
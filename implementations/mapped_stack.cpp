@@ -0,0 +1,198 @@
+#include <algorithm>
+#include <cerrno>
+#include <cstdint>
+#include <iostream>
+#include <stdexcept>
+#include <string>
+#include <system_error>
+#if !defined(__unix__) && !defined(__APPLE__)
+#error "MappedStack needs mmap and is only available on POSIX systems"
+#endif
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+using namespace std;
+class MappedStack
+{
+    private:
+        static const uint64_t MAGIC = 0x31304b4341545354ull; // "TSTACK01" read as little-endian
+        static const size_t HOT_WINDOW = (size_t) 1 << 20;   // values around the top kept resident
+        static const size_t INITIAL_CAPACITY = HOT_WINDOW;
+
+        struct Header
+        {
+            uint64_t magic;
+            uint64_t count;
+            uint64_t reserved[6];
+        }; // first 64 bytes of the file, followed by the values bottom first
+
+        int fd = -1;
+        size_t mappedBytes = 0;
+        Header* header = nullptr;
+        int* values = nullptr;
+        size_t capacityLimit = 0;
+
+        static void check(bool ok, const char* what)
+        {
+            if (!ok)
+            {
+                throw system_error(errno, generic_category(), what);
+            }
+        }
+
+        void map(size_t bytes)
+        {
+            if (header)
+            {
+                munmap(header, mappedBytes);
+                header = nullptr;
+            }
+            void* address = mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+            check(address != MAP_FAILED, "mmap");
+            mappedBytes = bytes;
+            header = (Header*) address;
+            values = (int*) (header + 1);
+            capacityLimit = (bytes - sizeof(Header)) / sizeof(int);
+        } // maps the first bytes of the file, replacing the previous mapping
+
+        void advise()
+        {
+            size_t page = sysconf(_SC_PAGESIZE);
+            size_t count = header->count;
+            uintptr_t base = (uintptr_t) values;
+            uintptr_t hotStart = base + (count > HOT_WINDOW ? count - HOT_WINDOW : 0) * sizeof(int);
+            uintptr_t hotEnd = base + min(count + HOT_WINDOW, capacityLimit) * sizeof(int);
+            uintptr_t end = base + capacityLimit * sizeof(int);
+            hotStart &= ~(uintptr_t) (page - 1);
+            hotEnd = (hotEnd + page - 1) & ~(uintptr_t) (page - 1);
+            madvise((void*) hotStart, hotEnd - hotStart, MADV_WILLNEED);
+            if (end > hotEnd + page)
+            {
+                madvise((void*) hotEnd, (end & ~(uintptr_t) (page - 1)) - hotEnd, MADV_DONTNEED);
+            }
+        } // asks the kernel to page in the values around the top and to drop the dead pages above it
+
+        void grow()
+        {
+            size_t bytes = sizeof(Header) + max(capacityLimit * 2, (size_t) INITIAL_CAPACITY) * sizeof(int);
+            check(ftruncate(fd, bytes) == 0, "ftruncate");
+            map(bytes);
+            advise();
+        } // doubles the file (at least to INITIAL_CAPACITY, as a file may hold no values yet) and maps it again
+    public:
+        explicit MappedStack(const string& path)
+        {
+            fd = open(path.c_str(), O_RDWR | O_CREAT, 0644);
+            check(fd >= 0, "open");
+            try
+            {
+                struct stat status;
+                check(fstat(fd, &status) == 0, "fstat");
+                bool created = status.st_size == 0;
+                if (created)
+                {
+                    check(ftruncate(fd, sizeof(Header) + INITIAL_CAPACITY * sizeof(int)) == 0, "ftruncate");
+                    status.st_size = sizeof(Header) + INITIAL_CAPACITY * sizeof(int);
+                }
+                if ((size_t) status.st_size < sizeof(Header))
+                {
+                    throw runtime_error(path + " is not a MappedStack file");
+                }
+                map(status.st_size);
+                if (created)
+                {
+                    header->magic = MAGIC;
+                    header->count = 0;
+                }
+                else if (header->magic != MAGIC || header->count > capacityLimit)
+                {
+                    throw runtime_error(path + " is not a MappedStack file");
+                }
+            }
+            catch (...)
+            {
+                if (header)
+                {
+                    munmap(header, mappedBytes);
+                }
+                close(fd);
+                throw;
+            }
+            advise();
+        } // opens the stack stored in path, creating an empty one if the file is new or empty
+
+        MappedStack(const MappedStack&) = delete;
+        MappedStack& operator=(const MappedStack&) = delete;
+
+        ~MappedStack()
+        {
+            munmap(header, mappedBytes);
+            close(fd);
+        } // the values stay in the file; reopen it to continue
+
+        bool isEmpty()
+        {
+            return header->count == 0;
+        } // checks if stack empty
+
+        size_t size()
+        {
+            return header->count;
+        } // returns size of a stack (size_t, as it may hold more values than an int can count)
+
+        size_t capacity()
+        {
+            return capacityLimit;
+        } // number of values the file holds before it grows
+
+        void push(int value)
+        {
+            if (header->count == capacityLimit)
+            {
+                grow();
+            }
+            values[header->count++] = value;
+        } // pushes value to the top of stack
+
+        int peek()
+        {
+            if (header->count == 0)
+            {
+                throw out_of_range("peek on an empty MappedStack");
+            }
+            return values[header->count - 1];
+        } // the top element of stack
+
+        int pop()
+        {
+            int value = peek();
+            header->count--;
+            if (header->count % HOT_WINDOW == 0)
+            {
+                advise();
+            }
+            return value;
+        } // removes and returns the top element
+
+        void sync()
+        {
+            check(msync(header, mappedBytes, MS_SYNC) == 0, "msync");
+        } // writes the values to disk now instead of whenever the kernel does
+}; // Stack of ints stored in a memory-mapped file that doubles when full, so a
+   // stack larger than RAM pages to disk instead of running out of memory.
+   // The count lives in the file as well: opening the same path again gives
+   // back the same stack
+
+int main()
+{
+    MappedStack stack("mapped_stack.data");
+    cout << "values kept from the last run = " << stack.size() << endl;
+    for(int i = 0; i < 100; i++)
+    {
+        stack.push(i);
+    }
+    cout << "size of a stack - " << stack.size() << endl;
+    cout << "peek into stack = " << stack.peek() << endl;
+    stack.sync();
+}
@@ -0,0 +1,119 @@
+#include <iostream>
+#include <stdexcept>
+#include <utility>
+using namespace std;
+class PersistentStack
+{
+    private:
+        struct Node
+        {
+            int value;
+            int depth;   // number of values from this node down
+            size_t refs; // stacks and nodes pointing at this node
+            Node* next;
+        };
+
+        Node* top;
+
+        explicit PersistentStack(Node* top) : top(top)
+        {
+        } // takes over one reference to top
+
+        static Node* retain(Node* node)
+        {
+            if (node)
+            {
+                node->refs++;
+            }
+            return node;
+        }
+
+        static void release(Node* node)
+        {
+            while (node && --node->refs == 0)
+            {
+                Node* next = node->next;
+                delete node;
+                node = next;
+            }
+        } // frees the nodes nothing else refers to, in a loop so long chains cannot overflow the call stack
+    public:
+        PersistentStack() : top(nullptr)
+        {
+        }
+
+        PersistentStack(const PersistentStack& other) : top(retain(other.top))
+        {
+        } // O(1) snapshot: both stacks share every node
+
+        PersistentStack(PersistentStack&& other) : top(other.top)
+        {
+            other.top = nullptr;
+        }
+
+        PersistentStack& operator=(PersistentStack other)
+        {
+            swap(top, other.top);
+            return *this;
+        }
+
+        ~PersistentStack()
+        {
+            release(top);
+        }
+
+        bool isEmpty() const
+        {
+            return top == nullptr;
+        } // checks if stack empty
+
+        int size() const
+        {
+            return top ? top->depth : 0;
+        } // returns size of a stack
+
+        int peek() const
+        {
+            if (!top)
+            {
+                throw out_of_range("peek on an empty PersistentStack");
+            }
+            return top->value;
+        } // the top element of stack
+
+        PersistentStack push(int value) const
+        {
+            return PersistentStack(new Node{value, size() + 1, 1, retain(top)});
+        } // a new version with value on top; this one is unchanged
+
+        PersistentStack pop() const
+        {
+            if (!top)
+            {
+                throw out_of_range("pop on an empty PersistentStack");
+            }
+            return PersistentStack(retain(top->next));
+        } // a new version without the top element; this one is unchanged
+}; // Immutable stack of ints: push and pop return new versions that share all
+   // older nodes with this one, so keeping a version around (a checkpoint to
+   // roll back to) costs O(1) time and memory. Nodes are reference counted
+   // without atomics, so a version must not be shared between threads
+
+int main()
+{
+    PersistentStack stack;
+    for(int i = 0; i < 100; i++)
+    {
+        stack = stack.push(i);
+    }
+    PersistentStack checkpoint = stack;
+    cout << "size of a stack - " << stack.size() << endl;
+
+    for(int i = 0; i < 50; i++)
+    {
+        stack = stack.pop();
+    }
+    cout << "peek into stack after popping = " << stack.peek() << endl;
+    cout << "peek into checkpoint = " << checkpoint.peek() << endl;
+    cout << "size of checkpoint - " << checkpoint.size() << endl;
+}
@@ -0,0 +1,207 @@
+#include <algorithm>
+#include <cstddef>
+#include <iostream>
+#include <new>
+#include <stdexcept>
+#include <string>
+#include <utility>
+using namespace std;
+template <class T, size_t InlineN = 16>
+class SmallStack
+{
+    private:
+        alignas(T) unsigned char inlineStorage[(InlineN > 0 ? InlineN : 1) * sizeof(T)];
+        T* items;
+        size_t count;
+        size_t cap;
+
+        T* inlineItems()
+        {
+            return reinterpret_cast<T*>(inlineStorage);
+        } // the first InlineN elements live here, inside the object
+
+        void release()
+        {
+            if (items != inlineItems())
+            {
+                ::operator delete(items);
+            }
+            items = inlineItems();
+            cap = InlineN;
+        } // frees the heap buffer, if any (the stack must be empty)
+
+        void grow(size_t needed)
+        {
+            size_t newCapacity = max(needed, max(cap * 2, (size_t) 4));
+            T* moved = static_cast<T*>(::operator new(newCapacity * sizeof(T)));
+            for (size_t i = 0; i < count; i++)
+            {
+                new (moved + i) T(std::move(items[i]));
+                items[i].~T();
+            }
+            size_t kept = count;
+            count = 0;
+            release();
+            items = moved;
+            count = kept;
+            cap = newCapacity;
+        } // spills the elements to a bigger heap buffer
+
+        void takeFrom(SmallStack&& other)
+        {
+            if (other.items != other.inlineItems())
+            {
+                items = other.items;
+                count = other.count;
+                cap = other.cap;
+                other.items = other.inlineItems();
+                other.count = 0;
+                other.cap = InlineN;
+            }
+            else
+            {
+                for (size_t i = 0; i < other.count; i++)
+                {
+                    new (items + i) T(std::move(other.items[i]));
+                }
+                count = other.count;
+                other.clear();
+            }
+        } // moves other's elements into this empty, inline stack
+    public:
+        SmallStack() : items(inlineItems()), count(0), cap(InlineN)
+        {
+        }
+
+        SmallStack(const SmallStack& other) : SmallStack()
+        {
+            *this = other;
+        }
+
+        SmallStack(SmallStack&& other) : SmallStack()
+        {
+            takeFrom(std::move(other));
+        }
+
+        SmallStack& operator=(const SmallStack& other)
+        {
+            if (this != &other)
+            {
+                clear();
+                reserve(other.count);
+                for (size_t i = 0; i < other.count; i++)
+                {
+                    new (items + i) T(other.items[i]);
+                    count++;
+                }
+            }
+            return *this;
+        }
+
+        SmallStack& operator=(SmallStack&& other)
+        {
+            if (this != &other)
+            {
+                clear();
+                release();
+                takeFrom(std::move(other));
+            }
+            return *this;
+        }
+
+        ~SmallStack()
+        {
+            clear();
+            release();
+        }
+
+        bool isEmpty()
+        {
+            return count == 0;
+        } // checks if stack empty
+
+        int size()
+        {
+            return count;
+        } // returns size of a stack
+
+        void push(T value)
+        {
+            if (count == cap)
+            {
+                grow(count + 1);
+            }
+            new (items + count) T(std::move(value));
+            count++;
+        } // pushes value to the top of stack
+
+        T& peek()
+        {
+            if (count == 0)
+            {
+                throw out_of_range("peek on an empty SmallStack");
+            }
+            return items[count - 1];
+        } // the top element of stack
+
+        T pop()
+        {
+            T value = std::move(peek());
+            items[count - 1].~T();
+            count--;
+            return value;
+        } // removes and returns the top element
+
+        void clear()
+        {
+            while (count > 0)
+            {
+                items[--count].~T();
+            }
+        } // removes all elements but keeps the buffer
+
+        void reserve(size_t n)
+        {
+            if (n > cap)
+            {
+                grow(n);
+            }
+        } // makes room for n elements
+
+        size_t capacity()
+        {
+            return cap;
+        } // how many elements fit before the next reallocation
+
+        bool isInline()
+        {
+            return items == inlineItems();
+        } // true while no heap memory has been allocated
+}; // Stack of any type that keeps the first InlineN elements inside the object,
+   // so shallow stacks (bracket matching, expression parsing) never allocate
+
+int main()
+{
+    SmallStack<char> brackets;
+    string expression = "{[()()]}";
+    for(char c : expression)
+    {
+        if (c == '(' || c == '[' || c == '{')
+        {
+            brackets.push(c);
+        }
+        else
+        {
+            cout << "closing " << c << " matches " << brackets.pop() << endl;
+        }
+    }
+    cout << "stayed inline = " << brackets.isInline() << endl;
+
+    SmallStack<string, 4> words;
+    for(int i = 0; i < 10; i++)
+    {
+        words.push("word " + to_string(i));
+    }
+    cout << "size of a stack - " << words.size() << ", inline = " << words.isInline() << endl;
+    cout << "peeking in stack = " << words.peek() << endl;
+}
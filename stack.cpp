@@ -1,11 +1,146 @@
+#include <algorithm>
+#include <cerrno>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
 #include <iostream>
+#include <stdexcept>
+#include <string>
+#include <system_error>
 #include <vector>
+#if defined(__unix__) || defined(__APPLE__)
+#include <fcntl.h>
+#include <unistd.h>
+#endif
 using namespace std;
+struct GrowthPolicy
+{
+    double growthFactor = 2.0; // capacity is multiplied by this when the stack is full
+    double shrinkBelow = 0.0;  // shrink once size < shrinkBelow * capacity (0 never shrinks)
+    size_t minCapacity = 16;   // the stack never shrinks below this capacity
+}; // how a Stack grows and shrinks; Stack requires growthFactor > 1 and
+   // shrinkBelow < 1 / growthFactor so that a shrunk stack has room to grow
+   // again before the next reallocation
+
+// Binary snapshot of a Stack, all fields little-endian:
+//   bytes 0-7    magic "STKSNAP\0"
+//   bytes 8-11   format version (SNAPSHOT_VERSION)
+//   bytes 12-15  element type (SNAPSHOT_INT32)
+//   bytes 16-23  number of values
+//   bytes 24-    the values, bottom first, 4 bytes each
+const char SNAPSHOT_MAGIC[8] = {'S', 'T', 'K', 'S', 'N', 'A', 'P', '\0'};
+const uint32_t SNAPSHOT_VERSION = 1;
+const uint32_t SNAPSHOT_INT32 = 1;
+const size_t SNAPSHOT_HEADER_BYTES = 24;
+
+inline bool littleEndianHost()
+{
+    const uint16_t probe = 1;
+    return *(const unsigned char*) &probe == 1;
+}
+
+inline void writeLittleEndian(unsigned char* out, uint64_t value, int bytes)
+{
+    for (int i = 0; i < bytes; i++)
+    {
+        out[i] = (unsigned char) (value >> (8 * i));
+    }
+}
+
+inline uint64_t readLittleEndian(const unsigned char* in, int bytes)
+{
+    uint64_t value = 0;
+    for (int i = 0; i < bytes; i++)
+    {
+        value |= (uint64_t) in[i] << (8 * i);
+    }
+    return value;
+}
+
+inline void swapInts(int* values, size_t count)
+{
+    for (size_t i = 0; i < count; i++)
+    {
+        uint32_t v = (uint32_t) values[i];
+        values[i] = (int) ((v >> 24) | ((v >> 8) & 0xFF00) | ((v << 8) & 0xFF0000) | (v << 24));
+    }
+} // converts between the host and the snapshot byte order on big-endian hosts
+
 class Stack
 {
     private:
         vector<int> data;
+        GrowthPolicy policy;
+        size_t shrinkAt = 0; // pops shrink the buffer once size drops below this
+
+        void updateShrinkAt()
+        {
+            shrinkAt = data.capacity() > policy.minCapacity ? (size_t) (policy.shrinkBelow * data.capacity()) : 0;
+        } // recomputed whenever the capacity or the policy changes
+
+        void reallocate(size_t newCapacity)
+        {
+            vector<int> resized;
+            resized.reserve(newCapacity);
+            resized.insert(resized.end(), data.begin(), data.end());
+            data.swap(resized);
+            updateShrinkAt();
+        } // moves the elements into a buffer of exactly newCapacity
+
+        void reserveFor(size_t needed)
+        {
+            if (needed > data.capacity())
+            {
+                size_t grown = (size_t) (data.capacity() * policy.growthFactor);
+                data.reserve(max(needed, max(grown, policy.minCapacity)));
+                updateShrinkAt();
+            }
+        } // grows geometrically so that needed elements fit
+
+        void shrinkIfSparse()
+        {
+            if (data.size() < shrinkAt)
+            {
+                reallocate(max((size_t) (data.size() * policy.growthFactor), policy.minCapacity));
+            }
+        } // gives memory back after large pops, keeping room to grow
+
+        static GrowthPolicy checkGrowthPolicy(GrowthPolicy growthPolicy)
+        {
+            if (!(growthPolicy.growthFactor > 1.0))
+            {
+                throw invalid_argument("GrowthPolicy::growthFactor must be greater than 1");
+            }
+            if (!(growthPolicy.shrinkBelow < 1.0 / growthPolicy.growthFactor))
+            {
+                throw invalid_argument("GrowthPolicy::shrinkBelow must be less than 1 / growthFactor");
+            }
+            return growthPolicy;
+        } // rejects policies that would reallocate on every push or thrash between growing and shrinking
+
+        static size_t checkSnapshotHeader(const unsigned char* header, size_t fileBytes, const string& path)
+        {
+            if (memcmp(header, SNAPSHOT_MAGIC, sizeof(SNAPSHOT_MAGIC)) != 0)
+            {
+                throw runtime_error(path + " is not a Stack snapshot");
+            }
+            if (readLittleEndian(header + 8, 4) != SNAPSHOT_VERSION || readLittleEndian(header + 12, 4) != SNAPSHOT_INT32)
+            {
+                throw runtime_error(path + " has an unsupported snapshot version or element type");
+            }
+            uint64_t count = readLittleEndian(header + 16, 8);
+            if (count != (fileBytes - SNAPSHOT_HEADER_BYTES) / sizeof(int) || (fileBytes - SNAPSHOT_HEADER_BYTES) % sizeof(int))
+            {
+                throw runtime_error(path + " is truncated or has trailing data");
+            }
+            return count;
+        } // validates a snapshot header and returns the number of values
     public:
+        Stack(GrowthPolicy growthPolicy = GrowthPolicy()) : policy(checkGrowthPolicy(growthPolicy))
+        {
+        }
+
         bool isEmpty()
         {
             return data.empty();
@@ -16,6 +151,7 @@ class Stack
         } //returns size of a stack
         void push(int value)
         {
+            reserveFor(data.size() + 1);
             data.push_back(value);    
         } // pushs value to the top of stack
         
@@ -28,8 +164,166 @@ class Stack
         {
             int value_to_return = peek();
             data.pop_back();
+            shrinkIfSparse();
             return value_to_return;
         }; //work like peek, but then deleting ellements
+
+        void pushRange(const int* values, size_t count)
+        {
+            reserveFor(data.size() + count);
+            data.insert(data.end(), values, values + count);
+        } // pushes count values in one go, the last one ends up on top
+
+        size_t popN(int* out, size_t n)
+        {
+            if (n > data.size())
+            {
+                n = data.size();
+            }
+            for (size_t i = 0; i < n; i++)
+            {
+                out[i] = data[data.size() - 1 - i];
+            }
+            data.resize(data.size() - n);
+            shrinkIfSparse();
+            return n;
+        } // pops up to n values into out (top first), returns how many were popped
+
+        size_t capacity()
+        {
+            return data.capacity();
+        } // how many values fit before the next reallocation
+
+        void reserve(size_t n)
+        {
+            if (n > data.capacity())
+            {
+                data.reserve(n);
+                updateShrinkAt();
+            }
+        } // makes room for n values, e.g. before a bulk load
+
+        void shrinkToFit()
+        {
+            if (data.capacity() > data.size())
+            {
+                reallocate(data.size());
+            }
+        } // releases all unused capacity
+
+        GrowthPolicy growthPolicy()
+        {
+            return policy;
+        } // the current growth policy
+
+        void setGrowthPolicy(GrowthPolicy growthPolicy)
+        {
+            policy = checkGrowthPolicy(growthPolicy);
+            updateShrinkAt();
+        } // changes how the stack grows and shrinks from now on
+
+        void save(const string& path)
+        {
+            unsigned char header[SNAPSHOT_HEADER_BYTES];
+            memcpy(header, SNAPSHOT_MAGIC, sizeof(SNAPSHOT_MAGIC));
+            writeLittleEndian(header + 8, SNAPSHOT_VERSION, 4);
+            writeLittleEndian(header + 12, SNAPSHOT_INT32, 4);
+            writeLittleEndian(header + 16, data.size(), 8);
+
+            vector<int> swapped;
+            const int* payload = data.data();
+            if (!littleEndianHost())
+            {
+                swapped = data;
+                swapInts(swapped.data(), swapped.size());
+                payload = swapped.data();
+            }
+            size_t payloadBytes = data.size() * sizeof(int);
+            string staging = path + ".tmp";
+#if defined(__unix__) || defined(__APPLE__)
+            int fd = open(staging.c_str(), O_WRONLY | O_CREAT | O_TRUNC, 0644);
+            if (fd < 0)
+            {
+                throw system_error(errno, generic_category(), "open " + staging);
+            }
+            auto writeAll = [fd](const void* bytes, size_t length)
+            {
+                const char* next = (const char*) bytes;
+                while (length > 0)
+                {
+                    ssize_t done = write(fd, next, length);
+                    if (done < 0 && errno != EINTR)
+                    {
+                        return false;
+                    }
+                    done = max<ssize_t>(done, 0);
+                    next += done;
+                    length -= done;
+                }
+                return true;
+            };
+            bool written = writeAll(header, sizeof(header)) && writeAll(payload, payloadBytes) && fsync(fd) == 0;
+            int error = errno;
+            if (close(fd) != 0 && written)
+            {
+                written = false;
+                error = errno;
+            }
+            if (!written)
+            {
+                remove(staging.c_str());
+                throw system_error(error, generic_category(), "write " + staging);
+            }
+#else
+            ofstream out(staging, ios::binary | ios::trunc);
+            out.write((const char*) header, sizeof(header));
+            out.write((const char*) payload, payloadBytes);
+            out.close();
+            if (!out)
+            {
+                remove(staging.c_str());
+                throw runtime_error("could not write " + staging);
+            }
+            remove(path.c_str()); // rename does not replace an existing file everywhere
+#endif
+            if (rename(staging.c_str(), path.c_str()) != 0)
+            {
+                int error = errno;
+                remove(staging.c_str());
+                throw system_error(error, generic_category(), "rename " + staging);
+            }
+        } // writes a snapshot of the values to path.tmp, flushes it to disk and renames it over path,
+          // so a crash never leaves a half-written snapshot at path
+
+        static Stack load(const string& path, GrowthPolicy growthPolicy = GrowthPolicy())
+        {
+            Stack stack(growthPolicy);
+            ifstream in(path, ios::binary | ios::ate);
+            if (!in)
+            {
+                throw runtime_error("could not open " + path);
+            }
+            size_t bytes = in.tellg();
+            unsigned char header[SNAPSHOT_HEADER_BYTES];
+            in.seekg(0);
+            if (bytes < SNAPSHOT_HEADER_BYTES || !in.read((char*) header, sizeof(header)))
+            {
+                throw runtime_error(path + " is not a Stack snapshot");
+            }
+            size_t count = checkSnapshotHeader(header, bytes, path);
+            stack.data.reserve(max(count, growthPolicy.minCapacity));
+            stack.data.resize(count);
+            if (!in.read((char*) stack.data.data(), count * sizeof(int)))
+            {
+                throw runtime_error(path + " is truncated");
+            }
+            if (!littleEndianHost())
+            {
+                swapInts(stack.data.data(), stack.data.size());
+            }
+            stack.updateShrinkAt();
+            return stack;
+        } // reads a snapshot written by save; the values are copied in one block, not parsed
 };
 
 int main()
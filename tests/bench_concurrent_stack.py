@@ -0,0 +1,221 @@
+"""
+Multi-threaded throughput benchmarks for the thread-safe stacks in
+implementations/concurrent_stack.cpp.
+
+Every thread pushes a value and pops one in turn on a single shared stack, so
+all threads contend for its top. Compares LockFreeStack and EliminationStack
+against the Stack from stack.cpp behind a std::mutex and reports ns/op over
+all threads (lower means more throughput) for 1 to 64 threads. ShardedStack
+is measured the same way, except that every thread registers as a worker and
+mostly uses its own shard, which is what lets it scale with the number of
+cores. Run it directly, e.g.
+
+    python tests/bench_concurrent_stack.py --threads 1,8,64 --json concurrent.json
+
+Add --record to store the results in the benchmark history (see benchmarks.py).
+"""
+import argparse
+
+from benchmarks import (
+    BENCHMARK_PRELUDE,
+    DEFAULT_PROFILE,
+    add_common_arguments,
+    finish_report,
+    make_report,
+    parse_sizes,
+    run_benchmark,
+    summarize,
+)
+from harness import build_program, repo_path
+
+# Paths to the task files with the stacks under test
+STACK_CPP_PATH = repo_path("stack.cpp")
+CONCURRENT_STACK_PATH = repo_path("implementations/concurrent_stack.cpp")
+
+# mutex: Stack guarded by one std::mutex; lock_free: LockFreeStack;
+# elimination: EliminationStack; sharded: ShardedStack, one worker per thread.
+# Each is built separately from the task file that defines it, with
+# -DBENCH_STACK=<class> and -DBENCH_WORKERS for stacks used through workers
+IMPLEMENTATIONS = {
+    "mutex": (STACK_CPP_PATH, "LockedStack<Stack>", []),
+    "lock_free": (CONCURRENT_STACK_PATH, "LockFreeStack", []),
+    "elimination": (CONCURRENT_STACK_PATH, "EliminationStack", []),
+    "sharded": (CONCURRENT_STACK_PATH, "ShardedStack", ["-DBENCH_WORKERS"]),
+}
+
+DEFAULT_THREADS = (1, 2, 4, 8, 16, 32, 64)
+
+# Push/pop operations per thread
+DEFAULT_SIZES = (10**5,)
+
+CONCURRENT_BENCHMARK_MAIN = BENCHMARK_PRELUDE + """
+#include <atomic>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+// Stack class under test, chosen with -DBENCH_STACK=...
+#ifndef BENCH_STACK
+#define BENCH_STACK LockedStack<Stack>
+#endif
+
+// A single-threaded stack such as Stack behind one global lock: the baseline
+// the concurrent stacks replace
+template <class S>
+class LockedStack
+{
+    private:
+        mutex lock;
+        S stack;
+    public:
+        void push(int value)
+        {
+            lock_guard<mutex> guard(lock);
+            stack.push(value);
+        }
+
+        bool tryPop(int& value)
+        {
+            lock_guard<mutex> guard(lock);
+            if (stack.isEmpty()) {
+                return false;
+            }
+            value = stack.pop();
+            return true;
+        }
+};
+
+// Creates the stack shared by `threads` threads, and returns what one thread
+// pushes and pops through: the stack itself, or a registered worker for
+// stacks such as ShardedStack that are sized for and used through workers
+#ifdef BENCH_WORKERS
+static unique_ptr<BENCH_STACK> bench_create(int threads)
+{
+    return unique_ptr<BENCH_STACK>(new BENCH_STACK(threads));
+}
+
+static auto bench_handle(BENCH_STACK& stack) -> decltype(stack.registerWorker())
+{
+    return stack.registerWorker();
+}
+#else
+static unique_ptr<BENCH_STACK> bench_create(int)
+{
+    return unique_ptr<BENCH_STACK>(new BENCH_STACK());
+}
+
+static BENCH_STACK& bench_handle(BENCH_STACK& stack)
+{
+    return stack;
+}
+#endif
+
+// Starts `threads` threads that each push and pop `ops` times in turn on one
+// shared stack and returns the nanoseconds until the last one finished
+static double bench_sample(int threads, long long ops)
+{
+    unique_ptr<BENCH_STACK> stack = bench_create(threads);
+    atomic<int> ready{0};
+    atomic<bool> go{false};
+    vector<thread> workers;
+    for (int t = 0; t < threads; t++) {
+        workers.emplace_back([&, t]() {
+            auto&& handle = bench_handle(*stack);
+            ready.fetch_add(1);
+            while (!go.load(memory_order_acquire)) {
+            }
+            int value = 0;
+            for (long long i = 0; i < ops; i += 2) {
+                handle.push(t);
+                bench_keep(handle.tryPop(value));
+            }
+            bench_keep(value);
+        });
+    }
+    while (ready.load() != threads) {
+        this_thread::yield();
+    }
+    auto start = chrono::steady_clock::now();
+    go.store(true, memory_order_release);
+    for (auto& worker : workers) {
+        worker.join();
+    }
+    auto end = chrono::steady_clock::now();
+    return chrono::duration<double, nano>(end - start).count();
+}
+
+int main(int argc, char* argv[])
+{
+    if (argc != 6) {
+        fprintf(stderr, "usage: %s IMPLEMENTATION THREADS OPS WARMUP REPETITIONS\\n", argv[0]);
+        return 2;
+    }
+    const char* implementation = argv[1];
+    int threads = atoi(argv[2]);
+    long long ops = atoll(argv[3]);
+    int warmup = atoi(argv[4]);
+    int repetitions = atoi(argv[5]);
+
+    if (threads < 1 || ops < 1) {
+        fprintf(stderr, "invalid thread or operation count\\n");
+        return 2;
+    }
+
+    // Unlike the single-threaded benchmarks a sample is never repeated to reach
+    // a minimum length: starting the threads would dominate short samples anyway
+    for (int i = 0; i < warmup; i++) {
+        bench_sample(threads, ops);
+    }
+
+    printf("{\\"implementation\\": \\"%s\\", \\"threads\\": %d, \\"ops\\": %lld, \\"samples\\": [",
+           implementation, threads, ops);
+    for (int i = 0; i < repetitions; i++) {
+        double total = bench_sample(threads, ops);
+        printf("%s%.4f", i ? ", " : "", total / (ops * threads));
+    }
+    printf("]}\\n");
+    return 0;
+}
+"""
+
+
+def run_concurrent_benchmarks(threads=DEFAULT_THREADS, sizes=DEFAULT_SIZES,
+                              implementations=tuple(IMPLEMENTATIONS), warmup=1, repetitions=10,
+                              profile=DEFAULT_PROFILE):
+    """Run every implementation at every thread count and size and return the JSON report."""
+    results = []
+    for implementation in implementations:
+        target_path, class_name, flags = IMPLEMENTATIONS[implementation]
+        binary_path = build_program(target_path, CONCURRENT_BENCHMARK_MAIN, f"bench_concurrent_{implementation}",
+                                    profile, extra_flags=["-pthread", f"-DBENCH_STACK={class_name}", *flags])
+        for ops in sizes:
+            for count in threads:
+                args = [implementation, count, ops, warmup, repetitions]
+                for measurement in run_benchmark(binary_path, args):
+                    results.append(summarize(
+                        f"concurrent_stack/{implementation}/{ops}/{count}t",
+                        measurement["samples"],
+                        implementation=implementation,
+                        threads=count,
+                        ops=ops,
+                    ))
+    return make_report("concurrent_stack", profile, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser, DEFAULT_SIZES)
+    parser.add_argument("--threads", type=parse_sizes, default=list(DEFAULT_THREADS),
+                        help="comma-separated thread counts, e.g. 1,4,16")
+    parser.add_argument("--implementations", default=",".join(IMPLEMENTATIONS),
+                        help=f"comma-separated implementations (default: {','.join(IMPLEMENTATIONS)})")
+    args = parser.parse_args(argv)
+
+    report = run_concurrent_benchmarks(args.threads, args.sizes, args.implementations.split(","),
+                                       args.warmup, args.repetitions, args.profile)
+    finish_report(args, report)
+
+
+if __name__ == "__main__":
+    main()
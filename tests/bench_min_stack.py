@@ -0,0 +1,176 @@
+"""
+Time and memory benchmarks for MinStack in advanced/min_stack.cpp.
+
+Compares MinStack, which stores minimum transitions only, against the obvious
+paired stack that stores the minimum next to every value. Each sample pushes
+`ops` values, then pops them all while reading getMin, and reports ns/op
+(one push or one pop) together with the bytes allocated when full, for
+random, ascending and descending input. Run it directly, e.g.
+
+    python tests/bench_min_stack.py --sizes 1e7 --json min_stack.json
+
+Add --record to store the results in the benchmark history (see benchmarks.py).
+"""
+import argparse
+import sys
+
+from benchmarks import (
+    BENCHMARK_PRELUDE,
+    DEFAULT_PROFILE,
+    add_common_arguments,
+    finish_report,
+    make_report,
+    run_benchmark,
+    summarize,
+)
+from harness import build_program, repo_path
+
+# Path to the min_stack.cpp file
+MIN_STACK_PATH = repo_path("advanced/min_stack.cpp")
+
+# paired: a (value, minimum) pair per element; transitions: MinStack
+IMPLEMENTATIONS = ("paired", "transitions")
+
+# Order of the pushed values; descending makes every push a new minimum,
+# the worst case for MinStack
+ORDERS = ("random", "ascending", "descending")
+
+DEFAULT_SIZES = (10**7,)
+
+MIN_STACK_BENCHMARK_MAIN = BENCHMARK_PRELUDE + """
+#include <utility>
+
+// The obvious MinStack: every element carries the minimum below it
+class PairedMinStack
+{
+    private:
+        vector<pair<int, int>> values;
+    public:
+        void push(int val)
+        {
+            values.push_back({val, values.empty() ? val : min(val, values.back().second)});
+        }
+
+        void pop()
+        {
+            values.pop_back();
+        }
+
+        int getMin()
+        {
+            return values.back().second;
+        }
+
+        size_t memoryBytes()
+        {
+            return values.capacity() * sizeof(pair<int, int>);
+        }
+};
+
+static vector<int> bench_values(const char* order, long long ops)
+{
+    vector<int> values(ops);
+    unsigned long long state = 88172645463325252ULL;
+    for (long long i = 0; i < ops; i++) {
+        state ^= state << 13;
+        state ^= state >> 7;
+        state ^= state << 17;
+        values[i] = strcmp(order, "random") == 0 ? (int) state
+                    : strcmp(order, "ascending") == 0 ? (int) i : (int) (ops - i);
+    }
+    return values;
+}
+
+// Pushes every value and pops them all again reading the minimum, returns the
+// nanoseconds it took and stores the bytes the full stack had allocated
+template <class S>
+static double bench_sample(const vector<int>& values, size_t& bytes)
+{
+    S stack;
+    auto start = chrono::steady_clock::now();
+    for (int value : values) {
+        stack.push(value);
+    }
+    bytes = stack.memoryBytes();
+    for (size_t i = 0; i < values.size(); i++) {
+        bench_keep(stack.getMin());
+        stack.pop();
+    }
+    auto end = chrono::steady_clock::now();
+    return chrono::duration<double, nano>(end - start).count();
+}
+
+int main(int argc, char* argv[])
+{
+    if (argc != 6) {
+        fprintf(stderr, "usage: %s IMPLEMENTATION ORDER OPS WARMUP REPETITIONS\\n", argv[0]);
+        return 2;
+    }
+    const char* implementation = argv[1];
+    const char* order = argv[2];
+    long long ops = atoll(argv[3]);
+    int warmup = atoi(argv[4]);
+    int repetitions = atoi(argv[5]);
+
+    bool paired = strcmp(implementation, "paired") == 0;
+    bool knownOrder = strcmp(order, "random") == 0 || strcmp(order, "ascending") == 0 || strcmp(order, "descending") == 0;
+    if ((!paired && strcmp(implementation, "transitions") != 0) || !knownOrder || ops < 1) {
+        fprintf(stderr, "unknown implementation %s or order %s, or invalid operation count\\n", implementation, order);
+        return 2;
+    }
+
+    vector<int> values = bench_values(order, ops);
+    size_t bytes = 0;
+    for (int i = 0; i < warmup; i++) {
+        paired ? bench_sample<PairedMinStack>(values, bytes) : bench_sample<MinStack>(values, bytes);
+    }
+
+    printf("{\\"implementation\\": \\"%s\\", \\"order\\": \\"%s\\", \\"ops\\": %lld, \\"samples\\": [",
+           implementation, order, ops);
+    for (int i = 0; i < repetitions; i++) {
+        double total = paired ? bench_sample<PairedMinStack>(values, bytes) : bench_sample<MinStack>(values, bytes);
+        printf("%s%.4f", i ? ", " : "", total / (2.0 * ops));
+    }
+    printf("], \\"bytes\\": %zu}\\n", bytes);
+    return 0;
+}
+"""
+
+
+def run_min_stack_benchmarks(sizes=DEFAULT_SIZES, implementations=IMPLEMENTATIONS, orders=ORDERS,
+                             warmup=1, repetitions=5, profile=DEFAULT_PROFILE):
+    """Run every implementation on every input order and size and return the JSON report."""
+    binary_path = build_program(MIN_STACK_PATH, MIN_STACK_BENCHMARK_MAIN, "bench_min_stack", profile)
+    results = []
+    for implementation in implementations:
+        for order in orders:
+            for ops in sizes:
+                args = [implementation, order, ops, warmup, repetitions]
+                for measurement in run_benchmark(binary_path, args):
+                    results.append(summarize(
+                        f"min_stack/{implementation}/{order}/{ops}",
+                        measurement["samples"],
+                        implementation=implementation,
+                        order=order,
+                        ops=ops,
+                        bytes=measurement["bytes"],
+                    ))
+    return make_report("min_stack", profile, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser, DEFAULT_SIZES)
+    parser.add_argument("--orders", default=",".join(ORDERS),
+                        help=f"comma-separated input orders (default: {','.join(ORDERS)})")
+    args = parser.parse_args(argv)
+
+    report = run_min_stack_benchmarks(args.sizes, IMPLEMENTATIONS, args.orders.split(","),
+                                      args.warmup, args.repetitions, args.profile)
+    finish_report(args, report)
+    for result in report["results"]:
+        print(f"{result['name']}: {result['bytes'] / 2**20:.1f} MiB when full", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmarks for the sliding window aggregates in advanced/sliding_window.cpp.
+
+Streams `ops` points through a window of a given size and computes the
+aggregate (min, max or sum) of every window, once with the two-stack
+WindowAggregator and once by recomputing each window from scratch, and
+reports ns per point. Run it directly, e.g.
+
+    python tests/bench_sliding_window.py --sizes 1e6 --windows 16,1024 --json window.json
+
+Add --record to store the results in the benchmark history (see benchmarks.py).
+"""
+import argparse
+
+from benchmarks import (
+    BENCHMARK_PRELUDE,
+    DEFAULT_PROFILE,
+    add_common_arguments,
+    finish_report,
+    make_report,
+    parse_sizes,
+    run_benchmark,
+    summarize,
+)
+from harness import build_program, repo_path
+
+# Path to the sliding_window.cpp file
+SLIDING_WINDOW_PATH = repo_path("advanced/sliding_window.cpp")
+
+# two_stack: WindowAggregator; recompute: a fresh pass over every window
+IMPLEMENTATIONS = ("two_stack", "recompute")
+
+OPERATIONS = ("min", "max", "sum")
+
+DEFAULT_WINDOWS = (16, 1024)
+
+# Points streamed through the window
+DEFAULT_SIZES = (10**6,)
+
+SLIDING_WINDOW_BENCHMARK_MAIN = BENCHMARK_PRELUDE + """
+// Aggregates every window with WindowAggregator, returns the nanoseconds it took
+template <class Op>
+static double bench_two_stack(const vector<long long>& points, size_t window)
+{
+    auto start = chrono::steady_clock::now();
+    WindowAggregator<long long, Op> aggregator;
+    for (size_t i = 0; i < points.size(); i++) {
+        aggregator.push(points[i]);
+        if (i >= window) {
+            aggregator.evict();
+        }
+        if (i + 1 >= window) {
+            bench_keep(aggregator.query());
+        }
+    }
+    auto end = chrono::steady_clock::now();
+    return chrono::duration<double, nano>(end - start).count();
+}
+
+// Aggregates every window with a pass over its points, returns the nanoseconds it took
+template <class Op>
+static double bench_recompute(const vector<long long>& points, size_t window)
+{
+    Op op;
+    auto start = chrono::steady_clock::now();
+    for (size_t i = 0; i + window <= points.size(); i++) {
+        long long aggregate = points[i];
+        for (size_t j = i + 1; j < i + window; j++) {
+            aggregate = op(aggregate, points[j]);
+        }
+        bench_keep(aggregate);
+    }
+    auto end = chrono::steady_clock::now();
+    return chrono::duration<double, nano>(end - start).count();
+}
+
+template <class Op>
+static double bench_run(bool twoStack, const vector<long long>& points, size_t window)
+{
+    return twoStack ? bench_two_stack<Op>(points, window) : bench_recompute<Op>(points, window);
+}
+
+int main(int argc, char* argv[])
+{
+    if (argc != 7) {
+        fprintf(stderr, "usage: %s IMPLEMENTATION OPERATION WINDOW OPS WARMUP REPETITIONS\\n", argv[0]);
+        return 2;
+    }
+    const char* implementation = argv[1];
+    const char* operation = argv[2];
+    long long window = atoll(argv[3]);
+    long long ops = atoll(argv[4]);
+    int warmup = atoi(argv[5]);
+    int repetitions = atoi(argv[6]);
+
+    bool twoStack = strcmp(implementation, "two_stack") == 0;
+    int kind = strcmp(operation, "min") == 0 ? 0 : strcmp(operation, "max") == 0 ? 1 : strcmp(operation, "sum") == 0 ? 2 : -1;
+    if ((!twoStack && strcmp(implementation, "recompute") != 0) || kind < 0 || window < 1 || ops < window) {
+        fprintf(stderr, "unknown implementation %s or operation %s, or invalid window or operation count\\n",
+                implementation, operation);
+        return 2;
+    }
+
+    // Telemetry-like points: a slow drift with noise
+    vector<long long> points(ops);
+    unsigned long long state = 88172645463325252ULL;
+    for (long long i = 0; i < ops; i++) {
+        state ^= state << 13;
+        state ^= state >> 7;
+        state ^= state << 17;
+        points[i] = i / 1000 + (long long) (state % 1000);
+    }
+
+    auto sample = [&]() {
+        if (kind == 0) {
+            return bench_run<MinOf<long long>>(twoStack, points, window);
+        }
+        if (kind == 1) {
+            return bench_run<MaxOf<long long>>(twoStack, points, window);
+        }
+        return bench_run<plus<long long>>(twoStack, points, window);
+    };
+    for (int i = 0; i < warmup; i++) {
+        sample();
+    }
+
+    printf("{\\"implementation\\": \\"%s\\", \\"operation\\": \\"%s\\", \\"window\\": %lld, \\"ops\\": %lld, \\"samples\\": [",
+           implementation, operation, window, ops);
+    for (int i = 0; i < repetitions; i++) {
+        printf("%s%.4f", i ? ", " : "", sample() / ops);
+    }
+    printf("]}\\n");
+    return 0;
+}
+"""
+
+
+def run_sliding_window_benchmarks(sizes=DEFAULT_SIZES, windows=DEFAULT_WINDOWS, operations=OPERATIONS,
+                                  implementations=IMPLEMENTATIONS, warmup=1, repetitions=5,
+                                  profile=DEFAULT_PROFILE):
+    """Run every implementation for every operation, window and size and return the JSON report."""
+    binary_path = build_program(SLIDING_WINDOW_PATH, SLIDING_WINDOW_BENCHMARK_MAIN, "bench_sliding_window", profile)
+    results = []
+    for implementation in implementations:
+        for operation in operations:
+            for window in windows:
+                for ops in sizes:
+                    args = [implementation, operation, window, ops, warmup, repetitions]
+                    for measurement in run_benchmark(binary_path, args):
+                        results.append(summarize(
+                            f"sliding_window/{implementation}/{operation}/{window}/{ops}",
+                            measurement["samples"],
+                            implementation=implementation,
+                            operation=operation,
+                            window=window,
+                            ops=ops,
+                        ))
+    return make_report("sliding_window", profile, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser, DEFAULT_SIZES)
+    parser.add_argument("--windows", type=parse_sizes, default=list(DEFAULT_WINDOWS),
+                        help="comma-separated window sizes, e.g. 16,1024")
+    parser.add_argument("--operations", default=",".join(OPERATIONS),
+                        help=f"comma-separated operations (default: {','.join(OPERATIONS)})")
+    args = parser.parse_args(argv)
+
+    report = run_sliding_window_benchmarks(args.sizes, args.windows, args.operations.split(","),
+                                           IMPLEMENTATIONS, args.warmup, args.repetitions, args.profile)
+    finish_report(args, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmarks for the int stacks in stack.cpp and implementations/chunked_stack.cpp.
+
+Measures push, pop and peek throughput as well as two mixed workloads for
+operation counts from 1e3 to 1e8 and reports ns/op (median and slowest over the
+repetitions), for the vector-backed Stack and the chunked ChunkedStack.
+Run it directly, e.g.
+
+    python tests/bench_stack.py --sizes 1e3,1e6 --backends chunked --json stack.json
+
+Add --record to store the results in the benchmark history (see benchmarks.py).
+"""
+import argparse
+
+from benchmarks import (
+    BENCHMARK_PRELUDE,
+    DEFAULT_PROFILE,
+    add_common_arguments,
+    finish_report,
+    make_report,
+    run_benchmark,
+    summarize,
+)
+from harness import build_program, repo_path
+
+# push: fill an empty stack; pop: drain a full one; peek: read the top;
+# push_pop: push and pop in turn; mixed: 50% push, 25% pop, 25% peek;
+# push_range/pop_n: the same as push/pop with a single bulk call;
+# push_worst: the slowest single push of one fill (ns, not ns/op)
+WORKLOADS = ("push", "pop", "peek", "push_pop", "mixed", "push_range", "pop_n", "push_worst")
+
+# Stack implementations the benchmark can be built for: the task file that
+# defines them, the class and the prefix of their result names
+BACKENDS = {
+    "vector": (repo_path("stack.cpp"), "Stack", "stack"),
+    "chunked": (repo_path("implementations/chunked_stack.cpp"), "ChunkedStack", "chunked_stack"),
+}
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6, 10**7, 10**8)
+
+STACK_BENCHMARK_MAIN = BENCHMARK_PRELUDE + """
+#include <vector>
+
+// Stack class under test, chosen with -DBENCH_STACK=...
+#ifndef BENCH_STACK
+#define BENCH_STACK Stack
+#endif
+
+// Samples shorter than this many operations repeat the workload
+const long long MIN_SAMPLE_OPS = 1000000;
+
+// Deterministic xorshift generator, so every run replays the same operation mix
+static unsigned long long bench_state = 88172645463325252ULL;
+
+static unsigned long long bench_random()
+{
+    bench_state ^= bench_state << 13;
+    bench_state ^= bench_state >> 7;
+    bench_state ^= bench_state << 17;
+    return bench_state;
+}
+
+// Fills a stack with `ops` values timing every push on its own and returns
+// the slowest one in nanoseconds
+static double bench_worst_push(long long ops)
+{
+    BENCH_STACK stack;
+    double worst = 0;
+    for (long long i = 0; i < ops; i++) {
+        auto start = chrono::steady_clock::now();
+        stack.push((int) i);
+        auto end = chrono::steady_clock::now();
+        worst = max(worst, chrono::duration<double, nano>(end - start).count());
+    }
+    bench_keep(stack.size());
+    return worst;
+}
+
+// Runs `ops` operations of the workload and returns the nanoseconds they took
+// (setup such as filling the stack for "pop" is not timed)
+static double bench_sample(const char* workload, long long ops)
+{
+    if (strcmp(workload, "push_worst") == 0) {
+        return bench_worst_push(ops);
+    }
+
+    BENCH_STACK stack;
+    vector<unsigned char> mix;
+    vector<int> buffer;
+
+    if (strcmp(workload, "pop") == 0 || strcmp(workload, "pop_n") == 0) {
+        for (long long i = 0; i < ops; i++) {
+            stack.push((int) i);
+        }
+    } else if (strcmp(workload, "peek") == 0) {
+        stack.push(42);
+    } else if (strcmp(workload, "mixed") == 0) {
+        mix.resize(ops);
+        for (long long i = 0; i < ops; i++) {
+            mix[i] = bench_random() & 3;
+        }
+    }
+    if (strcmp(workload, "push_range") == 0 || strcmp(workload, "pop_n") == 0) {
+        buffer.resize(ops);
+        for (long long i = 0; i < ops; i++) {
+            buffer[i] = (int) i;
+        }
+    }
+
+    auto start = chrono::steady_clock::now();
+    if (strcmp(workload, "push") == 0) {
+        for (long long i = 0; i < ops; i++) {
+            stack.push((int) i);
+        }
+    } else if (strcmp(workload, "pop") == 0) {
+        for (long long i = 0; i < ops; i++) {
+            bench_keep(stack.pop());
+        }
+    } else if (strcmp(workload, "peek") == 0) {
+        for (long long i = 0; i < ops; i++) {
+            bench_keep(stack.peek());
+        }
+    } else if (strcmp(workload, "push_pop") == 0) {
+        for (long long i = 0; i < ops; i += 2) {
+            stack.push((int) i);
+            bench_keep(stack.pop());
+        }
+    } else if (strcmp(workload, "push_range") == 0) {
+        stack.pushRange(buffer.data(), ops);
+    } else if (strcmp(workload, "pop_n") == 0) {
+        bench_keep(stack.popN(buffer.data(), ops));
+    } else {
+        for (long long i = 0; i < ops; i++) {
+            if (mix[i] < 2 || stack.isEmpty()) {
+                stack.push((int) i);
+            } else if (mix[i] == 2) {
+                bench_keep(stack.pop());
+            } else {
+                bench_keep(stack.peek());
+            }
+        }
+    }
+    auto end = chrono::steady_clock::now();
+
+    bench_keep(stack.size());
+    return chrono::duration<double, nano>(end - start).count();
+}
+
+int main(int argc, char* argv[])
+{
+    if (argc != 5) {
+        fprintf(stderr, "usage: %s WORKLOAD OPS WARMUP REPETITIONS\\n", argv[0]);
+        return 2;
+    }
+    const char* workload = argv[1];
+    long long ops = atoll(argv[2]);
+    int warmup = atoi(argv[3]);
+    int repetitions = atoi(argv[4]);
+
+    const char* workloads[] = {"push", "pop", "peek", "push_pop", "mixed", "push_range", "pop_n", "push_worst"};
+    bool known = false;
+    for (const char* name : workloads) {
+        known = known || strcmp(workload, name) == 0;
+    }
+    if (!known || ops < 1) {
+        fprintf(stderr, "unknown workload %s or invalid operation count\\n", workload);
+        return 2;
+    }
+
+    // push_worst reports the slowest push of a single fill, so it is never
+    // repeated: over many fills the maximum would mostly record preemption
+    bool worst = strcmp(workload, "push_worst") == 0;
+    long long inner = !worst && MIN_SAMPLE_OPS / ops > 1 ? MIN_SAMPLE_OPS / ops : 1;
+    for (int i = 0; i < warmup; i++) {
+        for (long long j = 0; j < inner; j++) {
+            bench_sample(workload, ops);
+        }
+    }
+
+    printf("{\\"workload\\": \\"%s\\", \\"ops\\": %lld, \\"inner\\": %lld, \\"samples\\": [", workload, ops, inner);
+    for (int i = 0; i < repetitions; i++) {
+        double total = 0;
+        for (long long j = 0; j < inner; j++) {
+            total += bench_sample(workload, ops);
+        }
+        printf("%s%.4f", i ? ", " : "", worst ? total : total / (ops * inner));
+    }
+    printf("]}\\n");
+    return 0;
+}
+"""
+
+
+def run_stack_benchmarks(sizes=DEFAULT_SIZES, workloads=WORKLOADS, warmup=2, repetitions=10,
+                         profile=DEFAULT_PROFILE, backends=tuple(BACKENDS)):
+    """Run every workload at every size on every backend and return the JSON report."""
+    results = []
+    for backend in backends:
+        target_path, class_name, prefix = BACKENDS[backend]
+        binary_path = build_program(target_path, STACK_BENCHMARK_MAIN, f"bench_{prefix}", profile,
+                                    extra_flags=[f"-DBENCH_STACK={class_name}"])
+        for workload in workloads:
+            for ops in sizes:
+                for measurement in run_benchmark(binary_path, [workload, ops, warmup, repetitions]):
+                    results.append(summarize(
+                        f"{prefix}/{workload}/{ops}",
+                        measurement["samples"],
+                        unit="ns" if workload == "push_worst" else "ns/op",
+                        backend=backend,
+                        workload=workload,
+                        ops=ops,
+                    ))
+    return make_report("stack", profile, results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_common_arguments(parser, DEFAULT_SIZES)
+    parser.add_argument("--workloads", default=",".join(WORKLOADS),
+                        help=f"comma-separated workloads (default: {','.join(WORKLOADS)})")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help=f"comma-separated stack backends (default: {','.join(BACKENDS)})")
+    args = parser.parse_args(argv)
+
+    report = run_stack_benchmarks(args.sizes, args.workloads.split(","), args.warmup,
+                                  args.repetitions, args.profile, args.backends.split(","))
+    finish_report(args, report)
+
+
+if __name__ == "__main__":
+    main()
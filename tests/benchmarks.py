@@ -0,0 +1,283 @@
+"""
+Helpers shared by the benchmark suites (tests/bench_*.py).
+
+A benchmark program is a task file with its main() replaced by a benchmark
+main, which starts with BENCHMARK_PRELUDE. It is invoked once per
+measurement and prints one JSON object per line with at least a "samples"
+list of nanoseconds per operation, one entry per repetition; warmup runs are
+done by the program itself and not reported.
+This module runs those programs, turns the samples into summary statistics
+and writes the machine-readable report.
+
+Reports can be appended to a local history (JSON lines, one report per line,
+keyed by git commit and build profile) and compared against each other:
+
+    python tests/bench_stack.py --record
+    python tests/benchmarks.py compare --suite stack --threshold 0.1
+
+The --benchmark-gate pytest option runs the same comparison as a test.
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from compile_cache import compiler_version
+from harness import REPO_ROOT, build_flags, run_binary
+
+# Benchmarks are about optimised code unless asked otherwise
+DEFAULT_PROFILE = "release"
+
+HISTORY_PATH = os.environ.get("CPP_BENCH_HISTORY", os.path.join(REPO_ROOT, ".benchmarks", "history.jsonl"))
+
+# Relative slowdown of the median that counts as a regression
+DEFAULT_THRESHOLD = 0.10
+
+# C++ every benchmark main starts with: the headers for timing and parsing
+# the command line, and bench_keep()
+BENCHMARK_PRELUDE = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+
+// Makes the compiler produce `value` and forget what it knows about memory,
+// so repeated operations cannot be folded or hoisted out of the loop
+template <class T>
+static inline void bench_keep(const T& value)
+{
+    asm volatile("" : : "r,m"(value) : "memory");
+}
+"""
+
+
+def summarize(name, samples, unit="ns/op", **fields):
+    """
+    Summarise the per-repetition samples (ns/op unless unit says otherwise)
+    of one benchmark.
+
+    Every sample is the mean over a whole repetition, so min and max describe
+    the spread between repetitions, not the latency of single operations.
+    """
+    result = {"name": name, **fields}
+    result.update({
+        "unit": unit,
+        "repetitions": len(samples),
+        "median_ns_per_op": statistics.median(samples),
+        "min_ns_per_op": min(samples),
+        "max_ns_per_op": max(samples),
+        "mean_ns_per_op": statistics.fmean(samples),
+        "samples": list(samples),
+    })
+    return result
+
+
+def run_benchmark(binary_path, args):
+    """
+    Run a benchmark program and return the JSON objects it printed.
+
+    Benchmarks may run for a long time and use a lot of memory, so the
+    harness limits are lifted. Raises RuntimeError if the program fails.
+    """
+    output = run_binary(binary_path, [str(arg) for arg in args], timeout=0, cpu_time=0, memory_mb=0)
+    if output.startswith("Runtime error"):
+        raise RuntimeError(output)
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+
+
+def make_report(suite, profile, results):
+    """Wrap benchmark results with the context needed to compare them later."""
+    return {
+        "suite": suite,
+        "profile": profile,
+        "flags": build_flags(profile),
+        "compiler": compiler_version().splitlines()[0],
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+def write_report(report, path):
+    """Write report as JSON to path ("-" for stdout)."""
+    text = json.dumps(report, indent=2) + "\n"
+    if path == "-":
+        sys.stdout.write(text)
+    else:
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+def format_table(results):
+    """Format benchmark results as a human-readable table."""
+    width = max([32] + [len(result["name"]) for result in results])
+    lines = [f"{'benchmark':<{width}} {'median':>14} {'max':>12} {'unit':<6} {'reps':>5}"]
+    for result in results:
+        lines.append(
+            f"{result['name']:<{width}} {result['median_ns_per_op']:>14.3f} "
+            f"{result['max_ns_per_op']:>12.3f} {result.get('unit', 'ns/op'):<6} {result['repetitions']:>5}"
+        )
+    return "\n".join(lines)
+
+
+def finish_report(args, report):
+    """
+    Print the results of report as a table, then append it to the history and
+    write it as JSON if the options of add_common_arguments() ask for it.
+    Returns the report (with its commit if it was recorded).
+    """
+    print(format_table(report["results"]), file=sys.stderr)
+    if args.record:
+        report = append_history(report)
+    if args.json:
+        write_report(report, args.json)
+    return report
+
+
+def current_commit():
+    """Return the checked-out commit, suffixed with "-dirty" for local changes."""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True)
+
+    head = git("rev-parse", "HEAD")
+    if head.returncode != 0:
+        return "unknown"
+    dirty = git("status", "--porcelain", "--untracked-files=no").stdout.strip()
+    return head.stdout.strip() + ("-dirty" if dirty else "")
+
+
+def append_history(report, path=HISTORY_PATH, commit=None):
+    """Store report in the history under commit (the current one by default)."""
+    report = dict(report, commit=commit or current_commit())
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(report) + "\n")
+    return report
+
+
+def load_history(path=HISTORY_PATH):
+    """Return every stored report, oldest first."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_report(history, suite, profile, commit=None, exclude_commit=None):
+    """
+    Return the latest stored report of suite built with profile.
+
+    With commit, only reports of that commit (or a commit it abbreviates)
+    are considered; exclude_commit skips the reports of one commit.
+    """
+    for report in reversed(history):
+        if report["suite"] != suite or report["profile"] != profile:
+            continue
+        if commit is not None and not report["commit"].startswith(commit):
+            continue
+        if exclude_commit is not None and report["commit"] == exclude_commit:
+            continue
+        return report
+    return None
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare the medians of the benchmarks both reports contain.
+
+    Returns one row per benchmark with the relative change of the median
+    (positive means slower) and whether it exceeds threshold.
+    """
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        if result["name"] not in baseline_results:
+            continue
+        before = baseline_results[result["name"]]["median_ns_per_op"]
+        after = result["median_ns_per_op"]
+        change = (after - before) / before if before > 0 else 0.0
+        rows.append({
+            "name": result["name"],
+            "baseline_ns_per_op": before,
+            "current_ns_per_op": after,
+            "change": change,
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def format_comparison(rows):
+    """Format the rows of compare_reports() as a human-readable table."""
+    width = max([32] + [len(row["name"]) for row in rows])
+    lines = [f"{'benchmark':<{width}} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        marker = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['name']:<{width}} {row['baseline_ns_per_op']:>12.3f} "
+            f"{row['current_ns_per_op']:>12.3f} {row['change']:>+8.1%}{marker}"
+        )
+    return "\n".join(lines)
+
+
+def parse_sizes(text):
+    """Parse a comma-separated list of sizes such as "1e3,1e6,2000"."""
+    return [int(float(size)) for size in text.split(",") if size.strip()]
+
+
+def add_common_arguments(parser, default_sizes):
+    """Add the command-line options every benchmark suite understands."""
+    parser.add_argument("--profile", default=DEFAULT_PROFILE,
+                        help=f"build profile to compile with (default: {DEFAULT_PROFILE})")
+    parser.add_argument("--sizes", type=parse_sizes, default=list(default_sizes),
+                        help="comma-separated operation counts, e.g. 1e3,1e6")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs before measuring")
+    parser.add_argument("--repetitions", type=int, default=10, help="timed runs per benchmark")
+    parser.add_argument("--json", metavar="PATH", help="write the JSON report to PATH (- for stdout)")
+    parser.add_argument("--record", action="store_true",
+                        help=f"append the report to the benchmark history ({HISTORY_PATH})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the benchmark history.")
+    parser.add_argument("--history", default=HISTORY_PATH, help="history file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list the stored reports")
+
+    compare = commands.add_parser("compare", help="compare a report against a baseline")
+    compare.add_argument("--suite", required=True, help="benchmark suite, e.g. stack")
+    compare.add_argument("--profile", default=DEFAULT_PROFILE, help="build profile (default: %(default)s)")
+    compare.add_argument("--baseline", metavar="COMMIT",
+                         help="baseline commit (default: latest report of another commit)")
+    compare.add_argument("--current", metavar="COMMIT", help="commit to check (default: latest report)")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="relative slowdown that fails the comparison (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    if args.command == "list":
+        for report in history:
+            print(f"{report['commit'][:12]:<18} {report['suite']:<12} {report['profile']:<8} "
+                  f"{report['created']}  {len(report['results'])} results")
+        return 0
+
+    current = find_report(history, args.suite, args.profile, commit=args.current)
+    if current is None:
+        print(f"No {args.suite} report for profile {args.profile}", file=sys.stderr)
+        return 2
+    baseline = find_report(history, args.suite, args.profile, commit=args.baseline,
+                           exclude_commit=None if args.baseline else current["commit"])
+    if baseline is None:
+        print("No baseline report to compare against", file=sys.stderr)
+        return 2
+
+    rows = compare_reports(baseline, current, args.threshold)
+    print(f"baseline {baseline['commit'][:12]} -> current {current['commit'][:12]}")
+    print(format_comparison(rows))
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
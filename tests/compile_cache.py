@@ -0,0 +1,247 @@
+"""
+Content-addressed cache for compiled test programs.
+
+Every test splices a new main() into a task file and compiles it with g++.
+Most of those translation units do not change between runs, so the compiled
+binaries are stored under a cache directory keyed by a hash of the source
+text, the compiler version and the compiler flags. A cache hit only has to
+copy the binary out of the cache instead of running g++ again.
+
+The cache directory defaults to .cpp_cache/ in the repository root and can be
+moved with CPP_TEST_CACHE_DIR. Its total size is bounded by
+CPP_TEST_CACHE_MAX_BYTES; the least recently used binaries are evicted first.
+Set CPP_TEST_CACHE=0 to disable the cache entirely.
+
+The standard headers a task file includes at its top are also precompiled
+once into a .gch stored under the cache directory (see leading_includes() and
+precompiled_header_flags()). The .gch holds exactly those headers, so it never
+makes a header available that the task file forgot to include. Its key
+contains the compiler version, so a compiler upgrade rebuilds it.
+Set CPP_TEST_PCH=0 to compile without it.
+"""
+import functools
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+
+COMPILER = os.environ.get("CXX", "g++")
+
+CACHE_DIR = os.environ.get(
+    "CPP_TEST_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cpp_cache"),
+)
+
+CACHE_MAX_BYTES = int(os.environ.get("CPP_TEST_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+CACHE_ENABLED = os.environ.get("CPP_TEST_CACHE", "1") != "0"
+
+PCH_ENABLED = os.environ.get("CPP_TEST_PCH", "1") != "0"
+
+# A line of the leading #include block: a standard header, a comment or nothing
+_INCLUDE_LINE = re.compile(r"\s*(?:#\s*include\s*<([^>]+)>)?\s*(?://.*)?$")
+
+_pch_lock = threading.Lock()
+
+# Precompiled headers this process has built or found, by flags, headers,
+# compiler and directory; failures are not remembered, so they are retried
+_precompiled_headers = {}
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_version(compiler=COMPILER):
+    """Return the full version banner of the compiler (part of every cache key)."""
+    result = subprocess.run([compiler, "--version"], capture_output=True, text=True)
+    return result.stdout
+
+
+def cache_key(source, flags=(), compiler=COMPILER):
+    """Hash the source text, compiler version and flags into a cache key."""
+    digest = hashlib.sha256()
+    digest.update(compiler_version(compiler).encode())
+    digest.update(b"\0")
+    digest.update("\0".join(flags).encode())
+    digest.update(b"\0")
+    digest.update(source.encode() if isinstance(source, str) else source)
+    return digest.hexdigest()
+
+
+def _pch_dir():
+    # Precompiled headers live next to the binaries but are never evicted
+    return os.path.join(CACHE_DIR, "pch")
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], key)
+
+
+def _place(cached, output_path):
+    # Hard-link the cached binary to the requested location when possible,
+    # otherwise fall back to a plain copy (e.g. across file systems)
+    try:
+        os.remove(output_path)
+    except OSError:
+        pass
+    try:
+        os.link(cached, output_path)
+    except OSError:
+        shutil.copy2(cached, output_path)
+
+
+def evict(max_bytes=CACHE_MAX_BYTES):
+    """Remove least recently used binaries until the cache fits in max_bytes."""
+    entries = []
+    total = 0
+    for root, dirs, files in os.walk(CACHE_DIR):
+        if root == CACHE_DIR and "pch" in dirs:
+            dirs.remove("pch")
+        for name in files:
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def leading_includes(source):
+    """
+    Return the standard headers of the #include block at the top of source.
+
+    The block ends at the first line that is not an #include <...>, a comment
+    or blank, so conditional includes and anything after the first
+    declaration are left to the compiler.
+    """
+    headers = []
+    for line in source.splitlines():
+        match = _INCLUDE_LINE.match(line)
+        if match is None:
+            break
+        if match.group(1):
+            headers.append(match.group(1).strip())
+    return tuple(headers)
+
+
+def _build_precompiled_header(flags, headers, compiler):
+    # Returns the header to -include, or None if it does not compile
+    header_text = "".join(f"#include <{header}>\n" for header in headers)
+    key = cache_key(header_text, flags, compiler)
+    pch_dir = os.path.join(_pch_dir(), key)
+    header = os.path.join(pch_dir, "common.h")
+    if os.path.exists(header + ".gch"):
+        return header
+
+    os.makedirs(pch_dir, exist_ok=True)
+    # Concurrent test runs may be compiling against common.h and its .gch at
+    # any time, so both are written under private names and renamed into place
+    header_staging = header + f".{os.getpid()}.tmp"
+    pch_staging = header + f".gch.{os.getpid()}.tmp"
+    try:
+        with open(header_staging, 'w') as f:
+            f.write(header_text)
+        os.replace(header_staging, header)
+        result = subprocess.run(
+            [compiler, *flags, "-x", "c++-header", "-o", pch_staging, header],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return None
+        os.replace(pch_staging, header + ".gch")
+    finally:
+        for staging in (header_staging, pch_staging):
+            try:
+                os.remove(staging)
+            except OSError:
+                pass
+    return header
+
+
+def precompiled_header_flags(flags=(), headers=(), compiler=COMPILER):
+    """
+    Return the flags that inject a precompiled header of the given headers.
+
+    headers should come from leading_includes() of the program being compiled.
+    The header is built on first use with the same flags as the programs that
+    include it (g++ rejects a .gch built with different code generation
+    options). Returns an empty list if precompiled headers are disabled, there
+    are no headers or the header could not be built.
+    """
+    if not PCH_ENABLED or not headers:
+        return []
+    key = (tuple(flags), tuple(headers), compiler, _pch_dir())
+    with _pch_lock:
+        header = _precompiled_headers.get(key)
+        if header is None:
+            header = _build_precompiled_header(*key[:3])
+            if header is not None:
+                _precompiled_headers[key] = header
+    if header is None:
+        return []
+    return ["-include", header, "-Winvalid-pch"]
+
+
+def compile_cpp(file_path, output_path, flags=(), compiler=COMPILER):
+    """
+    Compile file_path into output_path, reusing a cached binary when possible.
+
+    Returns a subprocess.CompletedProcess. Failed compilations are never cached,
+    so the compiler diagnostics are always reported on stderr.
+    """
+    flags = list(flags)
+    command = [compiler, *flags, "-o", output_path, file_path]
+    if not CACHE_ENABLED:
+        return subprocess.run(command, capture_output=True, text=True)
+
+    with open(file_path, "rb") as f:
+        source = f.read()
+
+    cached = _cache_path(cache_key(source, flags, compiler))
+    if os.path.exists(cached):
+        try:
+            # Touch the entry so that eviction treats it as recently used
+            os.utime(cached)
+            _place(cached, output_path)
+            return subprocess.CompletedProcess(command, 0, "", "")
+        except OSError:
+            # Evicted by a concurrent run since the check; compile it again
+            pass
+
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    fd, staging = tempfile.mkstemp(dir=os.path.dirname(cached), suffix=".tmp")
+    os.close(fd)
+    try:
+        result = subprocess.run(
+            [compiler, *flags, "-o", staging, file_path],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return subprocess.CompletedProcess(command, result.returncode, result.stdout, result.stderr)
+        # Publish atomically so concurrent test runs never see a partial binary
+        os.replace(staging, cached)
+    finally:
+        try:
+            os.remove(staging)
+        except OSError:
+            pass
+
+    _place(cached, output_path)
+    evict()
+    return subprocess.CompletedProcess(command, 0, result.stdout, result.stderr)
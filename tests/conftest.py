@@ -0,0 +1,108 @@
+"""
+Shared pytest configuration for the C++ task tests.
+"""
+import os
+
+import pytest
+
+import benchmarks
+import harness
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--build-profile",
+        default=harness.DEFAULT_BUILD_PROFILE,
+        help=f"compiler flags for the C++ programs: {', '.join(harness.BUILD_PROFILES)} "
+             f"(default: {harness.DEFAULT_BUILD_PROFILE}, or CPP_TEST_PROFILE)",
+    )
+
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--benchmark-gate",
+        action="store_true",
+        help="run the benchmark tests, record them in the history and fail on regressions",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=benchmarks.DEFAULT_THRESHOLD,
+        help="relative slowdown of a median that fails the gate (default: %(default)s)",
+    )
+    group.addoption(
+        "--benchmark-baseline",
+        metavar="COMMIT",
+        help="commit to compare against (default: the latest report of another commit)",
+    )
+    group.addoption(
+        "--benchmark-profile",
+        default=benchmarks.DEFAULT_PROFILE,
+        help="build profile for the benchmarks (default: %(default)s)",
+    )
+
+
+def pytest_configure(config):
+    try:
+        harness.set_build_profile(config.getoption("--build-profile"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+
+def pytest_report_header(config):
+    flags = " ".join(harness.build_flags()) or "no flags"
+    return f"C++ build profile: {harness.get_build_profile()} ({flags})"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cpp_prebuild():
+    """Compile every registered test program in parallel before the first test runs."""
+    if os.environ.get("CPP_TEST_PREBUILD", "1") != "0":
+        harness.prebuild()
+
+
+@pytest.fixture(autouse=True)
+def cpp_build_profile(record_property):
+    """Record the build profile with every test (e.g. in the JUnit XML report)."""
+    record_property("build_profile", harness.get_build_profile())
+
+
+@pytest.fixture
+def benchmark_profile(request):
+    """Build profile the gated benchmarks are compiled with."""
+    return request.config.getoption("--benchmark-profile")
+
+
+@pytest.fixture
+def benchmark_gate(request):
+    """
+    Return a function that records a benchmark report in the history and
+    fails the test if it regressed against the stored baseline.
+
+    Tests using it are skipped unless pytest runs with --benchmark-gate.
+    """
+    config = request.config
+    if not config.getoption("--benchmark-gate"):
+        pytest.skip("benchmark gate not requested (use --benchmark-gate)")
+
+    def check(report):
+        history = benchmarks.load_history()
+        report = benchmarks.append_history(report)
+
+        baseline_commit = config.getoption("--benchmark-baseline")
+        baseline = benchmarks.find_report(
+            history,
+            report["suite"],
+            report["profile"],
+            commit=baseline_commit,
+            exclude_commit=None if baseline_commit else report["commit"],
+        )
+        if baseline is None:
+            pytest.skip(f"No stored {report['suite']} baseline for profile {report['profile']}; "
+                        f"this run has been recorded as the baseline")
+
+        rows = benchmarks.compare_reports(baseline, report, config.getoption("--benchmark-threshold"))
+        assert not any(row["regression"] for row in rows), (
+            f"Benchmarks regressed against {baseline['commit'][:12]}:\n" + benchmarks.format_comparison(rows)
+        )
+
+    return check
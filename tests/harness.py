@@ -0,0 +1,495 @@
+"""
+Shared harness for compiling and running the C++ task files.
+
+Every test takes one of the task files (stack.cpp, implementations/*.cpp, ...),
+replaces its main() with a test main, compiles the result and checks the
+program output. This module owns that whole cycle so the test modules only
+have to provide the test main and the expected output.
+
+Test mains are declared up front with register_test_main(). In batch mode
+(the default, disable with CPP_TEST_BATCH=0) every registered main of a task
+file is turned into a named function of one translation unit with a
+dispatching main(argc, argv), so the task file is compiled once and each test
+only runs the shared binary with its function name as argument. If the
+batched program does not compile, the tests fall back to compiling their own
+main so that one broken test cannot take down its neighbours.
+
+prebuild() compiles every registered program concurrently before the tests
+start (see conftest.py), so a test session waits for the slowest compile
+rather than the sum of all of them.
+
+All sources and binaries are written to a private build directory of the
+current process (on tmpfs when /dev/shm is available, or CPP_TEST_BUILD_DIR),
+and every test gets its own subdirectory in it, so parallel runs such as
+`pytest -n auto` never share temporary files.
+
+Programs are compiled with the flags of a named build profile (see
+BUILD_PROFILES), chosen with --build-profile or CPP_TEST_PROFILE, so the same
+suite can run as a quick correctness pass or as an optimised performance pass.
+Task files whose programs need more, such as -pthread for tests that start
+threads, declare it with register_target_flags().
+
+Test programs run under a wall-clock timeout, a CPU-time limit and an
+address-space cap (CPP_TEST_TIMEOUT, CPP_TEST_CPU_TIME and CPP_TEST_MEMORY_MB,
+overridable per test), so a runaway program fails its test quickly instead
+of hanging the whole run. The CPU-time and memory limits need the POSIX
+resource module; without it (e.g. on Windows) only the timeout applies.
+"""
+import atexit
+import concurrent.futures
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+
+import pytest
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from compile_cache import compile_cpp, leading_includes, precompiled_header_flags
+
+# Root of the repository (the directory containing stack.cpp)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Spellings of main() that the task files are allowed to use
+MAIN_SIGNATURES = ("int main()", "int main ()")
+
+# Compiler flags of each build profile
+BUILD_PROFILES = {
+    # Plain g++ (-O0): the quickest compile, for correctness runs
+    "fast": [],
+    "debug": ["-O0", "-g"],
+    "release": ["-O2"],
+    "native": ["-O3", "-march=native"],
+    "lto": ["-O3", "-march=native", "-flto"],
+}
+
+DEFAULT_BUILD_PROFILE = os.environ.get("CPP_TEST_PROFILE", "fast")
+
+_build_profile = DEFAULT_BUILD_PROFILE
+
+BATCH_ENABLED = os.environ.get("CPP_TEST_BATCH", "1") != "0"
+
+# Default limits for running a test program: wall-clock seconds, CPU seconds
+# and megabytes of address space (0 disables a limit)
+DEFAULT_TIMEOUT = float(os.environ.get("CPP_TEST_TIMEOUT", 60))
+DEFAULT_CPU_TIME = int(os.environ.get("CPP_TEST_CPU_TIME", 60))
+DEFAULT_MEMORY_MB = int(os.environ.get("CPP_TEST_MEMORY_MB", 2048))
+
+
+def _usable_cores():
+    # sched_getaffinity() only exists on some platforms (not on macOS or Windows)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Number of compilers prebuild() runs at once (defaults to the usable cores)
+BUILD_JOBS = int(os.environ.get("CPP_TEST_JOBS", 0)) or _usable_cores()
+
+# Registered test mains per task file, in registration order
+_test_mains = {}
+
+# Extra compiler flags per task file (see register_target_flags())
+_target_flags = {}
+
+# Batched binaries per task file (None if the batched program did not compile)
+_batch_binaries = {}
+
+# Parent of the per-process build directories
+BUILD_ROOT = os.environ.get("CPP_TEST_BUILD_DIR") or (
+    "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+)
+
+_build_dir = None
+
+
+def repo_path(relative_path):
+    """Return the absolute path of a file in the repository."""
+    return os.path.join(REPO_ROOT, relative_path)
+
+
+def find_main(source_code):
+    """Return the offset of main() in source_code, or -1 if there is none."""
+    for signature in MAIN_SIGNATURES:
+        main_start = source_code.find(signature)
+        if main_start != -1:
+            return main_start
+    return -1
+
+
+def splice_main(source_code, test_main):
+    """Replace everything from main() onwards with test_main."""
+    main_start = find_main(source_code)
+    if main_start == -1:
+        return None
+    return source_code[:main_start] + test_main
+
+
+def register_test_main(target_path, test_main):
+    """
+    Declare test_main as one of the test mains for the task file at target_path.
+
+    Returns test_main unchanged so it can be stored in a module-level constant.
+    """
+    mains = _test_mains.setdefault(target_path, [])
+    if test_main not in mains:
+        mains.append(test_main)
+    return test_main
+
+
+def register_target_flags(target_path, flags):
+    """
+    Compile every program built from the task file at target_path with flags
+    on top of the build profile's, e.g. -pthread for task files whose tests
+    start threads.
+    """
+    _target_flags[target_path] = list(flags)
+
+
+def target_flags(target_path):
+    """Return the extra compiler flags registered for the task file at target_path."""
+    return list(_target_flags.get(target_path, ()))
+
+
+def batch_function_name(index):
+    """Name of the function that holds the index-th test main in a batch."""
+    return f"batched_test_main_{index}"
+
+
+def build_batch_source(source_code, test_mains):
+    """
+    Build one translation unit running any of test_mains by name.
+
+    Each test main becomes a function named by batch_function_name() and the
+    generated main(argc, argv) calls the function named by argv[1].
+    """
+    prefix = splice_main(source_code, "")
+    if prefix is None:
+        return None
+
+    parts = [prefix, "#include <cstdio>\n#include <cstring>\n"]
+    for index, test_main in enumerate(test_mains):
+        main_start = find_main(test_main)
+        signature_end = test_main.index(")", main_start) + 1
+        parts.append(test_main[:main_start] + f"int {batch_function_name(index)}()" + test_main[signature_end:])
+
+    parts.append("\nint main(int argc, char* argv[])\n{\n")
+    parts.append("    if (argc < 2) {\n        fprintf(stderr, \"usage: %s TEST\\n\", argv[0]);\n        return 2;\n    }\n")
+    for index in range(len(test_mains)):
+        name = batch_function_name(index)
+        parts.append(f"    if (strcmp(argv[1], \"{name}\") == 0) return {name}();\n")
+    parts.append("    fprintf(stderr, \"Unknown test: %s\\n\", argv[1]);\n    return 2;\n}\n")
+    return "".join(parts)
+
+
+def set_build_profile(profile):
+    """Select the build profile used for every program compiled from now on."""
+    global _build_profile
+    if profile not in BUILD_PROFILES:
+        raise ValueError(f"Unknown build profile {profile!r}, expected one of {', '.join(BUILD_PROFILES)}")
+    _build_profile = profile
+
+
+def get_build_profile():
+    """Return the name of the current build profile."""
+    return _build_profile
+
+
+def build_flags(profile=None):
+    """Return the compiler flags of profile (the current build profile by default)."""
+    return list(BUILD_PROFILES[profile or _build_profile])
+
+
+def compile_program(file_path, output_path, profile=None, extra_flags=()):
+    """
+    Compile a test program with the build profile's flags (plus extra_flags)
+    and its leading standard headers precompiled.
+    """
+    flags = build_flags(profile) + list(extra_flags)
+    with open(file_path, 'r') as f:
+        headers = leading_includes(f.read())
+    return compile_cpp(file_path, output_path, flags + precompiled_header_flags(flags, headers))
+
+
+def get_build_dir():
+    """Return the private build directory of this process, creating it on first use."""
+    global _build_dir
+    if _build_dir is None:
+        # Name it after the xdist worker (if any) to make leftovers easy to trace
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        _build_dir = tempfile.mkdtemp(prefix=f"cpp_tests_{worker}_", dir=BUILD_ROOT)
+        atexit.register(shutil.rmtree, _build_dir, True)
+    return _build_dir
+
+
+def _read_source(target_path):
+    # Return the task file's source, or None if it does not exist (yet)
+    try:
+        with open(target_path, 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _build_batch(target_path, source_code):
+    # Write and compile the batched program for target_path
+    batch_source = build_batch_source(source_code, _test_mains[target_path])
+    if batch_source is None:
+        return None
+    base = os.path.splitext(os.path.basename(target_path))[0] + "_batch"
+    batch_file = os.path.join(get_build_dir(), base + ".cpp")
+    binary_path = os.path.join(get_build_dir(), base)
+    with open(batch_file, 'w') as f:
+        f.write(batch_source)
+    if compile_program(batch_file, binary_path, extra_flags=target_flags(target_path)).returncode != 0:
+        return None
+    return binary_path
+
+
+def _batch_binary(target_path, source_code):
+    # Compile the batched program for target_path once per session
+    if target_path not in _batch_binaries:
+        _batch_binaries[target_path] = _build_batch(target_path, source_code)
+    return _batch_binaries[target_path]
+
+
+def _warm_cache(target_path, source_code):
+    # Compile every spliced variant of target_path into the compile cache,
+    # so that the tests themselves only hit the cache
+    build_dir = tempfile.mkdtemp(prefix="prebuild_", dir=get_build_dir())
+    try:
+        for index, test_main in enumerate(_test_mains[target_path]):
+            temp_file = os.path.join(build_dir, f"variant_{index}.cpp")
+            with open(temp_file, 'w') as f:
+                f.write(splice_main(source_code, test_main))
+            compile_program(temp_file, os.path.join(build_dir, f"variant_{index}"),
+                            extra_flags=target_flags(target_path))
+    finally:
+        shutil.rmtree(build_dir, True)
+
+
+def prebuild(jobs=BUILD_JOBS):
+    """
+    Compile the programs of every registered task file concurrently.
+
+    In batch mode this builds each task file's batched binary; otherwise it
+    compiles every spliced variant into the compile cache. Task files that do
+    not exist or have no main() are left for the tests to skip.
+    """
+    targets = {}
+    for target_path in _test_mains:
+        source_code = _read_source(target_path)
+        if source_code is not None and find_main(source_code) != -1:
+            targets[target_path] = source_code
+    if not targets:
+        return
+
+    # g++ runs in its own process, so threads are enough to keep every core busy
+    get_build_dir()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        if BATCH_ENABLED:
+            pending = {
+                target_path: executor.submit(_build_batch, target_path, source_code)
+                for target_path, source_code in targets.items()
+                if target_path not in _batch_binaries
+            }
+            for target_path, future in pending.items():
+                _batch_binaries[target_path] = future.result()
+        else:
+            for future in [executor.submit(_warm_cache, *item) for item in targets.items()]:
+                future.result()
+
+
+def _limit_resources(cpu_time, memory_mb):
+    # Returns the preexec_fn applying the limits, run in the child between
+    # fork and exec, or None if there are none or rlimits are not available
+    if resource is None or not (cpu_time or memory_mb):
+        return None
+
+    def apply():
+        if cpu_time:
+            # The soft limit sends SIGXCPU, the hard limit one second later SIGKILL
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_time, cpu_time + 1))
+        if memory_mb:
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    return apply
+
+
+def _children_cpu_time():
+    # CPU seconds used by all reaped child processes, or None without rlimits
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def classify_failure(returncode, stderr, cpu_time=None, memory_mb=None, cpu_used=None):
+    """
+    Describe why a test program exited with a non-zero status.
+
+    cpu_used is the CPU time the program consumed. A SIGKILL is only blamed on
+    the CPU-time limit (whose hard limit sends it) if cpu_used reached that
+    limit; otherwise something else killed it, typically the OOM killer.
+    """
+    if cpu_time and returncode == -signal.SIGXCPU:
+        return f"Runtime error: CPU time limit of {cpu_time}s exceeded\n{stderr}"
+    if hasattr(signal, "SIGKILL") and returncode == -signal.SIGKILL:
+        if cpu_time and cpu_used is not None and cpu_used >= cpu_time:
+            return f"Runtime error: CPU time limit of {cpu_time}s exceeded\n{stderr}"
+        return f"Runtime error: killed by SIGKILL (out of memory?)\n{stderr}"
+    if "bad_alloc" in stderr and memory_mb:
+        return f"Runtime error: out of memory (limit {memory_mb} MB)\n{stderr}"
+    return f"Runtime error: {stderr}"
+
+
+def run_binary(binary_path, args=(), input_data=None, timeout=None, cpu_time=None, memory_mb=None):
+    """
+    Run a compiled test program.
+
+    timeout, cpu_time and memory_mb default to DEFAULT_TIMEOUT,
+    DEFAULT_CPU_TIME and DEFAULT_MEMORY_MB; pass 0 to lift a limit.
+    Returns the program's stdout, or a string starting with "Runtime error"
+    if it exited with a non-zero status, ran out of time or out of memory.
+    """
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    cpu_time = DEFAULT_CPU_TIME if cpu_time is None else cpu_time
+    memory_mb = DEFAULT_MEMORY_MB if memory_mb is None else memory_mb
+    if resource is None:
+        # Only the wall-clock timeout can be enforced
+        cpu_time = memory_mb = 0
+
+    # The program is the only child reaped meanwhile, so the difference in the
+    # children's CPU time is its own usage
+    cpu_before = _children_cpu_time()
+    try:
+        run_result = subprocess.run(
+            [binary_path, *args],
+            input=input_data,
+            capture_output=True,
+            text=True,
+            timeout=timeout or None,
+            preexec_fn=_limit_resources(cpu_time, memory_mb)
+        )
+    except subprocess.TimeoutExpired as e:
+        stderr = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else (e.stderr or "")
+        return f"Runtime error: timed out after {timeout}s\n{stderr}"
+
+    if run_result.returncode != 0:
+        cpu_used = None if cpu_before is None else _children_cpu_time() - cpu_before
+        return classify_failure(run_result.returncode, run_result.stderr, cpu_time, memory_mb, cpu_used)
+
+    return run_result.stdout
+
+
+def run_cpp_file(file_path, input_data=None, extra_flags=(), **limits):
+    """
+    Compile and run a C++ file.
+
+    extra_flags are added to the build profile's flags.
+    limits are passed on to run_binary() (timeout, cpu_time, memory_mb).
+
+    Returns the program's stdout, or a string starting with "Compilation error"
+    or "Runtime error" if either step failed.
+    """
+    # Get the directory containing the file
+    file_dir = os.path.dirname(file_path)
+    # Get the file name without extension
+    file_name = os.path.splitext(os.path.basename(file_path))[0]
+    binary_path = os.path.join(file_dir, file_name)
+
+    # Compile the file
+    compile_result = compile_program(file_path, binary_path, extra_flags=extra_flags)
+    if compile_result.returncode != 0:
+        return f"Compilation error: {compile_result.stderr}"
+
+    # Run the compiled file
+    try:
+        return run_binary(binary_path, input_data=input_data, **limits)
+    finally:
+        # Clean up the compiled file
+        try:
+            os.remove(binary_path)
+        except OSError:
+            pass
+
+
+def run_test_main(target_path, test_main, name, input_data=None, **limits):
+    """
+    Splice test_main into the task file at target_path, then compile and run it.
+
+    The test is skipped if the task file does not exist yet or has no main().
+    name is used for the temporary source file, which is written to a fresh
+    directory inside the build directory.
+    In batch mode a registered test_main runs from the shared batched binary.
+    limits are passed on to run_binary() (timeout, cpu_time, memory_mb).
+    """
+    # Skip if the file doesn't exist
+    if not os.path.exists(target_path):
+        pytest.skip(f"File {target_path} does not exist")
+
+    with open(target_path, 'r') as f:
+        source_code = f.read()
+
+    modified_code = splice_main(source_code, test_main)
+    if modified_code is None:
+        pytest.skip(f"Could not find main function in {os.path.basename(target_path)}")
+
+    mains = _test_mains.get(target_path, [])
+    if BATCH_ENABLED and test_main in mains:
+        binary_path = _batch_binary(target_path, source_code)
+        if binary_path is not None:
+            return run_binary(binary_path, [batch_function_name(mains.index(test_main))], input_data, **limits)
+
+    test_dir = tempfile.mkdtemp(prefix=name + "_", dir=get_build_dir())
+    temp_file = os.path.join(test_dir, name + ".cpp")
+    with open(temp_file, 'w') as f:
+        f.write(modified_code)
+
+    try:
+        return run_cpp_file(temp_file, input_data, target_flags(target_path), **limits)
+    finally:
+        shutil.rmtree(test_dir, True)
+
+
+def build_program(target_path, main_code, name, profile=None, extra_flags=()):
+    """
+    Splice main_code into the task file at target_path and compile it.
+
+    Unlike run_test_main() this is meant for tools such as the benchmarks:
+    it returns the path of the binary (which stays in the build directory)
+    and raises RuntimeError if the task file has no main() or the program
+    does not compile. extra_flags are added to the build profile's flags
+    and those registered for the task file.
+    """
+    with open(target_path, 'r') as f:
+        source_code = f.read()
+
+    modified_code = splice_main(source_code, main_code)
+    if modified_code is None:
+        raise RuntimeError(f"Could not find main function in {os.path.basename(target_path)}")
+
+    program_dir = tempfile.mkdtemp(prefix=name + "_", dir=get_build_dir())
+    temp_file = os.path.join(program_dir, name + ".cpp")
+    binary_path = os.path.join(program_dir, name)
+    with open(temp_file, 'w') as f:
+        f.write(modified_code)
+
+    compile_result = compile_program(temp_file, binary_path, profile, target_flags(target_path) + list(extra_flags))
+    if compile_result.returncode != 0:
+        raise RuntimeError(f"Compilation error: {compile_result.stderr}")
+    return binary_path
+
+
+def build_shared_library(target_path, binding_code, name, profile=None):
+    """
+    Replace the main() of the task file at target_path with binding_code
+    (typically extern "C" wrappers) and compile it into a shared library
+    that can be loaded with ctypes. Returns the path of the library.
+    """
+    return build_program(target_path, binding_code, name + ".so", profile, ["-shared", "-fPIC"])
@@ -0,0 +1,306 @@
+"""
+In-process Python bindings for the Stack class in stack.cpp.
+
+stack.cpp is compiled into a shared library with its main() replaced by the
+extern "C" wrappers below and loaded with ctypes, so tests and benchmarks can
+call push/pop/peek directly instead of compiling and spawning a program for
+every check.
+
+    from stack_bindings import Stack
+    stack = Stack()
+    stack.push(42)
+    assert stack.pop() == 42
+
+push_range() and pop_n() move whole buffers of C ints in one call and accept
+any object supporting the buffer protocol (array.array("i"), bytes, NumPy
+int32 arrays, ...) without converting the elements one by one.
+
+save() and Stack.load() write and read the binary snapshots of Stack::save
+and Stack::load.
+"""
+import array
+import ctypes
+import functools
+import os
+import sys
+
+from harness import build_shared_library, repo_path
+
+# Path to the stack.cpp file
+STACK_CPP_PATH = repo_path("stack.cpp")
+
+# Buffer formats of native C ints: 'i' and 'l' in native byte order, either
+# without a prefix or with '@', '=' or the explicit byte order of this host
+# (ctypes arrays use '<i' on little-endian hosts). Any format of the wrong
+# size, such as an 8-byte 'l', is rejected by the itemsize check.
+INT_FORMATS = ("i", "@i", "=i", "l", "@l") + (("<i",) if sys.byteorder == "little" else (">i", "!i"))
+
+STACK_BINDINGS = """
+#include <cstdio>
+
+// C interface to Stack for ctypes. peek and pop report an empty stack through
+// their return value (0 on success, -1 if empty) instead of touching it.
+extern "C" {
+
+Stack* stack_new()
+{
+    return new Stack();
+}
+
+// Reports an invalid policy as a message in error and returns nullptr
+Stack* stack_new_with_policy(double growth_factor, double shrink_below, size_t min_capacity,
+                             char* error, size_t error_size)
+{
+    GrowthPolicy policy;
+    policy.growthFactor = growth_factor;
+    policy.shrinkBelow = shrink_below;
+    policy.minCapacity = min_capacity;
+    try {
+        return new Stack(policy);
+    } catch (const invalid_argument& e) {
+        snprintf(error, error_size, "%s", e.what());
+        return nullptr;
+    }
+}
+
+void stack_free(Stack* stack)
+{
+    delete stack;
+}
+
+int stack_is_empty(Stack* stack)
+{
+    return stack->isEmpty();
+}
+
+int stack_size(Stack* stack)
+{
+    return stack->size();
+}
+
+void stack_push(Stack* stack, int value)
+{
+    stack->push(value);
+}
+
+int stack_peek(Stack* stack, int* value)
+{
+    if (stack->isEmpty()) {
+        return -1;
+    }
+    *value = stack->peek();
+    return 0;
+}
+
+int stack_pop(Stack* stack, int* value)
+{
+    if (stack->isEmpty()) {
+        return -1;
+    }
+    *value = stack->pop();
+    return 0;
+}
+
+void stack_push_range(Stack* stack, const int* values, size_t count)
+{
+    stack->pushRange(values, count);
+}
+
+size_t stack_pop_n(Stack* stack, int* out, size_t n)
+{
+    return stack->popN(out, n);
+}
+
+size_t stack_capacity(Stack* stack)
+{
+    return stack->capacity();
+}
+
+void stack_reserve(Stack* stack, size_t n)
+{
+    stack->reserve(n);
+}
+
+void stack_shrink_to_fit(Stack* stack)
+{
+    stack->shrinkToFit();
+}
+
+// Snapshots report failures as a message in error (0 on success, -1 on failure)
+int stack_save(Stack* stack, const char* path, char* error, size_t error_size)
+{
+    try {
+        stack->save(path);
+        return 0;
+    } catch (const exception& e) {
+        snprintf(error, error_size, "%s", e.what());
+        return -1;
+    }
+}
+
+Stack* stack_load(const char* path, char* error, size_t error_size)
+{
+    try {
+        return new Stack(Stack::load(path));
+    } catch (const exception& e) {
+        snprintf(error, error_size, "%s", e.what());
+        return nullptr;
+    }
+}
+
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def load_stack_library(profile=None):
+    """Build (once per profile) and load the Stack shared library."""
+    library = ctypes.CDLL(build_shared_library(STACK_CPP_PATH, STACK_BINDINGS, "libstack", profile))
+
+    handle = ctypes.c_void_p
+    library.stack_new.argtypes = []
+    library.stack_new.restype = handle
+    library.stack_new_with_policy.argtypes = [ctypes.c_double, ctypes.c_double, ctypes.c_size_t,
+                                              ctypes.c_char_p, ctypes.c_size_t]
+    library.stack_new_with_policy.restype = handle
+    library.stack_free.argtypes = [handle]
+    library.stack_free.restype = None
+    library.stack_is_empty.argtypes = [handle]
+    library.stack_is_empty.restype = ctypes.c_int
+    library.stack_size.argtypes = [handle]
+    library.stack_size.restype = ctypes.c_int
+    library.stack_push.argtypes = [handle, ctypes.c_int]
+    library.stack_push.restype = None
+    library.stack_peek.argtypes = [handle, ctypes.POINTER(ctypes.c_int)]
+    library.stack_peek.restype = ctypes.c_int
+    library.stack_pop.argtypes = [handle, ctypes.POINTER(ctypes.c_int)]
+    library.stack_pop.restype = ctypes.c_int
+    library.stack_push_range.argtypes = [handle, ctypes.c_void_p, ctypes.c_size_t]
+    library.stack_push_range.restype = None
+    library.stack_pop_n.argtypes = [handle, ctypes.c_void_p, ctypes.c_size_t]
+    library.stack_pop_n.restype = ctypes.c_size_t
+    library.stack_capacity.argtypes = [handle]
+    library.stack_capacity.restype = ctypes.c_size_t
+    library.stack_reserve.argtypes = [handle, ctypes.c_size_t]
+    library.stack_reserve.restype = None
+    library.stack_shrink_to_fit.argtypes = [handle]
+    library.stack_shrink_to_fit.restype = None
+    library.stack_save.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t]
+    library.stack_save.restype = ctypes.c_int
+    library.stack_load.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t]
+    library.stack_load.restype = handle
+    return library
+
+
+def _int_buffer(values):
+    """
+    Return (buffer, count) for a buffer of C ints, where buffer is a ctypes
+    object sharing the memory of values when it is writable and a single
+    bulk copy of it otherwise. Raw byte buffers are read as native ints.
+    """
+    view = memoryview(values)
+    if not view.c_contiguous:
+        raise BufferError("push_range needs a contiguous buffer")
+    if view.format not in ("B", "b", "c") and (view.itemsize != ctypes.sizeof(ctypes.c_int)
+                                               or view.format not in INT_FORMATS):
+        raise TypeError(f"push_range needs C int values, got format {view.format!r}")
+    if view.nbytes % ctypes.sizeof(ctypes.c_int):
+        raise ValueError("buffer size is not a multiple of the size of a C int")
+
+    raw = view.cast("B")
+    buffer_type = ctypes.c_char * raw.nbytes
+    buffer = buffer_type.from_buffer_copy(raw) if raw.readonly else buffer_type.from_buffer(raw)
+    return buffer, raw.nbytes // ctypes.sizeof(ctypes.c_int)
+
+
+class Stack:
+    """
+    A Stack from stack.cpp living in this process.
+
+    growth_factor, shrink_below and min_capacity set its GrowthPolicy; the
+    defaults are the same as in stack.cpp. A policy stack.cpp rejects raises
+    ValueError.
+    """
+
+    def __init__(self, profile=None, growth_factor=2.0, shrink_below=0.0, min_capacity=16):
+        self._library = load_stack_library(profile)
+        error = ctypes.create_string_buffer(256)
+        self._handle = self._library.stack_new_with_policy(growth_factor, shrink_below, min_capacity,
+                                                           error, len(error))
+        if not self._handle:
+            raise ValueError(error.value.decode(errors="replace"))
+        self._value = ctypes.c_int()
+
+    @classmethod
+    def load(cls, path, profile=None):
+        """Return the Stack stored in the snapshot at path (default growth policy)."""
+        library = load_stack_library(profile)
+        error = ctypes.create_string_buffer(256)
+        handle = library.stack_load(os.fsencode(path), error, len(error))
+        if not handle:
+            raise OSError(error.value.decode(errors="replace"))
+        stack = cls.__new__(cls)
+        stack._library = library
+        stack._handle = handle
+        stack._value = ctypes.c_int()
+        return stack
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Free the underlying C++ object (also done when garbage collected)."""
+        if getattr(self, "_handle", None):
+            self._library.stack_free(self._handle)
+            self._handle = None
+
+    def is_empty(self):
+        return bool(self._library.stack_is_empty(self._handle))
+
+    def size(self):
+        return self._library.stack_size(self._handle)
+
+    def __len__(self):
+        return self.size()
+
+    def push(self, value):
+        self._library.stack_push(self._handle, value)
+
+    def peek(self):
+        if self._library.stack_peek(self._handle, ctypes.byref(self._value)) != 0:
+            raise IndexError("peek from empty stack")
+        return self._value.value
+
+    def pop(self):
+        if self._library.stack_pop(self._handle, ctypes.byref(self._value)) != 0:
+            raise IndexError("pop from empty stack")
+        return self._value.value
+
+    def capacity(self):
+        return self._library.stack_capacity(self._handle)
+
+    def reserve(self, n):
+        self._library.stack_reserve(self._handle, n)
+
+    def shrink_to_fit(self):
+        self._library.stack_shrink_to_fit(self._handle)
+
+    def save(self, path):
+        """Write a snapshot of the values to path."""
+        error = ctypes.create_string_buffer(256)
+        if self._library.stack_save(self._handle, os.fsencode(path), error, len(error)) != 0:
+            raise OSError(error.value.decode(errors="replace"))
+
+    def push_range(self, values):
+        """Push every C int in the buffer values, the last one ends up on top."""
+        buffer, count = _int_buffer(values)
+        if count:
+            self._library.stack_push_range(self._handle, ctypes.addressof(buffer), count)
+
+    def pop_n(self, n):
+        """Pop up to n values and return them top first as an array.array("i")."""
+        out = array.array("i", bytes(min(n, self.size()) * ctypes.sizeof(ctypes.c_int)))
+        if out:
+            address, length = out.buffer_info()
+            self._library.stack_pop_n(self._handle, address, length)
+        return out
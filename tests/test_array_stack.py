@@ -1,74 +1,18 @@
 """
 Tests for the array-based stack implementation (Task 2).
 """
-import subprocess
 import os
-import sys
-import pytest
 
-# Helper function to compile and run a C++ file
-def run_cpp_file(file_path):
-    # Get the directory containing the file
-    file_dir = os.path.dirname(file_path)
-    # Get the file name without extension
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
-    # Compile the file
-    compile_result = subprocess.run(
-        ["g++", "-o", os.path.join(file_dir, file_name), file_path],
-        capture_output=True,
-        text=True
-    )
-    if compile_result.returncode != 0:
-        return f"Compilation error: {compile_result.stderr}"
-    
-    # Run the compiled file
-    run_result = subprocess.run(
-        [os.path.join(file_dir, file_name)],
-        capture_output=True,
-        text=True
-    )
-    
-    # Clean up the compiled file
-    try:
-        os.remove(os.path.join(file_dir, file_name))
-    except:
-        pass
-    
-    if run_result.returncode != 0:
-        return f"Runtime error: {run_result.stderr}"
-    
-    return run_result.stdout
+from harness import register_test_main, repo_path, run_test_main
 
 # Path to the array_stack.cpp file
-ARRAY_STACK_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "implementations/array_stack.cpp")
+ARRAY_STACK_PATH = repo_path("implementations/array_stack.cpp")
 
 def test_array_stack_exists():
     """Test that the array_stack.cpp file exists."""
     assert os.path.exists(ARRAY_STACK_PATH), f"File {ARRAY_STACK_PATH} does not exist"
 
-def test_array_stack_basic_operations():
-    """Test that the basic stack operations work correctly for the array-based implementation."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(ARRAY_STACK_PATH):
-        pytest.skip(f"File {ARRAY_STACK_PATH} does not exist")
-    
-    # Create a temporary file with a modified main function to test basic operations
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_array_stack_basic.cpp")
-    
-    with open(ARRAY_STACK_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = stack_code.find("int main()")
-    if main_start == -1:
-        main_start = stack_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in array_stack.cpp")
-    
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+ARRAY_STACK_BASIC_OPERATIONS_MAIN = register_test_main(ARRAY_STACK_PATH, """
 int main()
 {
     // Assuming the stack class is named ArrayStack
@@ -141,48 +85,17 @@ int main()
     cout << "PASS: All basic stack operations work correctly" << endl;
     return 0;
 }
-"""
-    
-    modified_code = stack_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_array_stack_basic_operations():
+    """Test that the basic stack operations work correctly for the array-based implementation."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(ARRAY_STACK_PATH, ARRAY_STACK_BASIC_OPERATIONS_MAIN, "temp_array_stack_basic")
     
     # Check the output
     assert "PASS: All basic stack operations work correctly" in output, f"Test failed with output: {output}"
 
-def test_array_stack_overflow():
-    """Test that the array-based stack handles overflow correctly."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(ARRAY_STACK_PATH):
-        pytest.skip(f"File {ARRAY_STACK_PATH} does not exist")
-    
-    # Create a temporary file with a modified main function to test overflow
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_array_stack_overflow.cpp")
-    
-    with open(ARRAY_STACK_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = stack_code.find("int main()")
-    if main_start == -1:
-        main_start = stack_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in array_stack.cpp")
-    
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+ARRAY_STACK_OVERFLOW_MAIN = register_test_main(ARRAY_STACK_PATH, """
 int main()
 {
     // Assuming the stack class is named ArrayStack
@@ -210,48 +123,17 @@ int main()
     cout << "PASS: Stack overflow test completed" << endl;
     return 0;
 }
-"""
-    
-    modified_code = stack_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_array_stack_overflow():
+    """Test that the array-based stack handles overflow correctly."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(ARRAY_STACK_PATH, ARRAY_STACK_OVERFLOW_MAIN, "temp_array_stack_overflow")
     
     # Check the output
     assert "PASS: Stack overflow test completed" in output, f"Test failed with output: {output}"
 
-def test_array_stack_underflow():
-    """Test that the array-based stack handles underflow correctly."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(ARRAY_STACK_PATH):
-        pytest.skip(f"File {ARRAY_STACK_PATH} does not exist")
-    
-    # Create a temporary file with a modified main function to test underflow
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_array_stack_underflow.cpp")
-    
-    with open(ARRAY_STACK_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = stack_code.find("int main()")
-    if main_start == -1:
-        main_start = stack_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in array_stack.cpp")
-    
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+ARRAY_STACK_UNDERFLOW_MAIN = register_test_main(ARRAY_STACK_PATH, """
 int main()
 {
     // Assuming the stack class is named ArrayStack
@@ -278,21 +160,73 @@ int main()
     cout << "PASS: Stack underflow test completed" << endl;
     return 0;
 }
-"""
+""")
+
+def test_array_stack_underflow():
+    """Test that the array-based stack handles underflow correctly."""
+    # Run the test
+    output = run_test_main(ARRAY_STACK_PATH, ARRAY_STACK_UNDERFLOW_MAIN, "temp_array_stack_underflow")
     
-    modified_code = stack_code[:main_start] + test_main
+    # Check the output
+    assert "PASS: Stack underflow test completed" in output, f"Test failed with output: {output}"
+
+ARRAY_STACK_CAPACITY_MODES_MAIN = register_test_main(ARRAY_STACK_PATH, """
+int main()
+{
+    // Test that a fixed stack holds exactly its capacity
+    ArrayStack fixed(50);
+    for (int i = 0; i < 50; i++) {
+        fixed.push(i);
+    }
+    if (!fixed.isFull() || fixed.capacity() != 50) {
+        cout << "FAIL: Fixed stack should be full at its capacity of 50" << endl;
+        return 1;
+    }
+    try {
+        fixed.push(50);
+        cout << "FAIL: Pushing to a full fixed stack should throw" << endl;
+        return 1;
+    } catch (const overflow_error&) {
+    }
+    if (fixed.size() != 50 || fixed.peek() != 49) {
+        cout << "FAIL: A failed push should leave the stack unchanged" << endl;
+        return 1;
+    }
     
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
+    // Test that a growable stack keeps growing and keeps its values
+    ArrayStack growable(1, CapacityMode::Growable);
+    for (int i = 0; i < 10000; i++) {
+        growable.push(i);
+    }
+    if (growable.size() != 10000 || growable.capacity() < 10000 || growable.capacity() > 20000) {
+        cout << "FAIL: Growable stack should hold 10000 values with at most double the capacity" << endl;
+        return 1;
+    }
+    for (int i = 9999; i >= 0; i--) {
+        int value = growable.pop();
+        if (value != i) {
+            cout << "FAIL: Expected " << i << " but got " << value << endl;
+            return 1;
+        }
+    }
     
-    # Run the test
-    output = run_cpp_file(temp_file)
+    // Test a growable stack starting without any capacity
+    ArrayStack empty(0, CapacityMode::Growable);
+    empty.push(7);
+    if (empty.pop() != 7 || !empty.isEmpty()) {
+        cout << "FAIL: Growable stack with capacity 0 should grow on the first push" << endl;
+        return 1;
+    }
     
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    cout << "PASS: Capacity modes work correctly" << endl;
+    return 0;
+}
+""")
+
+def test_array_stack_capacity_modes():
+    """Test the fixed and growable capacity modes of the array-based stack."""
+    # Run the test
+    output = run_test_main(ARRAY_STACK_PATH, ARRAY_STACK_CAPACITY_MODES_MAIN, "temp_array_stack_capacity_modes")
     
     # Check the output
-    assert "PASS: Stack underflow test completed" in output, f"Test failed with output: {output}"
+    assert "PASS: Capacity modes work correctly" in output, f"Test failed with output: {output}"
@@ -1,60 +1,13 @@
 """
 Tests for the basic stack implementation (Task 1).
 """
-import subprocess
-import os
-import sys
-import pytest
 
-# Helper function to compile and run a C++ file
-def run_cpp_file(file_path):
-    # Get the directory containing the file
-    file_dir = os.path.dirname(file_path)
-    # Get the file name without extension
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
-    # Compile the file
-    compile_result = subprocess.run(
-        ["g++", "-o", os.path.join(file_dir, file_name), file_path],
-        capture_output=True,
-        text=True
-    )
-    if compile_result.returncode != 0:
-        return f"Compilation error: {compile_result.stderr}"
-    
-    # Run the compiled file
-    run_result = subprocess.run(
-        [os.path.join(file_dir, file_name)],
-        capture_output=True,
-        text=True
-    )
-    
-    # Clean up the compiled file
-    try:
-        os.remove(os.path.join(file_dir, file_name))
-    except:
-        pass
-    
-    if run_result.returncode != 0:
-        return f"Runtime error: {run_result.stderr}"
-    
-    return run_result.stdout
+from harness import register_test_main, repo_path, run_test_main
 
 # Path to the stack.cpp file
-STACK_CPP_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "stack.cpp")
+STACK_CPP_PATH = repo_path("stack.cpp")
 
-def test_stack_basic_operations():
-    """Test that the basic stack operations work correctly."""
-    # Create a temporary file with a modified main function to test basic operations
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_stack_basic.cpp")
-    
-    with open(STACK_CPP_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Replace the main function with our test main
-    main_start = stack_code.find("int main()")
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+STACK_BASIC_OPERATIONS_MAIN = register_test_main(STACK_CPP_PATH, """
 int main()
 {
     Stack stack;
@@ -126,38 +79,17 @@ int main()
     cout << "PASS: All basic stack operations work correctly" << endl;
     return 0;
 }
-"""
-    
-    modified_code = stack_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_stack_basic_operations():
+    """Test that the basic stack operations work correctly."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(STACK_CPP_PATH, STACK_BASIC_OPERATIONS_MAIN, "temp_stack_basic")
     
     # Check the output
     assert "PASS: All basic stack operations work correctly" in output, f"Test failed with output: {output}"
 
-def test_stack_edge_cases():
-    """Test edge cases for the stack implementation."""
-    # Create a temporary file with a modified main function to test edge cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_stack_edge.cpp")
-    
-    with open(STACK_CPP_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Replace the main function with our test main
-    main_start = stack_code.find("int main()")
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+STACK_EDGE_CASES_MAIN = register_test_main(STACK_CPP_PATH, """
 int main()
 {
     Stack stack;
@@ -202,21 +134,279 @@ int main()
     cout << "PASS: Stack edge cases handled correctly" << endl;
     return 0;
 }
-"""
+""")
+
+def test_stack_edge_cases():
+    """Test edge cases for the stack implementation."""
+    # Run the test
+    output = run_test_main(STACK_CPP_PATH, STACK_EDGE_CASES_MAIN, "temp_stack_edge")
+    
+    # Check the output
+    assert "PASS: Stack edge cases handled correctly" in output, f"Test failed with output: {output}"
+
+STACK_BULK_OPERATIONS_MAIN = register_test_main(STACK_CPP_PATH, """
+int main()
+{
+    Stack stack;
+    
+    // Test pushRange keeps the order of the input, last value on top
+    const int NUM_ELEMENTS = 10000;
+    vector<int> values(NUM_ELEMENTS);
+    for (int i = 0; i < NUM_ELEMENTS; i++) {
+        values[i] = i;
+    }
+    stack.push(-1);
+    stack.pushRange(values.data(), values.size());
     
-    modified_code = stack_code[:main_start] + test_main
+    if (stack.size() != NUM_ELEMENTS + 1) {
+        cout << "FAIL: Stack should have size " << NUM_ELEMENTS + 1 << " after pushRange" << endl;
+        return 1;
+    }
+    if (stack.peek() != NUM_ELEMENTS - 1) {
+        cout << "FAIL: peek should return the last pushed value" << endl;
+        return 1;
+    }
     
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
+    // Test popN returns the values in pop order (top first)
+    vector<int> out(NUM_ELEMENTS);
+    size_t popped = stack.popN(out.data(), NUM_ELEMENTS);
+    if (popped != NUM_ELEMENTS) {
+        cout << "FAIL: popN should pop " << NUM_ELEMENTS << " values but popped " << popped << endl;
+        return 1;
+    }
+    for (int i = 0; i < NUM_ELEMENTS; i++) {
+        if (out[i] != NUM_ELEMENTS - 1 - i) {
+            cout << "FAIL: Expected " << NUM_ELEMENTS - 1 - i << " but got " << out[i] << endl;
+            return 1;
+        }
+    }
+    if (stack.size() != 1 || stack.peek() != -1) {
+        cout << "FAIL: popN should leave the older values on the stack" << endl;
+        return 1;
+    }
+    
+    // Test popN stops at the bottom of the stack
+    popped = stack.popN(out.data(), 5);
+    if (popped != 1 || out[0] != -1 || !stack.isEmpty()) {
+        cout << "FAIL: popN should only pop the values that are on the stack" << endl;
+        return 1;
+    }
+    
+    // Test empty ranges
+    stack.pushRange(values.data(), 0);
+    if (!stack.isEmpty() || stack.popN(out.data(), 3) != 0) {
+        cout << "FAIL: Empty pushRange or popN on an empty stack should do nothing" << endl;
+        return 1;
+    }
     
+    cout << "PASS: Bulk stack operations work correctly" << endl;
+    return 0;
+}
+""")
+
+def test_stack_bulk_operations():
+    """Test pushRange and popN."""
     # Run the test
-    output = run_cpp_file(temp_file)
+    output = run_test_main(STACK_CPP_PATH, STACK_BULK_OPERATIONS_MAIN, "temp_stack_bulk")
     
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    # Check the output
+    assert "PASS: Bulk stack operations work correctly" in output, f"Test failed with output: {output}"
+
+STACK_CAPACITY_MAIN = register_test_main(STACK_CPP_PATH, """
+int main()
+{
+    // Test reserve avoids reallocations during a bulk load
+    Stack stack;
+    stack.reserve(100000);
+    size_t reserved = stack.capacity();
+    if (reserved < 100000) {
+        cout << "FAIL: reserve(100000) should give a capacity of at least 100000" << endl;
+        return 1;
+    }
+    for (int i = 0; i < 100000; i++) {
+        stack.push(i);
+    }
+    if (stack.capacity() != reserved) {
+        cout << "FAIL: Pushing into reserved space should not reallocate" << endl;
+        return 1;
+    }
+    
+    // Test shrinkToFit releases the unused capacity
+    for (int i = 0; i < 90000; i++) {
+        stack.pop();
+    }
+    stack.shrinkToFit();
+    if (stack.capacity() != 10000 || stack.peek() != 9999) {
+        cout << "FAIL: shrinkToFit should leave capacity 10000, got " << stack.capacity() << endl;
+        return 1;
+    }
+    
+    // Test the growth factor
+    GrowthPolicy slow;
+    slow.growthFactor = 1.5;
+    slow.minCapacity = 100;
+    Stack slowStack(slow);
+    slowStack.push(1);
+    if (slowStack.capacity() != 100) {
+        cout << "FAIL: First push should allocate minCapacity, got " << slowStack.capacity() << endl;
+        return 1;
+    }
+    for (int i = 0; i < 100; i++) {
+        slowStack.push(i);
+    }
+    if (slowStack.capacity() != 150) {
+        cout << "FAIL: Capacity should grow by 1.5x to 150, got " << slowStack.capacity() << endl;
+        return 1;
+    }
+    
+    // Test hysteresis: shrink below a quarter, to twice the size
+    GrowthPolicy shrinking;
+    shrinking.shrinkBelow = 0.25;
+    Stack spiky(shrinking);
+    for (int i = 0; i < 1000000; i++) {
+        spiky.push(i);
+    }
+    size_t peak = spiky.capacity();
+    while (spiky.size() > 1000) {
+        spiky.pop();
+    }
+    if (spiky.capacity() >= peak / 4) {
+        cout << "FAIL: Capacity should shrink after large pops, still " << spiky.capacity() << endl;
+        return 1;
+    }
+    size_t shrunk = spiky.capacity();
+    for (int round = 0; round < 1000; round++) {
+        spiky.push(round);
+        spiky.pop();
+    }
+    if (spiky.capacity() != shrunk) {
+        cout << "FAIL: Pushing and popping at the boundary should not reallocate" << endl;
+        return 1;
+    }
+    for (int i = 999; i >= 0; i--) {
+        if (spiky.pop() != i) {
+            cout << "FAIL: Shrinking should keep the values in order" << endl;
+            return 1;
+        }
+    }
+    
+    // Test that policies which would reallocate on every push or shrink right
+    // after growing are rejected
+    GrowthPolicy noGrowth;
+    noGrowth.growthFactor = 1.0;
+    GrowthPolicy thrashing;
+    thrashing.shrinkBelow = 0.6;
+    for (GrowthPolicy invalid : {noGrowth, thrashing}) {
+        try {
+            Stack rejected(invalid);
+            cout << "FAIL: Stack should reject growthFactor " << invalid.growthFactor
+                 << " with shrinkBelow " << invalid.shrinkBelow << endl;
+            return 1;
+        } catch (const invalid_argument&) {
+        }
+        try {
+            stack.setGrowthPolicy(invalid);
+            cout << "FAIL: setGrowthPolicy should reject growthFactor " << invalid.growthFactor
+                 << " with shrinkBelow " << invalid.shrinkBelow << endl;
+            return 1;
+        } catch (const invalid_argument&) {
+        }
+    }
+    if (stack.growthPolicy().growthFactor != 2.0) {
+        cout << "FAIL: A rejected policy should leave the current one in place" << endl;
+        return 1;
+    }
+    
+    cout << "PASS: Stack capacity control works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_stack_capacity_control():
+    """Test reserve, shrinkToFit and the growth policy."""
+    # Run the test
+    output = run_test_main(STACK_CPP_PATH, STACK_CAPACITY_MAIN, "temp_stack_capacity")
     
     # Check the output
-    assert "PASS: Stack edge cases handled correctly" in output, f"Test failed with output: {output}"
+    assert "PASS: Stack capacity control works correctly" in output, f"Test failed with output: {output}"
+
+STACK_SNAPSHOT_MAIN = register_test_main(STACK_CPP_PATH, """
+int main() {
+    // The test passes a directory to write the snapshots to
+    string directory;
+    cin >> directory;
+    
+    // Test a round trip of a large stack
+    Stack stack;
+    for (int i = 0; i < 1000000; i++) {
+        stack.push(i * 7 - 3000000);
+    }
+    stack.save(directory + "/large.snap");
+    Stack loaded = Stack::load(directory + "/large.snap");
+    if (loaded.size() != 1000000) {
+        cout << "FAIL: Expected 1000000 values but loaded " << loaded.size() << endl;
+        return 1;
+    }
+    for (int i = 999999; i >= 0; i--) {
+        int value = loaded.pop();
+        if (value != i * 7 - 3000000) {
+            cout << "FAIL: Expected " << i * 7 - 3000000 << " but got " << value << endl;
+            return 1;
+        }
+    }
+    
+    // Test that an empty stack round-trips and that loading keeps the growth policy
+    Stack empty;
+    empty.save(directory + "/empty.snap");
+    GrowthPolicy policy;
+    policy.minCapacity = 64;
+    Stack loadedEmpty = Stack::load(directory + "/empty.snap", policy);
+    if (!loadedEmpty.isEmpty() || loadedEmpty.growthPolicy().minCapacity != 64) {
+        cout << "FAIL: Empty snapshot should load as an empty stack with the given policy" << endl;
+        return 1;
+    }
+    
+    // Test that saving replaces an existing snapshot and leaves no staging file behind
+    empty.save(directory + "/large.snap");
+    if (!Stack::load(directory + "/large.snap").isEmpty() || ifstream(directory + "/large.snap.tmp")) {
+        cout << "FAIL: Saving should replace the old snapshot through a temporary file" << endl;
+        return 1;
+    }
+    try {
+        empty.save(directory + "/missing/stack.snap");
+        cout << "FAIL: Saving into a missing directory should throw" << endl;
+        return 1;
+    } catch (const runtime_error&) {
+    }
+    
+    // Test that damaged or foreign files are refused
+    {
+        ofstream out(directory + "/bad.snap", ios::binary);
+        out << "not a snapshot at all, but long enough";
+    }
+    try {
+        Stack::load(directory + "/bad.snap");
+        cout << "FAIL: Loading a file that is not a snapshot should throw" << endl;
+        return 1;
+    } catch (const runtime_error&) {
+    }
+    try {
+        Stack::load(directory + "/missing.snap");
+        cout << "FAIL: Loading a missing file should throw" << endl;
+        return 1;
+    } catch (const runtime_error&) {
+    }
+    
+    cout << "PASS: Stack snapshots work correctly" << endl;
+    return 0;
+}
+""")
+
+def test_stack_snapshot(tmp_path):
+    """Test saving a Stack to a binary snapshot and loading it back."""
+    # Run the test
+    output = run_test_main(STACK_CPP_PATH, STACK_SNAPSHOT_MAIN, "temp_stack_snapshot", input_data=f"{tmp_path}\n")
+    
+    # Check the output
+    assert "PASS: Stack snapshots work correctly" in output, f"Test failed with output: {output}"
+    assert not list(tmp_path.glob("*.tmp")), "save should not leave staging files behind"
@@ -0,0 +1,94 @@
+"""
+Tests for the chunked stack implementation.
+"""
+import os
+
+from harness import register_test_main, repo_path, run_test_main
+
+# Path to the chunked_stack.cpp file
+CHUNKED_STACK_PATH = repo_path("implementations/chunked_stack.cpp")
+
+def test_chunked_stack_exists():
+    """Test that the chunked_stack.cpp file exists."""
+    assert os.path.exists(CHUNKED_STACK_PATH), f"File {CHUNKED_STACK_PATH} does not exist"
+
+CHUNKED_STACK_MAIN = register_test_main(CHUNKED_STACK_PATH, """
+#include <vector>
+
+int main() {
+    ChunkedStack stack;
+    
+    // Test pushes and pops across several chunk boundaries
+    for (int i = 0; i < 10000; i++) {
+        stack.push(i);
+    }
+    if (stack.size() != 10000 || stack.peek() != 9999) {
+        cout << "FAIL: Expected size 10000 with 9999 on top" << endl;
+        return 1;
+    }
+    for (int i = 9999; i >= 0; i--) {
+        int value = stack.pop();
+        if (value != i) {
+            cout << "FAIL: Expected " << i << " but popped " << value << endl;
+            return 1;
+        }
+    }
+    if (!stack.isEmpty()) {
+        cout << "FAIL: Stack should be empty after popping everything" << endl;
+        return 1;
+    }
+    
+    // Test bouncing around a chunk boundary
+    for (int i = 0; i < 4096; i++) {
+        stack.push(i);
+    }
+    for (int round = 0; round < 100; round++) {
+        stack.push(-round);
+        stack.push(round);
+        if (stack.pop() != round || stack.pop() != -round || stack.peek() != 4095) {
+            cout << "FAIL: Wrong values around a chunk boundary" << endl;
+            return 1;
+        }
+    }
+    
+    // Test bulk operations spanning chunks
+    vector<int> values(9000);
+    for (int i = 0; i < 9000; i++) {
+        values[i] = i;
+    }
+    stack.pushRange(values.data(), values.size());
+    if (stack.size() != 4096 + 9000 || stack.peek() != 8999) {
+        cout << "FAIL: pushRange left the wrong size or top" << endl;
+        return 1;
+    }
+    vector<int> out(20000);
+    size_t popped = stack.popN(out.data(), out.size());
+    if (popped != 4096 + 9000 || out[0] != 8999 || out[8999] != 0 || out[9000] != 4095 || out[popped - 1] != 0) {
+        cout << "FAIL: popN returned the wrong values" << endl;
+        return 1;
+    }
+    if (!stack.isEmpty()) {
+        cout << "FAIL: Stack should be empty after popN" << endl;
+        return 1;
+    }
+    
+    // Test that peeking and popping an empty stack throws
+    try {
+        stack.pop();
+        cout << "FAIL: pop on an empty stack should throw" << endl;
+        return 1;
+    } catch (const out_of_range&) {
+    }
+    
+    cout << "PASS: ChunkedStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_chunked_stack():
+    """Test pushes, pops and bulk operations across chunk boundaries."""
+    # Run the test
+    output = run_test_main(CHUNKED_STACK_PATH, CHUNKED_STACK_MAIN, "temp_chunked_stack")
+    
+    # Check the output
+    assert "PASS: ChunkedStack works correctly" in output, f"Test failed with output: {output}"
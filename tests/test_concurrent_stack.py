@@ -0,0 +1,291 @@
+"""
+Tests for the thread-safe stack implementations.
+"""
+import os
+
+from harness import register_target_flags, register_test_main, repo_path, run_test_main
+
+# Path to the concurrent_stack.cpp file
+CONCURRENT_STACK_PATH = repo_path("implementations/concurrent_stack.cpp")
+
+# The tests start threads
+register_target_flags(CONCURRENT_STACK_PATH, ["-pthread"])
+
+def test_concurrent_stack_exists():
+    """Test that the concurrent_stack.cpp file exists."""
+    assert os.path.exists(CONCURRENT_STACK_PATH), f"File {CONCURRENT_STACK_PATH} does not exist"
+
+LOCK_FREE_STACK_MAIN = register_test_main(CONCURRENT_STACK_PATH, """
+#include <thread>
+
+int main() {
+    LockFreeStack stack;
+    
+    // Test the single-threaded interface
+    if (!stack.isEmpty() || stack.size() != 0) {
+        cout << "FAIL: New stack should be empty" << endl;
+        return 1;
+    }
+    for (int i = 0; i < 5000; i++) {
+        stack.push(i);
+    }
+    if (stack.size() != 5000 || stack.peek() != 4999) {
+        cout << "FAIL: Expected size 5000 with 4999 on top" << endl;
+        return 1;
+    }
+    for (int i = 4999; i >= 0; i--) {
+        int value = stack.pop();
+        if (value != i) {
+            cout << "FAIL: Expected " << i << " but got " << value << endl;
+            return 1;
+        }
+    }
+    int value;
+    if (stack.tryPop(value) || !stack.isEmpty()) {
+        cout << "FAIL: tryPop on an empty stack should return false" << endl;
+        return 1;
+    }
+    try {
+        stack.peek();
+        cout << "FAIL: peek on an empty stack should throw" << endl;
+        return 1;
+    } catch (const out_of_range&) {
+    }
+    
+    // Test that concurrent producers and consumers lose and duplicate nothing
+    const int THREADS = 4;
+    const int PER_THREAD = 20000;
+    vector<vector<int>> popped(THREADS);
+    vector<thread> threads;
+    for (int t = 0; t < THREADS; t++) {
+        threads.emplace_back([&, t]() {
+            for (int i = 0; i < PER_THREAD; i++) {
+                stack.push(t * PER_THREAD + i);
+                int value;
+                if (i % 2 && stack.tryPop(value)) {
+                    popped[t].push_back(value);
+                }
+            }
+            int value;
+            while (stack.tryPop(value)) {
+                popped[t].push_back(value);
+            }
+        });
+    }
+    for (auto& worker : threads) {
+        worker.join();
+    }
+    vector<int> seen(THREADS * PER_THREAD, 0);
+    for (auto& values : popped) {
+        for (int value : values) {
+            seen[value]++;
+        }
+    }
+    for (int i = 0; i < THREADS * PER_THREAD; i++) {
+        if (seen[i] != 1) {
+            cout << "FAIL: Value " << i << " was popped " << seen[i] << " times" << endl;
+            return 1;
+        }
+    }
+    if (!stack.isEmpty() || stack.size() != 0) {
+        cout << "FAIL: Stack should be empty after every value was popped" << endl;
+        return 1;
+    }
+    
+    cout << "PASS: LockFreeStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_lock_free_stack():
+    """Test the lock-free stack alone and with concurrent producers and consumers."""
+    # Run the test
+    output = run_test_main(CONCURRENT_STACK_PATH, LOCK_FREE_STACK_MAIN, "temp_lock_free_stack")
+    
+    # Check the output
+    assert "PASS: LockFreeStack works correctly" in output, f"Test failed with output: {output}"
+
+ELIMINATION_STACK_MAIN = register_test_main(CONCURRENT_STACK_PATH, """
+#include <thread>
+
+int main() {
+    EliminationStack stack;
+    
+    // Test the single-threaded interface
+    for (int i = 0; i < 5000; i++) {
+        stack.push(i);
+    }
+    if (stack.size() != 5000 || stack.peek() != 4999) {
+        cout << "FAIL: Expected size 5000 with 4999 on top" << endl;
+        return 1;
+    }
+    for (int i = 4999; i >= 0; i--) {
+        int value = stack.pop();
+        if (value != i) {
+            cout << "FAIL: Expected " << i << " but got " << value << endl;
+            return 1;
+        }
+    }
+    int value;
+    if (stack.tryPop(value) || !stack.isEmpty()) {
+        cout << "FAIL: tryPop on an empty stack should return false" << endl;
+        return 1;
+    }
+    
+    // Test that values handed over between threads are neither lost nor duplicated
+    const int THREADS = 8;
+    const int PER_THREAD = 20000;
+    vector<vector<int>> popped(THREADS);
+    vector<thread> threads;
+    for (int t = 0; t < THREADS; t++) {
+        threads.emplace_back([&, t]() {
+            for (int i = 0; i < PER_THREAD; i++) {
+                stack.push(t * PER_THREAD + i);
+                int value;
+                if (stack.tryPop(value)) {
+                    popped[t].push_back(value);
+                }
+            }
+        });
+    }
+    for (auto& worker : threads) {
+        worker.join();
+    }
+    while (stack.tryPop(value)) {
+        popped[0].push_back(value);
+    }
+    vector<int> seen(THREADS * PER_THREAD, 0);
+    for (auto& values : popped) {
+        for (int value : values) {
+            seen[value]++;
+        }
+    }
+    for (int i = 0; i < THREADS * PER_THREAD; i++) {
+        if (seen[i] != 1) {
+            cout << "FAIL: Value " << i << " was popped " << seen[i] << " times" << endl;
+            return 1;
+        }
+    }
+    if (stack.size() != 0) {
+        cout << "FAIL: Stack should be empty after every value was popped" << endl;
+        return 1;
+    }
+    
+    cout << "PASS: EliminationStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_elimination_stack():
+    """Test the elimination-backoff stack alone and with concurrent pushes and pops."""
+    # Run the test
+    output = run_test_main(CONCURRENT_STACK_PATH, ELIMINATION_STACK_MAIN, "temp_elimination_stack")
+    
+    # Check the output
+    assert "PASS: EliminationStack works correctly" in output, f"Test failed with output: {output}"
+
+SHARDED_STACK_MAIN = register_test_main(CONCURRENT_STACK_PATH, """
+#include <thread>
+
+int main() {
+    ShardedStack stack(4);
+    ShardedStack::Worker first = stack.registerWorker();
+    ShardedStack::Worker second = stack.registerWorker();
+    
+    // Test per-worker LIFO order, including growing a shard past its first ring
+    for (int i = 0; i < 5000; i++) {
+        first.push(i);
+    }
+    if (stack.size() != 5000) {
+        cout << "FAIL: Expected size 5000 but got " << stack.size() << endl;
+        return 1;
+    }
+    for (int i = 4999; i >= 2500; i--) {
+        int value = first.pop();
+        if (value != i) {
+            cout << "FAIL: Expected " << i << " but got " << value << endl;
+            return 1;
+        }
+    }
+    
+    // Test that a worker with an empty shard steals the oldest values of another
+    for (int i = 0; i < 2500; i++) {
+        int value = second.pop();
+        if (value != i) {
+            cout << "FAIL: Expected to steal " << i << " but got " << value << endl;
+            return 1;
+        }
+    }
+    int value;
+    if (second.tryPop(value) || !stack.isEmpty()) {
+        cout << "FAIL: Every shard should be empty" << endl;
+        return 1;
+    }
+    
+    // Test that values are neither lost nor duplicated while thieves steal
+    const int PER_THREAD = 20000;
+    const int THREADS = 2;
+    vector<vector<int>> popped(THREADS + 1);
+    atomic<bool> done{false};
+    vector<thread> threads;
+    for (int t = 0; t < THREADS; t++) {
+        threads.emplace_back([&, t]() {
+            ShardedStack::Worker worker = stack.registerWorker();
+            for (int i = 0; i < PER_THREAD; i++) {
+                worker.push(t * PER_THREAD + i);
+                int value;
+                if (i % 3 == 0 && worker.tryPop(value)) {
+                    popped[t].push_back(value);
+                }
+            }
+            int value;
+            while (!done.load() || !stack.isEmpty()) {
+                if (worker.tryPop(value)) {
+                    popped[t].push_back(value);
+                }
+            }
+        });
+    }
+    for (int i = 0; i < PER_THREAD; i++) {
+        int value;
+        if (first.tryPop(value)) {
+            popped[THREADS].push_back(value);
+        }
+    }
+    done.store(true);
+    for (auto& worker : threads) {
+        worker.join();
+    }
+    vector<int> seen(THREADS * PER_THREAD, 0);
+    for (auto& values : popped) {
+        for (int value : values) {
+            seen[value]++;
+        }
+    }
+    for (int i = 0; i < THREADS * PER_THREAD; i++) {
+        if (seen[i] != 1) {
+            cout << "FAIL: Value " << i << " was popped " << seen[i] << " times" << endl;
+            return 1;
+        }
+    }
+    
+    // Test that registering more workers than shards throws
+    try {
+        stack.registerWorker();
+        cout << "FAIL: Registering a fifth worker should throw" << endl;
+        return 1;
+    } catch (const length_error&) {
+    }
+    
+    cout << "PASS: ShardedStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_sharded_stack():
+    """Test the work-stealing sharded stack with its own and stolen values."""
+    # Run the test
+    output = run_test_main(CONCURRENT_STACK_PATH, SHARDED_STACK_MAIN, "temp_sharded_stack")
+    
+    # Check the output
+    assert "PASS: ShardedStack works correctly" in output, f"Test failed with output: {output}"
@@ -0,0 +1,179 @@
+"""
+Tests for the shared C++ test harness.
+"""
+import os
+import signal
+import pytest
+
+import compile_cache
+import harness
+from harness import (
+    batch_function_name,
+    build_batch_source,
+    classify_failure,
+    find_main,
+    get_build_dir,
+    repo_path,
+    run_binary,
+    run_test_main,
+    splice_main,
+)
+
+# Path to the stack.cpp file
+STACK_CPP_PATH = repo_path("stack.cpp")
+
+def test_splice_main_replaces_main():
+    """Test that splice_main keeps the code before main() and swaps main() itself."""
+    source = "int helper() { return 1; }\nint main()\n{\n    return helper();\n}\n"
+    spliced = splice_main(source, "int main() { return 0; }\n")
+    assert spliced == "int helper() { return 1; }\nint main() { return 0; }\n"
+
+def test_splice_main_accepts_spaced_signature():
+    """Test that 'int main ()' is recognised as well as 'int main()'."""
+    assert find_main("int x;\nint main ()\n{}\n") == len("int x;\n")
+
+def test_splice_main_without_main():
+    """Test that splice_main reports sources without a main()."""
+    assert splice_main("int helper() { return 1; }\n", "int main() {}\n") is None
+
+def test_run_test_main_skips_missing_file():
+    """Test that a missing task file skips the test instead of failing it."""
+    with pytest.raises(pytest.skip.Exception):
+        run_test_main(repo_path("does/not/exist.cpp"), "int main() {}\n", "temp_missing")
+
+def test_compile_cache_reuses_binary(tmp_path, monkeypatch):
+    """Test that an unchanged source is compiled once and then served from the cache."""
+    monkeypatch.setattr(compile_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(compile_cache, "CACHE_ENABLED", True)
+    source = tmp_path / "cached.cpp"
+    source.write_text("int main() { return 0; }\n")
+
+    first = compile_cache.compile_cpp(str(source), str(tmp_path / "first"))
+    assert first.returncode == 0, first.stderr
+
+    # A cache hit must not invoke the compiler again
+    def fail(*args, **kwargs):
+        raise AssertionError("compiler invoked on a cache hit")
+    monkeypatch.setattr(compile_cache.subprocess, "run", fail)
+    second = compile_cache.compile_cpp(str(source), str(tmp_path / "second"))
+    assert second.returncode == 0
+    assert os.path.exists(tmp_path / "second")
+
+def test_compile_cache_recompiles_evicted_entry(tmp_path, monkeypatch):
+    """Test that an entry evicted between the lookup and the copy counts as a miss."""
+    monkeypatch.setattr(compile_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(compile_cache, "CACHE_ENABLED", True)
+    source = tmp_path / "evicted.cpp"
+    source.write_text("int main() { return 0; }\n")
+    assert compile_cache.compile_cpp(str(source), str(tmp_path / "first")).returncode == 0
+
+    # Simulate a concurrent evict() removing the entry right after the lookup
+    place = compile_cache._place
+    def evicted(cached, output_path):
+        monkeypatch.setattr(compile_cache, "_place", place)
+        os.remove(cached)
+        raise FileNotFoundError(cached)
+    monkeypatch.setattr(compile_cache, "_place", evicted)
+    second = compile_cache.compile_cpp(str(source), str(tmp_path / "second"))
+    assert second.returncode == 0, second.stderr
+    assert os.path.exists(tmp_path / "second")
+
+def test_compile_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    """Test that eviction removes the oldest entries first."""
+    monkeypatch.setattr(compile_cache, "CACHE_DIR", str(tmp_path))
+    old = tmp_path / "aa" / "old"
+    new = tmp_path / "bb" / "new"
+    for i, path in enumerate((old, new)):
+        path.parent.mkdir()
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (i, i))
+
+    compile_cache.evict(max_bytes=150)
+    assert not old.exists()
+    assert new.exists()
+
+def test_batch_source_dispatches_by_name(tmp_path):
+    """Test that a batched program runs each test main selected on the command line."""
+    source = "#include <iostream>\nusing namespace std;\nint main()\n{\n    return 0;\n}\n"
+    mains = [
+        "\nint main()\n{\n    cout << \"first\" << endl;\n    return 0;\n}\n",
+        "\nint main()\n{\n    cout << \"second\" << endl;\n    return 0;\n}\n",
+    ]
+    batch_file = tmp_path / "batch.cpp"
+    batch_file.write_text(build_batch_source(source, mains))
+
+    binary = str(tmp_path / "batch")
+    assert compile_cache.compile_cpp(str(batch_file), binary).returncode == 0
+    assert run_binary(binary, [batch_function_name(0)]) == "first\n"
+    assert run_binary(binary, [batch_function_name(1)]) == "second\n"
+    assert run_binary(binary, ["unknown"]).startswith("Runtime error")
+
+def test_leading_includes_stops_at_code():
+    """Test that only the standard headers before the first line of code are precompiled."""
+    source = ("#include <vector>\n// comment\n\n#include <string> // trailing\n#include \"local.h\"\n"
+              "#include <map>\nint main() {}\n")
+    assert compile_cache.leading_includes(source) == ("vector", "string")
+    assert compile_cache.leading_includes("#if X\n#include <vector>\n#endif\n") == ()
+
+def test_precompiled_header_is_injected(tmp_path, monkeypatch):
+    """Test that programs compile against the precompiled header of their own includes."""
+    monkeypatch.setattr(compile_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(compile_cache, "PCH_ENABLED", True)
+    source = tmp_path / "pch.cpp"
+    source.write_text("#include <vector>\nint main() { std::vector<int> v(3); return v.size() - 3; }\n")
+    flags = compile_cache.precompiled_header_flags(["-DPCH_TEST"], compile_cache.leading_includes(source.read_text()))
+    assert flags[0] == "-include"
+    assert os.path.exists(flags[1] + ".gch")
+
+    result = compile_cache.compile_cpp(str(source), str(tmp_path / "pch"), ["-DPCH_TEST", *flags])
+    assert result.returncode == 0, result.stderr
+
+def test_failed_precompiled_header_leaves_no_files(tmp_path, monkeypatch):
+    """Test that a header that does not compile is skipped and its staging files removed."""
+    monkeypatch.setattr(compile_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(compile_cache, "PCH_ENABLED", True)
+    assert compile_cache.precompiled_header_flags([], ("no_such_header_for_pch",)) == []
+    leftovers = [name for _, _, files in os.walk(tmp_path) for name in files if name.endswith(".tmp")]
+    assert leftovers == []
+
+def test_run_test_main_builds_outside_the_source_tree():
+    """Test that unregistered test mains compile in the private build directory."""
+    test_main = "\nint main()\n{\n    cout << \"PASS: built privately\" << endl;\n    return 0;\n}\n"
+    output = run_test_main(STACK_CPP_PATH, test_main, "temp_private_build")
+    assert "PASS: built privately" in output, f"Test failed with output: {output}"
+    assert not os.path.exists(os.path.join(os.path.dirname(__file__), "temp_private_build.cpp"))
+    assert not any(name.startswith("temp_private_build") for name in os.listdir(get_build_dir()))
+
+def test_run_test_main_times_out_runaway_programs():
+    """Test that an infinite loop is killed by the wall-clock timeout."""
+    test_main = "\nint main()\n{\n    volatile bool forever = true;\n    while (forever) {}\n    return 0;\n}\n"
+    output = run_test_main(STACK_CPP_PATH, test_main, "temp_timeout", timeout=0.5, cpu_time=0)
+    assert output.startswith("Runtime error: timed out"), output
+
+@pytest.mark.skipif(harness.resource is None, reason="rlimits need the resource module")
+def test_run_test_main_limits_cpu_time():
+    """Test that a busy program is stopped by the CPU-time limit."""
+    test_main = "\nint main()\n{\n    volatile bool forever = true;\n    while (forever) {}\n    return 0;\n}\n"
+    output = run_test_main(STACK_CPP_PATH, test_main, "temp_cpu_limit", timeout=30, cpu_time=1)
+    assert output.startswith("Runtime error: CPU time limit"), output
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="SIGKILL is POSIX only")
+def test_classify_failure_blames_sigkill_on_cpu_limit_only_when_reached():
+    """Test that a SIGKILL before the CPU-time limit was used up is not reported as that limit."""
+    assert classify_failure(-signal.SIGKILL, "", cpu_time=5, cpu_used=6.1).startswith("Runtime error: CPU time limit")
+    assert classify_failure(-signal.SIGKILL, "", cpu_time=5, cpu_used=0.2).startswith("Runtime error: killed by SIGKILL")
+    assert classify_failure(-signal.SIGKILL, "", cpu_time=5).startswith("Runtime error: killed by SIGKILL")
+
+@pytest.mark.skipif(harness.resource is None, reason="rlimits need the resource module")
+def test_run_test_main_limits_memory():
+    """Test that allocating past the address-space cap is reported as out of memory."""
+    test_main = "\nint main()\n{\n    Stack stack;\n    for (;;) stack.push(1);\n    return 0;\n}\n"
+    output = run_test_main(STACK_CPP_PATH, test_main, "temp_memory_limit", memory_mb=256)
+    assert output.startswith("Runtime error: out of memory"), output
+
+def test_run_binary_without_resource_module(monkeypatch):
+    """Test that programs still run, with only the timeout, where rlimits are unavailable."""
+    monkeypatch.setattr(harness, "resource", None)
+    test_main = "\nint main()\n{\n    cout << \"PASS: ran without rlimits\" << endl;\n    return 0;\n}\n"
+    output = run_test_main(STACK_CPP_PATH, test_main, "temp_no_rlimits", cpu_time=1, memory_mb=256)
+    assert "PASS: ran without rlimits" in output, f"Test failed with output: {output}"
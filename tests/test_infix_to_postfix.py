@@ -1,82 +1,18 @@
 """
 Tests for the infix to postfix converter application (Task 3).
 """
-import subprocess
 import os
-import sys
-import pytest
 
-# Helper function to compile and run a C++ file
-def run_cpp_file(file_path, input_data=None):
-    # Get the directory containing the file
-    file_dir = os.path.dirname(file_path)
-    # Get the file name without extension
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
-    # Compile the file
-    compile_result = subprocess.run(
-        ["g++", "-o", os.path.join(file_dir, file_name), file_path],
-        capture_output=True,
-        text=True
-    )
-    if compile_result.returncode != 0:
-        return f"Compilation error: {compile_result.stderr}"
-    
-    # Run the compiled file
-    if input_data:
-        run_result = subprocess.run(
-            [os.path.join(file_dir, file_name)],
-            input=input_data,
-            capture_output=True,
-            text=True
-        )
-    else:
-        run_result = subprocess.run(
-            [os.path.join(file_dir, file_name)],
-            capture_output=True,
-            text=True
-        )
-    
-    # Clean up the compiled file
-    try:
-        os.remove(os.path.join(file_dir, file_name))
-    except:
-        pass
-    
-    if run_result.returncode != 0:
-        return f"Runtime error: {run_result.stderr}"
-    
-    return run_result.stdout
+from harness import register_test_main, repo_path, run_test_main
 
 # Path to the infix_to_postfix.cpp file
-INFIX_TO_POSTFIX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "applications/infix_to_postfix.cpp")
+INFIX_TO_POSTFIX_PATH = repo_path("applications/infix_to_postfix.cpp")
 
 def test_infix_to_postfix_exists():
     """Test that the infix_to_postfix.cpp file exists."""
     assert os.path.exists(INFIX_TO_POSTFIX_PATH), f"File {INFIX_TO_POSTFIX_PATH} does not exist"
 
-def test_infix_to_postfix_basic():
-    """Test that the infix to postfix converter correctly converts basic expressions."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(INFIX_TO_POSTFIX_PATH):
-        pytest.skip(f"File {INFIX_TO_POSTFIX_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_infix_to_postfix.cpp")
-    
-    with open(INFIX_TO_POSTFIX_PATH, 'r') as f:
-        converter_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = converter_code.find("int main()")
-    if main_start == -1:
-        main_start = converter_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in infix_to_postfix.cpp")
-    
-    main_end = converter_code.rfind("}")
-    
-    test_main = """
+INFIX_TO_POSTFIX_BASIC_MAIN = register_test_main(INFIX_TO_POSTFIX_PATH, """
 int main()
 {
     // Test basic infix to postfix conversions
@@ -111,51 +47,20 @@ int main()
     cout << "PASS: All basic test cases passed" << endl;
     return 0;
 }
-"""
-    
+""")
+
+def test_infix_to_postfix_basic():
+    """Test that the infix to postfix converter correctly converts basic expressions."""
     # Assuming there's a function called infixToPostfix
     # If the function has a different name, the test will fail
     
-    modified_code = converter_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(INFIX_TO_POSTFIX_PATH, INFIX_TO_POSTFIX_BASIC_MAIN, "temp_infix_to_postfix")
     
     # Check the output
     assert "PASS: All basic test cases passed" in output, f"Test failed with output: {output}"
 
-def test_infix_to_postfix_complex():
-    """Test that the infix to postfix converter correctly converts complex expressions."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(INFIX_TO_POSTFIX_PATH):
-        pytest.skip(f"File {INFIX_TO_POSTFIX_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_infix_to_postfix_complex.cpp")
-    
-    with open(INFIX_TO_POSTFIX_PATH, 'r') as f:
-        converter_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = converter_code.find("int main()")
-    if main_start == -1:
-        main_start = converter_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in infix_to_postfix.cpp")
-    
-    main_end = converter_code.rfind("}")
-    
-    test_main = """
+INFIX_TO_POSTFIX_COMPLEX_MAIN = register_test_main(INFIX_TO_POSTFIX_PATH, """
 int main()
 {
     // Test complex infix to postfix conversions
@@ -189,48 +94,17 @@ int main()
     cout << "PASS: All complex test cases passed" << endl;
     return 0;
 }
-"""
-    
-    modified_code = converter_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_infix_to_postfix_complex():
+    """Test that the infix to postfix converter correctly converts complex expressions."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(INFIX_TO_POSTFIX_PATH, INFIX_TO_POSTFIX_COMPLEX_MAIN, "temp_infix_to_postfix_complex")
     
     # Check the output
     assert "PASS: All complex test cases passed" in output, f"Test failed with output: {output}"
 
-def test_infix_to_postfix_edge_cases():
-    """Test that the infix to postfix converter handles edge cases correctly."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(INFIX_TO_POSTFIX_PATH):
-        pytest.skip(f"File {INFIX_TO_POSTFIX_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_infix_to_postfix_edge.cpp")
-    
-    with open(INFIX_TO_POSTFIX_PATH, 'r') as f:
-        converter_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = converter_code.find("int main()")
-    if main_start == -1:
-        main_start = converter_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in infix_to_postfix.cpp")
-    
-    main_end = converter_code.rfind("}")
-    
-    test_main = """
+INFIX_TO_POSTFIX_EDGE_CASES_MAIN = register_test_main(INFIX_TO_POSTFIX_PATH, """
 int main()
 {
     // Test edge cases for infix to postfix conversion
@@ -261,48 +135,17 @@ int main()
     cout << "PASS: All edge cases passed" << endl;
     return 0;
 }
-"""
-    
-    modified_code = converter_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_infix_to_postfix_edge_cases():
+    """Test that the infix to postfix converter handles edge cases correctly."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(INFIX_TO_POSTFIX_PATH, INFIX_TO_POSTFIX_EDGE_CASES_MAIN, "temp_infix_to_postfix_edge")
     
     # Check the output
     assert "PASS: All edge cases passed" in output, f"Test failed with output: {output}"
 
-def test_infix_to_postfix_error_handling():
-    """Test that the infix to postfix converter handles errors correctly."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(INFIX_TO_POSTFIX_PATH):
-        pytest.skip(f"File {INFIX_TO_POSTFIX_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_infix_to_postfix_error.cpp")
-    
-    with open(INFIX_TO_POSTFIX_PATH, 'r') as f:
-        converter_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = converter_code.find("int main()")
-    if main_start == -1:
-        main_start = converter_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in infix_to_postfix.cpp")
-    
-    main_end = converter_code.rfind("}")
-    
-    test_main = """
+INFIX_TO_POSTFIX_ERROR_HANDLING_MAIN = register_test_main(INFIX_TO_POSTFIX_PATH, """
 int main()
 {
     // Test error handling for infix to postfix conversion
@@ -343,15 +186,12 @@ int main()
         return 1;
     }
 }
-"""
-    
-    modified_code = converter_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_infix_to_postfix_error_handling():
+    """Test that the infix to postfix converter handles errors correctly."""
     # Run the test
-    output = run_cpp_file(temp_file)
+    output = run_test_main(INFIX_TO_POSTFIX_PATH, INFIX_TO_POSTFIX_ERROR_HANDLING_MAIN, "temp_infix_to_postfix_error")
     
     # We don't assert here because the implementation might handle errors differently
     # Just check if the test ran without crashing
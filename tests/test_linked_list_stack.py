@@ -1,74 +1,18 @@
 """
 Tests for the linked list-based stack implementation (Task 2).
 """
-import subprocess
 import os
-import sys
-import pytest
 
-# Helper function to compile and run a C++ file
-def run_cpp_file(file_path):
-    # Get the directory containing the file
-    file_dir = os.path.dirname(file_path)
-    # Get the file name without extension
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
-    # Compile the file
-    compile_result = subprocess.run(
-        ["g++", "-o", os.path.join(file_dir, file_name), file_path],
-        capture_output=True,
-        text=True
-    )
-    if compile_result.returncode != 0:
-        return f"Compilation error: {compile_result.stderr}"
-    
-    # Run the compiled file
-    run_result = subprocess.run(
-        [os.path.join(file_dir, file_name)],
-        capture_output=True,
-        text=True
-    )
-    
-    # Clean up the compiled file
-    try:
-        os.remove(os.path.join(file_dir, file_name))
-    except:
-        pass
-    
-    if run_result.returncode != 0:
-        return f"Runtime error: {run_result.stderr}"
-    
-    return run_result.stdout
+from harness import register_test_main, repo_path, run_test_main
 
 # Path to the linked_list_stack.cpp file
-LINKED_LIST_STACK_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "implementations/linked_list_stack.cpp")
+LINKED_LIST_STACK_PATH = repo_path("implementations/linked_list_stack.cpp")
 
 def test_linked_list_stack_exists():
     """Test that the linked_list_stack.cpp file exists."""
     assert os.path.exists(LINKED_LIST_STACK_PATH), f"File {LINKED_LIST_STACK_PATH} does not exist"
 
-def test_linked_list_stack_basic_operations():
-    """Test that the basic stack operations work correctly for the linked list-based implementation."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(LINKED_LIST_STACK_PATH):
-        pytest.skip(f"File {LINKED_LIST_STACK_PATH} does not exist")
-    
-    # Create a temporary file with a modified main function to test basic operations
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_linked_list_stack_basic.cpp")
-    
-    with open(LINKED_LIST_STACK_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = stack_code.find("int main()")
-    if main_start == -1:
-        main_start = stack_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in linked_list_stack.cpp")
-    
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+LINKED_LIST_STACK_BASIC_OPERATIONS_MAIN = register_test_main(LINKED_LIST_STACK_PATH, """
 int main()
 {
     // Assuming the stack class is named LinkedListStack
@@ -141,48 +85,17 @@ int main()
     cout << "PASS: All basic stack operations work correctly" << endl;
     return 0;
 }
-"""
-    
-    modified_code = stack_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_linked_list_stack_basic_operations():
+    """Test that the basic stack operations work correctly for the linked list-based implementation."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(LINKED_LIST_STACK_PATH, LINKED_LIST_STACK_BASIC_OPERATIONS_MAIN, "temp_linked_list_stack_basic")
     
     # Check the output
     assert "PASS: All basic stack operations work correctly" in output, f"Test failed with output: {output}"
 
-def test_linked_list_stack_memory_management():
-    """Test that the linked list-based stack properly manages memory (no memory leaks)."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(LINKED_LIST_STACK_PATH):
-        pytest.skip(f"File {LINKED_LIST_STACK_PATH} does not exist")
-    
-    # Create a temporary file with a modified main function to test memory management
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_linked_list_stack_memory.cpp")
-    
-    with open(LINKED_LIST_STACK_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = stack_code.find("int main()")
-    if main_start == -1:
-        main_start = stack_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in linked_list_stack.cpp")
-    
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+LINKED_LIST_STACK_MEMORY_MANAGEMENT_MAIN = register_test_main(LINKED_LIST_STACK_PATH, """
 int main()
 {
     // Assuming the stack class is named LinkedListStack
@@ -224,48 +137,17 @@ int main()
     cout << "PASS: Memory management test completed" << endl;
     return 0;
 }
-"""
-    
-    modified_code = stack_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_linked_list_stack_memory_management():
+    """Test that the linked list-based stack properly manages memory (no memory leaks)."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(LINKED_LIST_STACK_PATH, LINKED_LIST_STACK_MEMORY_MANAGEMENT_MAIN, "temp_linked_list_stack_memory")
     
     # Check the output
     assert "PASS: Memory management test completed" in output, f"Test failed with output: {output}"
 
-def test_linked_list_stack_underflow():
-    """Test that the linked list-based stack handles underflow correctly."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(LINKED_LIST_STACK_PATH):
-        pytest.skip(f"File {LINKED_LIST_STACK_PATH} does not exist")
-    
-    # Create a temporary file with a modified main function to test underflow
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_linked_list_stack_underflow.cpp")
-    
-    with open(LINKED_LIST_STACK_PATH, 'r') as f:
-        stack_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = stack_code.find("int main()")
-    if main_start == -1:
-        main_start = stack_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in linked_list_stack.cpp")
-    
-    main_end = stack_code.rfind("}")
-    
-    test_main = """
+LINKED_LIST_STACK_UNDERFLOW_MAIN = register_test_main(LINKED_LIST_STACK_PATH, """
 int main()
 {
     // Assuming the stack class is named LinkedListStack
@@ -292,21 +174,78 @@ int main()
     cout << "PASS: Stack underflow test completed" << endl;
     return 0;
 }
-"""
+""")
+
+def test_linked_list_stack_underflow():
+    """Test that the linked list-based stack handles underflow correctly."""
+    # Run the test
+    output = run_test_main(LINKED_LIST_STACK_PATH, LINKED_LIST_STACK_UNDERFLOW_MAIN, "temp_linked_list_stack_underflow")
     
-    modified_code = stack_code[:main_start] + test_main
+    # Check the output
+    assert "PASS: Stack underflow test completed" in output, f"Test failed with output: {output}"
+
+LINKED_LIST_STACK_NODE_POOL_MAIN = register_test_main(LINKED_LIST_STACK_PATH, """
+int main()
+{
+    // Test that popped nodes are recycled instead of allocating new slabs
+    NodePool pool;
+    {
+        LinkedListStack stack(pool);
+        for (int round = 0; round < 100; round++) {
+            for (int i = 0; i < 1000; i++) {
+                stack.push(i);
+            }
+            for (int i = 999; i >= 0; i--) {
+                if (stack.pop() != i) {
+                    cout << "FAIL: Wrong value popped from a pooled stack" << endl;
+                    return 1;
+                }
+            }
+        }
+    }
+    size_t slabs = pool.slabCount();
+    if (slabs == 0 || slabs > 4) {
+        cout << "FAIL: Expected at most 4 slabs for 1000 live nodes but got " << slabs << endl;
+        return 1;
+    }
     
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
+    // Test stacks sharing a pool, including nodes given back by a destroyed stack
+    LinkedListStack first(pool);
+    {
+        LinkedListStack second(pool);
+        for (int i = 0; i < 500; i++) {
+            first.push(i);
+            second.push(-i);
+        }
+        if (first.peek() != 499 || second.peek() != -499) {
+            cout << "FAIL: Stacks sharing a pool see each other's values" << endl;
+            return 1;
+        }
+    }
+    for (int i = 0; i < 500; i++) {
+        first.push(i);
+    }
+    if (pool.slabCount() != slabs) {
+        cout << "FAIL: Nodes of a destroyed stack were not reused" << endl;
+        return 1;
+    }
+    for (int i = 499; i >= 0; i--) {
+        first.pop();
+    }
+    if (first.size() != 500 || first.peek() != 499) {
+        cout << "FAIL: Expected 500 values with 499 on top" << endl;
+        return 1;
+    }
     
+    cout << "PASS: Node pool works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_linked_list_stack_node_pool():
+    """Test that the linked list-based stack recycles nodes through a shared NodePool."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(LINKED_LIST_STACK_PATH, LINKED_LIST_STACK_NODE_POOL_MAIN, "temp_linked_list_stack_node_pool")
     
     # Check the output
-    assert "PASS: Stack underflow test completed" in output, f"Test failed with output: {output}"
+    assert "PASS: Node pool works correctly" in output, f"Test failed with output: {output}"
@@ -0,0 +1,115 @@
+"""
+Tests for the memory-mapped stack implementation.
+"""
+import os
+import pytest
+
+from harness import register_test_main, repo_path, run_test_main
+
+# Path to the mapped_stack.cpp file
+MAPPED_STACK_PATH = repo_path("implementations/mapped_stack.cpp")
+
+def test_mapped_stack_exists():
+    """Test that the mapped_stack.cpp file exists."""
+    assert os.path.exists(MAPPED_STACK_PATH), f"File {MAPPED_STACK_PATH} does not exist"
+
+MAPPED_STACK_MAIN = register_test_main(MAPPED_STACK_PATH, """
+int main() {
+    // The test passes the paths of two new stack files and of a file that is not one
+    string path, headerOnlyPath, bogusPath;
+    cin >> path >> headerOnlyPath >> bogusPath;
+    
+    // Test pushing past the initial capacity so the file has to grow
+    {
+        MappedStack stack(path);
+        if (!stack.isEmpty()) {
+            cout << "FAIL: A new file should give an empty stack" << endl;
+            return 1;
+        }
+        size_t initial = stack.capacity();
+        for (size_t i = 0; i < 3 * initial; i++) {
+            stack.push((int) i);
+        }
+        if (stack.size() != 3 * initial || stack.capacity() < 3 * initial || stack.peek() != (int) (3 * initial - 1)) {
+            cout << "FAIL: Stack did not grow with its pushes" << endl;
+            return 1;
+        }
+        for (size_t i = 0; i < initial; i++) {
+            stack.pop();
+        }
+        stack.sync();
+    }
+    
+    // Test reopening the file as the same stack
+    {
+        MappedStack stack(path);
+        size_t count = stack.size();
+        for (size_t i = count; i > 0; i--) {
+            int value = stack.pop();
+            if (value != (int) (i - 1)) {
+                cout << "FAIL: Expected " << i - 1 << " after reopening but got " << value << endl;
+                return 1;
+            }
+        }
+        stack.push(7);
+    }
+    {
+        MappedStack stack(path);
+        if (stack.size() != 1 || stack.pop() != 7) {
+            cout << "FAIL: Expected only 7 after reopening again" << endl;
+            return 1;
+        }
+        try {
+            stack.pop();
+            cout << "FAIL: pop on an empty stack should throw" << endl;
+            return 1;
+        } catch (const out_of_range&) {
+        }
+    }
+    
+    // Test that other files are refused
+    try {
+        MappedStack stack(bogusPath);
+        cout << "FAIL: Opening a file that is not a stack should throw" << endl;
+        return 1;
+    } catch (const runtime_error&) {
+    }
+    
+    // Test that a file cut down to its header grows again on the next push
+    {
+        MappedStack created(headerOnlyPath);
+    }
+    if (truncate(headerOnlyPath.c_str(), 64) != 0) {
+        cout << "FAIL: Could not truncate " << headerOnlyPath << endl;
+        return 1;
+    }
+    {
+        MappedStack stack(headerOnlyPath);
+        for (int i = 0; i < 10; i++) {
+            stack.push(i);
+        }
+        if (stack.size() != 10 || stack.peek() != 9 || stack.capacity() < 10) {
+            cout << "FAIL: A header-only file should grow to hold new values" << endl;
+            return 1;
+        }
+    }
+    
+    cout << "PASS: MappedStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_mapped_stack(tmp_path):
+    """Test the file-backed stack across growing and reopening its file."""
+    if os.name != "posix":
+        pytest.skip("MappedStack is only available on POSIX systems")
+    bogus_path = tmp_path / "bogus.bin"
+    bogus_path.write_bytes(b"not a stack, just some bytes" * 10)
+    
+    # Run the test
+    paths = [tmp_path / "stack.bin", tmp_path / "header_only.bin", bogus_path]
+    output = run_test_main(MAPPED_STACK_PATH, MAPPED_STACK_MAIN, "temp_mapped_stack",
+                           input_data="".join(f"{path}\n" for path in paths))
+    
+    # Check the output
+    assert "PASS: MappedStack works correctly" in output, f"Test failed with output: {output}"
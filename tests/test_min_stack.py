@@ -0,0 +1,149 @@
+"""
+Tests for the min stack problem (Task 4).
+"""
+import os
+
+from harness import register_test_main, repo_path, run_test_main
+
+# Path to the min_stack.cpp file
+MIN_STACK_PATH = repo_path("advanced/min_stack.cpp")
+
+def test_min_stack_exists():
+    """Test that the min_stack.cpp file exists."""
+    assert os.path.exists(MIN_STACK_PATH), f"File {MIN_STACK_PATH} does not exist"
+
+MIN_STACK_BASIC_MAIN = register_test_main(MIN_STACK_PATH, """
+int main()
+{
+    MinStack minStack;
+    minStack.push(-2);
+    minStack.push(0);
+    minStack.push(-3);
+    if (minStack.getMin() != -3) {
+        cout << "FAIL: getMin should return -3" << endl;
+        return 1;
+    }
+    minStack.pop();
+    if (minStack.top() != 0) {
+        cout << "FAIL: top should return 0" << endl;
+        return 1;
+    }
+    if (minStack.getMin() != -2) {
+        cout << "FAIL: getMin should return -2" << endl;
+        return 1;
+    }
+    
+    // Test repeated minimums
+    MinStack repeated;
+    repeated.push(1);
+    repeated.push(1);
+    repeated.push(2);
+    repeated.pop();
+    repeated.pop();
+    if (repeated.getMin() != 1) {
+        cout << "FAIL: A repeated minimum should survive popping one copy" << endl;
+        return 1;
+    }
+    
+    cout << "PASS: MinStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_min_stack_basic():
+    """Test the MinStack example from the task description."""
+    # Run the test
+    output = run_test_main(MIN_STACK_PATH, MIN_STACK_BASIC_MAIN, "temp_min_stack_basic")
+    
+    # Check the output
+    assert "PASS: MinStack works correctly" in output, f"Test failed with output: {output}"
+
+MIN_MAX_STACK_RANDOMIZED_MAIN = register_test_main(MIN_STACK_PATH, """
+int main()
+{
+    // Compare against recomputing the minimum and maximum of a plain vector
+    MinMaxStack stack;
+    MinStack minStack;
+    vector<int> model;
+    unsigned int seed = 12345;
+    for (int i = 0; i < 20000; i++) {
+        seed = seed * 1103515245 + 12345;
+        if (model.empty() || (seed >> 16) % 3 != 0) {
+            int value = (int) ((seed >> 8) % 200) - 100;
+            stack.push(value);
+            minStack.push(value);
+            model.push_back(value);
+        } else {
+            stack.pop();
+            minStack.pop();
+            model.pop_back();
+        }
+        if (model.empty()) {
+            continue;
+        }
+        int low = model[0], high = model[0];
+        for (int value : model) {
+            low = min(low, value);
+            high = max(high, value);
+        }
+        if (stack.getMin() != low || stack.getMax() != high || minStack.getMin() != low) {
+            cout << "FAIL: Expected min " << low << " and max " << high << " after " << i << " operations" << endl;
+            return 1;
+        }
+        if (stack.top() != model.back() || stack.size() != (int) model.size()) {
+            cout << "FAIL: Wrong top or size after " << i << " operations" << endl;
+            return 1;
+        }
+    }
+    
+    // Test that peeking or popping an empty stack throws
+    MinMaxStack empty;
+    try {
+        empty.getMax();
+        cout << "FAIL: getMax on an empty stack should throw" << endl;
+        return 1;
+    } catch (const out_of_range&) {
+    }
+    
+    cout << "PASS: MinMaxStack matches a recomputed minimum and maximum" << endl;
+    return 0;
+}
+""")
+
+def test_min_max_stack_randomized():
+    """Test MinStack and MinMaxStack against recomputing the minimum and maximum."""
+    # Run the test
+    output = run_test_main(MIN_STACK_PATH, MIN_MAX_STACK_RANDOMIZED_MAIN, "temp_min_max_stack_randomized")
+    
+    # Check the output
+    assert "PASS: MinMaxStack matches a recomputed minimum and maximum" in output, f"Test failed with output: {output}"
+
+MIN_STACK_MEMORY_MAIN = register_test_main(MIN_STACK_PATH, """
+int main()
+{
+    // Random values change the minimum only a few times, so the recorded
+    // minimums should take a small fraction of the values' memory
+    MinStack stack;
+    unsigned int seed = 42;
+    for (int i = 0; i < 1000000; i++) {
+        seed = seed * 1103515245 + 12345;
+        stack.push((int) seed);
+    }
+    size_t valuesBytes = 1000000 * sizeof(int);
+    if (stack.memoryBytes() > valuesBytes * 3 / 2) {
+        cout << "FAIL: MinStack used " << stack.memoryBytes() << " bytes for " << valuesBytes << " bytes of values" << endl;
+        return 1;
+    }
+    
+    cout << "PASS: MinStack only stores minimum transitions" << endl;
+    return 0;
+}
+""")
+
+def test_min_stack_memory():
+    """Test that MinStack does not store a minimum per element."""
+    # Run the test
+    output = run_test_main(MIN_STACK_PATH, MIN_STACK_MEMORY_MAIN, "temp_min_stack_memory")
+    
+    # Check the output
+    assert "PASS: MinStack only stores minimum transitions" in output, f"Test failed with output: {output}"
@@ -1,82 +1,18 @@
 """
 Tests for the next greater element problem (Task 4).
 """
-import subprocess
 import os
-import sys
-import pytest
 
-# Helper function to compile and run a C++ file
-def run_cpp_file(file_path, input_data=None):
-    # Get the directory containing the file
-    file_dir = os.path.dirname(file_path)
-    # Get the file name without extension
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
-    # Compile the file
-    compile_result = subprocess.run(
-        ["g++", "-o", os.path.join(file_dir, file_name), file_path],
-        capture_output=True,
-        text=True
-    )
-    if compile_result.returncode != 0:
-        return f"Compilation error: {compile_result.stderr}"
-    
-    # Run the compiled file
-    if input_data:
-        run_result = subprocess.run(
-            [os.path.join(file_dir, file_name)],
-            input=input_data,
-            capture_output=True,
-            text=True
-        )
-    else:
-        run_result = subprocess.run(
-            [os.path.join(file_dir, file_name)],
-            capture_output=True,
-            text=True
-        )
-    
-    # Clean up the compiled file
-    try:
-        os.remove(os.path.join(file_dir, file_name))
-    except:
-        pass
-    
-    if run_result.returncode != 0:
-        return f"Runtime error: {run_result.stderr}"
-    
-    return run_result.stdout
+from harness import register_test_main, repo_path, run_test_main
 
 # Path to the next_greater_element.cpp file
-NEXT_GREATER_ELEMENT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "advanced/next_greater_element.cpp")
+NEXT_GREATER_ELEMENT_PATH = repo_path("advanced/next_greater_element.cpp")
 
 def test_next_greater_element_exists():
     """Test that the next_greater_element.cpp file exists."""
     assert os.path.exists(NEXT_GREATER_ELEMENT_PATH), f"File {NEXT_GREATER_ELEMENT_PATH} does not exist"
 
-def test_next_greater_element_basic():
-    """Test that the next greater element function works correctly for basic cases."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(NEXT_GREATER_ELEMENT_PATH):
-        pytest.skip(f"File {NEXT_GREATER_ELEMENT_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_next_greater_element.cpp")
-    
-    with open(NEXT_GREATER_ELEMENT_PATH, 'r') as f:
-        nge_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = nge_code.find("int main()")
-    if main_start == -1:
-        main_start = nge_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in next_greater_element.cpp")
-    
-    main_end = nge_code.rfind("}")
-    
-    test_main = """
+NEXT_GREATER_ELEMENT_BASIC_MAIN = register_test_main(NEXT_GREATER_ELEMENT_PATH, """
 int main()
 {
     // Test basic next greater element cases
@@ -131,51 +67,20 @@ int main()
     cout << "PASS: All basic test cases passed" << endl;
     return 0;
 }
-"""
-    
+""")
+
+def test_next_greater_element_basic():
+    """Test that the next greater element function works correctly for basic cases."""
     # Assuming there's a function called nextGreaterElements
     # If the function has a different name, the test will fail
     
-    modified_code = nge_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(NEXT_GREATER_ELEMENT_PATH, NEXT_GREATER_ELEMENT_BASIC_MAIN, "temp_next_greater_element")
     
     # Check the output
     assert "PASS: All basic test cases passed" in output, f"Test failed with output: {output}"
 
-def test_next_greater_element_edge_cases():
-    """Test that the next greater element function handles edge cases correctly."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(NEXT_GREATER_ELEMENT_PATH):
-        pytest.skip(f"File {NEXT_GREATER_ELEMENT_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_next_greater_element_edge.cpp")
-    
-    with open(NEXT_GREATER_ELEMENT_PATH, 'r') as f:
-        nge_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = nge_code.find("int main()")
-    if main_start == -1:
-        main_start = nge_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in next_greater_element.cpp")
-    
-    main_end = nge_code.rfind("}")
-    
-    test_main = """
+NEXT_GREATER_ELEMENT_EDGE_CASES_MAIN = register_test_main(NEXT_GREATER_ELEMENT_PATH, """
 int main()
 {
     // Test edge cases for next greater element
@@ -233,48 +138,17 @@ int main()
     cout << "PASS: All edge cases passed" << endl;
     return 0;
 }
-"""
-    
-    modified_code = nge_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_next_greater_element_edge_cases():
+    """Test that the next greater element function handles edge cases correctly."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(NEXT_GREATER_ELEMENT_PATH, NEXT_GREATER_ELEMENT_EDGE_CASES_MAIN, "temp_next_greater_element_edge")
     
     # Check the output
     assert "PASS: All edge cases passed" in output, f"Test failed with output: {output}"
 
-def test_next_greater_element_performance():
-    """Test the performance of the next greater element function."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(NEXT_GREATER_ELEMENT_PATH):
-        pytest.skip(f"File {NEXT_GREATER_ELEMENT_PATH} does not exist")
-    
-    # Create a temporary file with a performance test
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_next_greater_element_perf.cpp")
-    
-    with open(NEXT_GREATER_ELEMENT_PATH, 'r') as f:
-        nge_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = nge_code.find("int main()")
-    if main_start == -1:
-        main_start = nge_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in next_greater_element.cpp")
-    
-    main_end = nge_code.rfind("}")
-    
-    test_main = """
+NEXT_GREATER_ELEMENT_PERFORMANCE_MAIN = register_test_main(NEXT_GREATER_ELEMENT_PATH, """
 int main()
 {
     // Test performance with a large array
@@ -308,21 +182,12 @@ int main()
     
     return 0;
 }
-"""
-    
-    modified_code = nge_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_next_greater_element_performance():
+    """Test the performance of the next greater element function."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(NEXT_GREATER_ELEMENT_PATH, NEXT_GREATER_ELEMENT_PERFORMANCE_MAIN, "temp_next_greater_element_perf")
     
     # Check the output
     assert "PASS: Performance test completed" in output, f"Test failed with output: {output}"
@@ -0,0 +1,92 @@
+"""
+Tests for the persistent stack implementation.
+"""
+import os
+
+from harness import register_test_main, repo_path, run_test_main
+
+# Path to the persistent_stack.cpp file
+PERSISTENT_STACK_PATH = repo_path("implementations/persistent_stack.cpp")
+
+def test_persistent_stack_exists():
+    """Test that the persistent_stack.cpp file exists."""
+    assert os.path.exists(PERSISTENT_STACK_PATH), f"File {PERSISTENT_STACK_PATH} does not exist"
+
+PERSISTENT_STACK_MAIN = register_test_main(PERSISTENT_STACK_PATH, """
+int main() {
+    PersistentStack empty;
+    if (!empty.isEmpty() || empty.size() != 0) {
+        cout << "FAIL: New stack should be empty" << endl;
+        return 1;
+    }
+    
+    // Test that push and pop leave older versions unchanged
+    PersistentStack one = empty.push(1);
+    PersistentStack two = one.push(2);
+    PersistentStack other = one.push(20);
+    if (empty.size() != 0 || one.size() != 1 || two.size() != 2 || other.size() != 2) {
+        cout << "FAIL: Versions should keep their own sizes" << endl;
+        return 1;
+    }
+    if (one.peek() != 1 || two.peek() != 2 || other.peek() != 20 || two.pop().peek() != 1) {
+        cout << "FAIL: Versions should keep their own values" << endl;
+        return 1;
+    }
+    
+    // Test snapshot and rollback
+    PersistentStack stack;
+    for (int i = 0; i < 1000; i++) {
+        stack = stack.push(i);
+    }
+    PersistentStack checkpoint = stack;
+    for (int i = 0; i < 500; i++) {
+        stack = stack.pop();
+    }
+    for (int i = 0; i < 100; i++) {
+        stack = stack.push(-i);
+    }
+    if (stack.size() != 600 || stack.peek() != -99) {
+        cout << "FAIL: Expected size 600 with -99 on top" << endl;
+        return 1;
+    }
+    stack = checkpoint;
+    for (int i = 999; i >= 0; i--) {
+        if (stack.peek() != i) {
+            cout << "FAIL: Expected " << i << " after rolling back but got " << stack.peek() << endl;
+            return 1;
+        }
+        stack = stack.pop();
+    }
+    if (!stack.isEmpty() || checkpoint.size() != 1000) {
+        cout << "FAIL: Popping after a rollback should not change the checkpoint" << endl;
+        return 1;
+    }
+    
+    // Test that dropping a long chain does not overflow the call stack
+    {
+        PersistentStack deep;
+        for (int i = 0; i < 1000000; i++) {
+            deep = deep.push(i);
+        }
+    }
+    
+    // Test that peeking or popping an empty stack throws
+    try {
+        empty.pop();
+        cout << "FAIL: pop on an empty stack should throw" << endl;
+        return 1;
+    } catch (const out_of_range&) {
+    }
+    
+    cout << "PASS: PersistentStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_persistent_stack():
+    """Test that persistent stack versions share nodes and stay unchanged."""
+    # Run the test
+    output = run_test_main(PERSISTENT_STACK_PATH, PERSISTENT_STACK_MAIN, "temp_persistent_stack")
+    
+    # Check the output
+    assert "PASS: PersistentStack works correctly" in output, f"Test failed with output: {output}"
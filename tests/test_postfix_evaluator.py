@@ -1,82 +1,18 @@
 """
 Tests for the postfix expression evaluator application (Task 3).
 """
-import subprocess
 import os
-import sys
-import pytest
 
-# Helper function to compile and run a C++ file
-def run_cpp_file(file_path, input_data=None):
-    # Get the directory containing the file
-    file_dir = os.path.dirname(file_path)
-    # Get the file name without extension
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
-    # Compile the file
-    compile_result = subprocess.run(
-        ["g++", "-o", os.path.join(file_dir, file_name), file_path],
-        capture_output=True,
-        text=True
-    )
-    if compile_result.returncode != 0:
-        return f"Compilation error: {compile_result.stderr}"
-    
-    # Run the compiled file
-    if input_data:
-        run_result = subprocess.run(
-            [os.path.join(file_dir, file_name)],
-            input=input_data,
-            capture_output=True,
-            text=True
-        )
-    else:
-        run_result = subprocess.run(
-            [os.path.join(file_dir, file_name)],
-            capture_output=True,
-            text=True
-        )
-    
-    # Clean up the compiled file
-    try:
-        os.remove(os.path.join(file_dir, file_name))
-    except:
-        pass
-    
-    if run_result.returncode != 0:
-        return f"Runtime error: {run_result.stderr}"
-    
-    return run_result.stdout
+from harness import register_test_main, repo_path, run_test_main
 
 # Path to the postfix_evaluator.cpp file
-POSTFIX_EVALUATOR_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "applications/postfix_evaluator.cpp")
+POSTFIX_EVALUATOR_PATH = repo_path("applications/postfix_evaluator.cpp")
 
 def test_postfix_evaluator_exists():
     """Test that the postfix_evaluator.cpp file exists."""
     assert os.path.exists(POSTFIX_EVALUATOR_PATH), f"File {POSTFIX_EVALUATOR_PATH} does not exist"
 
-def test_postfix_evaluator_basic():
-    """Test that the postfix evaluator correctly evaluates basic expressions."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(POSTFIX_EVALUATOR_PATH):
-        pytest.skip(f"File {POSTFIX_EVALUATOR_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_postfix_evaluator.cpp")
-    
-    with open(POSTFIX_EVALUATOR_PATH, 'r') as f:
-        evaluator_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = evaluator_code.find("int main()")
-    if main_start == -1:
-        main_start = evaluator_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in postfix_evaluator.cpp")
-    
-    main_end = evaluator_code.rfind("}")
-    
-    test_main = """
+POSTFIX_EVALUATOR_BASIC_MAIN = register_test_main(POSTFIX_EVALUATOR_PATH, """
 int main()
 {
     // Test basic postfix expression evaluations
@@ -108,51 +44,20 @@ int main()
     cout << "PASS: All basic test cases passed" << endl;
     return 0;
 }
-"""
-    
+""")
+
+def test_postfix_evaluator_basic():
+    """Test that the postfix evaluator correctly evaluates basic expressions."""
     # Assuming there's a function called evaluatePostfix
     # If the function has a different name, the test will fail
     
-    modified_code = evaluator_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(POSTFIX_EVALUATOR_PATH, POSTFIX_EVALUATOR_BASIC_MAIN, "temp_postfix_evaluator")
     
     # Check the output
     assert "PASS: All basic test cases passed" in output, f"Test failed with output: {output}"
 
-def test_postfix_evaluator_complex():
-    """Test that the postfix evaluator correctly evaluates complex expressions."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(POSTFIX_EVALUATOR_PATH):
-        pytest.skip(f"File {POSTFIX_EVALUATOR_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_postfix_evaluator_complex.cpp")
-    
-    with open(POSTFIX_EVALUATOR_PATH, 'r') as f:
-        evaluator_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = evaluator_code.find("int main()")
-    if main_start == -1:
-        main_start = evaluator_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in postfix_evaluator.cpp")
-    
-    main_end = evaluator_code.rfind("}")
-    
-    test_main = """
+POSTFIX_EVALUATOR_COMPLEX_MAIN = register_test_main(POSTFIX_EVALUATOR_PATH, """
 int main()
 {
     // Test complex postfix expression evaluations
@@ -186,48 +91,17 @@ int main()
     cout << "PASS: All complex test cases passed" << endl;
     return 0;
 }
-"""
-    
-    modified_code = evaluator_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_postfix_evaluator_complex():
+    """Test that the postfix evaluator correctly evaluates complex expressions."""
     # Run the test
-    output = run_cpp_file(temp_file)
-    
-    # Clean up
-    try:
-        os.remove(temp_file)
-    except:
-        pass
+    output = run_test_main(POSTFIX_EVALUATOR_PATH, POSTFIX_EVALUATOR_COMPLEX_MAIN, "temp_postfix_evaluator_complex")
     
     # Check the output
     assert "PASS: All complex test cases passed" in output, f"Test failed with output: {output}"
 
-def test_postfix_evaluator_error_handling():
-    """Test that the postfix evaluator handles errors correctly."""
-    # Skip if the file doesn't exist
-    if not os.path.exists(POSTFIX_EVALUATOR_PATH):
-        pytest.skip(f"File {POSTFIX_EVALUATOR_PATH} does not exist")
-    
-    # Create a temporary file with test cases
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_postfix_evaluator_error.cpp")
-    
-    with open(POSTFIX_EVALUATOR_PATH, 'r') as f:
-        evaluator_code = f.read()
-    
-    # Find the main function and replace it with our test main
-    main_start = evaluator_code.find("int main()")
-    if main_start == -1:
-        main_start = evaluator_code.find("int main ()")
-    
-    if main_start == -1:
-        pytest.skip("Could not find main function in postfix_evaluator.cpp")
-    
-    main_end = evaluator_code.rfind("}")
-    
-    test_main = """
+POSTFIX_EVALUATOR_ERROR_HANDLING_MAIN = register_test_main(POSTFIX_EVALUATOR_PATH, """
 int main()
 {
     // Test error handling for postfix expression evaluation
@@ -263,15 +137,12 @@ int main()
     cout << "PASS: Error handling test completed" << endl;
     return 0;
 }
-"""
-    
-    modified_code = evaluator_code[:main_start] + test_main
-    
-    with open(temp_file, 'w') as f:
-        f.write(modified_code)
-    
+""")
+
+def test_postfix_evaluator_error_handling():
+    """Test that the postfix evaluator handles errors correctly."""
     # Run the test
-    output = run_cpp_file(temp_file)
+    output = run_test_main(POSTFIX_EVALUATOR_PATH, POSTFIX_EVALUATOR_ERROR_HANDLING_MAIN, "temp_postfix_evaluator_error")
     
     # We don't assert here because the implementation might handle errors differently
     # Just check if the test ran without crashing
@@ -0,0 +1,86 @@
+"""
+Tests for the sliding window aggregates built on two stacks.
+"""
+import os
+
+from harness import register_test_main, repo_path, run_test_main
+
+# Path to the sliding_window.cpp file
+SLIDING_WINDOW_PATH = repo_path("advanced/sliding_window.cpp")
+
+def test_sliding_window_exists():
+    """Test that the sliding_window.cpp file exists."""
+    assert os.path.exists(SLIDING_WINDOW_PATH), f"File {SLIDING_WINDOW_PATH} does not exist"
+
+SLIDING_WINDOW_AGGREGATES_MAIN = register_test_main(SLIDING_WINDOW_PATH, """
+#include <string>
+
+int main()
+{
+    // Compare every window against recomputing it, for several window sizes
+    vector<int> values;
+    unsigned int seed = 2024;
+    for (int i = 0; i < 3000; i++) {
+        seed = seed * 1103515245 + 12345;
+        values.push_back((int) (seed >> 8) % 100000 - 50000);
+    }
+    vector<long long> wide(values.begin(), values.end());
+    for (size_t window : {1, 2, 7, 64, 1000, 3000}) {
+        vector<int> minimums = slidingAggregates(values, window, MinOf<int>());
+        vector<int> maximums = slidingAggregates(values, window, MaxOf<int>());
+        vector<long long> sums = slidingAggregates(wide, window, plus<long long>());
+        if (minimums.size() != values.size() - window + 1) {
+            cout << "FAIL: Expected " << values.size() - window + 1 << " windows of " << window << endl;
+            return 1;
+        }
+        for (size_t i = 0; i < minimums.size(); i++) {
+            int low = *min_element(values.begin() + i, values.begin() + i + window);
+            int high = *max_element(values.begin() + i, values.begin() + i + window);
+            long long sum = 0;
+            for (size_t j = i; j < i + window; j++) {
+                sum += values[j];
+            }
+            if (minimums[i] != low || maximums[i] != high || sums[i] != sum) {
+                cout << "FAIL: Wrong aggregate for window " << i << " of size " << window << endl;
+                return 1;
+            }
+        }
+    }
+    if (!slidingAggregates(values, 3001, MinOf<int>()).empty()) {
+        cout << "FAIL: A window larger than the input should give no aggregates" << endl;
+        return 1;
+    }
+    
+    // Test that values are combined from oldest to newest
+    WindowAggregator<string, plus<string>> text;
+    for (string part : {"a", "b", "c", "d"}) {
+        text.push(part);
+    }
+    text.evict();
+    text.push("e");
+    if (text.query() != "bcde" || text.size() != 4) {
+        cout << "FAIL: Expected bcde but got " << text.query() << endl;
+        return 1;
+    }
+    
+    // Test that evicting or querying an empty window throws
+    WindowAggregator<int, MinOf<int>> empty;
+    try {
+        empty.query();
+        cout << "FAIL: query on an empty window should throw" << endl;
+        return 1;
+    } catch (const out_of_range&) {
+    }
+    
+    cout << "PASS: Sliding window aggregates are correct" << endl;
+    return 0;
+}
+""")
+
+def test_sliding_window_aggregates():
+    """Test min, max, sum and an order-sensitive operation against recomputing every window."""
+    # Run the test
+    output = run_test_main(SLIDING_WINDOW_PATH, SLIDING_WINDOW_AGGREGATES_MAIN, "temp_sliding_window_aggregates")
+    
+    # Check the output
+    assert "PASS: Sliding window aggregates are correct" in output, f"Test failed with output: {output}"
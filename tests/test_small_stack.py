@@ -0,0 +1,105 @@
+"""
+Tests for the small-buffer stack implementation.
+"""
+import os
+
+from harness import register_test_main, repo_path, run_test_main
+
+# Path to the small_stack.cpp file
+SMALL_STACK_PATH = repo_path("implementations/small_stack.cpp")
+
+def test_small_stack_exists():
+    """Test that the small_stack.cpp file exists."""
+    assert os.path.exists(SMALL_STACK_PATH), f"File {SMALL_STACK_PATH} does not exist"
+
+SMALL_STACK_MAIN = register_test_main(SMALL_STACK_PATH, """
+#include <string>
+
+int main()
+{
+    // Test shallow stacks stay inside the object
+    SmallStack<char, 8> brackets;
+    string expression = "{[()()]}";
+    for (char c : expression) {
+        if (c == '(' || c == '[' || c == '{') {
+            brackets.push(c);
+        } else {
+            char open = brackets.pop();
+            if ((c == ')' && open != '(') || (c == ']' && open != '[') || (c == '}' && open != '{')) {
+                cout << "FAIL: Brackets should match" << endl;
+                return 1;
+            }
+        }
+    }
+    if (!brackets.isEmpty() || !brackets.isInline()) {
+        cout << "FAIL: A shallow stack should be empty and never leave the inline buffer" << endl;
+        return 1;
+    }
+    
+    // Test spilling to the heap keeps LIFO order for non-trivial types
+    SmallStack<string, 4> words;
+    for (int i = 0; i < 100; i++) {
+        words.push("word " + to_string(i));
+    }
+    if (words.isInline() || words.size() != 100 || words.peek() != "word 99") {
+        cout << "FAIL: A deep stack should spill to the heap and keep its elements" << endl;
+        return 1;
+    }
+    
+    // Test copies and moves
+    SmallStack<string, 4> copy = words;
+    SmallStack<string, 4> moved = std::move(words);
+    if (!words.isEmpty() || copy.size() != 100 || moved.size() != 100) {
+        cout << "FAIL: Copy should duplicate and move should steal the elements" << endl;
+        return 1;
+    }
+    for (int i = 99; i >= 0; i--) {
+        if (moved.pop() != "word " + to_string(i) || copy.pop() != "word " + to_string(i)) {
+            cout << "FAIL: Expected word " << i << endl;
+            return 1;
+        }
+    }
+    
+    SmallStack<string, 4> small;
+    small.push("a");
+    small.push("b");
+    SmallStack<string, 4> smallMoved = std::move(small);
+    if (smallMoved.pop() != "b" || smallMoved.pop() != "a" || !smallMoved.isInline()) {
+        cout << "FAIL: Moving an inline stack should move its elements" << endl;
+        return 1;
+    }
+    
+    // Test underflow
+    try {
+        smallMoved.pop();
+        cout << "FAIL: pop on an empty SmallStack should throw" << endl;
+        return 1;
+    } catch (const out_of_range&) {
+    }
+    
+    // Test a stack without inline storage
+    SmallStack<int, 0> heapOnly;
+    for (int i = 0; i < 1000; i++) {
+        heapOnly.push(i);
+    }
+    long long sum = 0;
+    while (!heapOnly.isEmpty()) {
+        sum += heapOnly.pop();
+    }
+    if (sum != 499500) {
+        cout << "FAIL: Expected sum 499500 but got " << sum << endl;
+        return 1;
+    }
+    
+    cout << "PASS: SmallStack works correctly" << endl;
+    return 0;
+}
+""")
+
+def test_small_stack():
+    """Test the templated SmallStack with its inline buffer."""
+    # Run the test
+    output = run_test_main(SMALL_STACK_PATH, SMALL_STACK_MAIN, "temp_small_stack")
+    
+    # Check the output
+    assert "PASS: SmallStack works correctly" in output, f"Test failed with output: {output}"
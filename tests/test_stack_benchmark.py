@@ -0,0 +1,120 @@
+"""
+Tests for the Stack benchmark suite.
+"""
+import argparse
+import json
+
+from bench_concurrent_stack import IMPLEMENTATIONS, run_concurrent_benchmarks
+from bench_min_stack import ORDERS, run_min_stack_benchmarks
+from bench_sliding_window import run_sliding_window_benchmarks
+from bench_stack import BACKENDS, WORKLOADS, run_stack_benchmarks
+from benchmarks import (
+    append_history,
+    compare_reports,
+    find_report,
+    finish_report,
+    load_history,
+    summarize,
+)
+
+# Operation counts measured by the regression gate
+GATE_SIZES = (10**3, 10**5)
+
+def test_summarize_reports_median_and_spread():
+    """Test the statistics reported for one benchmark."""
+    result = summarize("stack/push/10", [4.0, 1.0, 3.0, 2.0, 100.0], workload="push", ops=10)
+    assert result["median_ns_per_op"] == 3.0
+    assert result["min_ns_per_op"] == 1.0
+    assert result["max_ns_per_op"] == 100.0
+    assert result["repetitions"] == 5
+    assert result["ops"] == 10
+    assert result["unit"] == "ns/op"
+
+def test_stack_benchmarks_emit_json_report():
+    """Test that a small benchmark run covers every workload and is valid JSON."""
+    report = run_stack_benchmarks(sizes=(1000,), warmup=1, repetitions=3, profile="fast")
+    report = json.loads(json.dumps(report))
+
+    assert report["suite"] == "stack"
+    assert report["profile"] == "fast"
+    assert [(result["backend"], result["workload"]) for result in report["results"]] == [
+        (backend, workload) for backend in BACKENDS for workload in WORKLOADS
+    ]
+    for result in report["results"]:
+        assert result["repetitions"] == 3
+        assert result["median_ns_per_op"] > 0
+        assert result["unit"] == ("ns" if result["workload"] == "push_worst" else "ns/op")
+
+def test_concurrent_benchmarks_emit_json_report():
+    """Test that a small multi-threaded run covers every implementation and thread count."""
+    report = run_concurrent_benchmarks(threads=(1, 3), sizes=(1000,), warmup=0, repetitions=2, profile="fast")
+    report = json.loads(json.dumps(report))
+
+    assert report["suite"] == "concurrent_stack"
+    assert [(result["implementation"], result["threads"]) for result in report["results"]] == [
+        (implementation, threads) for implementation in IMPLEMENTATIONS for threads in (1, 3)
+    ]
+    for result in report["results"]:
+        assert result["median_ns_per_op"] > 0
+
+def test_min_stack_benchmarks_report_memory():
+    """Test that the MinStack benchmark reports the memory of both implementations."""
+    report = run_min_stack_benchmarks(sizes=(1000,), warmup=0, repetitions=2, profile="fast")
+    results = {(result["implementation"], result["order"]): result for result in report["results"]}
+
+    assert set(results) == {(implementation, order) for implementation in ("paired", "transitions")
+                            for order in ORDERS}
+    for order in ORDERS:
+        assert results["transitions", order]["bytes"] <= results["paired", order]["bytes"]
+    assert results["transitions", "random"]["bytes"] < results["paired", "random"]["bytes"]
+
+def test_sliding_window_benchmarks_emit_json_report():
+    """Test that a small sliding window run covers both implementations."""
+    report = run_sliding_window_benchmarks(sizes=(2000,), windows=(8,), operations=("sum",),
+                                           warmup=0, repetitions=2, profile="fast")
+    report = json.loads(json.dumps(report))
+
+    assert report["suite"] == "sliding_window"
+    assert [result["implementation"] for result in report["results"]] == ["two_stack", "recompute"]
+    for result in report["results"]:
+        assert result["median_ns_per_op"] > 0
+
+def test_compare_reports_flags_regressions():
+    """Test that only medians slower than the threshold count as regressions."""
+    def report(commit, push, pop):
+        return {"suite": "stack", "profile": "release", "commit": commit, "results": [
+            {"name": "stack/push/10", "median_ns_per_op": push},
+            {"name": "stack/pop/10", "median_ns_per_op": pop},
+        ]}
+    history = [report("aaa", 1.0, 1.0), report("bbb", 1.05, 2.0)]
+
+    current = find_report(history, "stack", "release")
+    baseline = find_report(history, "stack", "release", exclude_commit=current["commit"])
+    assert baseline["commit"] == "aaa"
+    assert find_report(history, "stack", "debug") is None
+
+    rows = compare_reports(baseline, current, threshold=0.10)
+    assert [(row["name"], row["regression"]) for row in rows] == [
+        ("stack/push/10", False),
+        ("stack/pop/10", True),
+    ]
+
+def test_append_history_round_trip(tmp_path):
+    """Test that stored reports are keyed by commit and read back in order."""
+    path = str(tmp_path / "history.jsonl")
+    append_history({"suite": "stack", "profile": "release", "results": []}, path, commit="aaa")
+    append_history({"suite": "stack", "profile": "release", "results": []}, path, commit="bbb")
+    assert [report["commit"] for report in load_history(path)] == ["aaa", "bbb"]
+
+def test_finish_report_writes_json(tmp_path, capsys):
+    """Test that the shared command-line tail prints the table and writes the report."""
+    report = {"suite": "stack", "profile": "release", "results": [summarize("stack/push/10", [2.0, 1.0])]}
+    path = tmp_path / "report.json"
+    assert finish_report(argparse.Namespace(record=False, json=str(path)), report) is report
+    assert json.loads(path.read_text()) == report
+    assert "stack/push/10" in capsys.readouterr().err
+
+def test_stack_benchmark_regression(benchmark_gate, benchmark_profile):
+    """Test that the Stack benchmarks did not regress against the stored baseline."""
+    report = run_stack_benchmarks(sizes=GATE_SIZES, repetitions=15, profile=benchmark_profile)
+    benchmark_gate(report)
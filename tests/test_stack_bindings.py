@@ -0,0 +1,142 @@
+"""
+Tests for the in-process Python bindings of the basic stack (Task 1).
+"""
+import array
+import ctypes
+import random
+import sys
+import pytest
+
+from stack_bindings import Stack
+
+def test_stack_bindings_basic_operations():
+    """Test push, peek, pop, size and isEmpty through the bindings."""
+    stack = Stack()
+    assert stack.is_empty()
+    assert len(stack) == 0
+
+    stack.push(42)
+    assert stack.peek() == 42
+    assert not stack.is_empty()
+    assert stack.size() == 1
+
+    assert stack.pop() == 42
+    assert stack.is_empty()
+
+    for i in range(10):
+        stack.push(i)
+    assert [stack.pop() for _ in range(10)] == list(range(9, -1, -1))
+
+def test_stack_bindings_empty_stack():
+    """Test that peeking or popping an empty stack raises instead of crashing."""
+    stack = Stack()
+    with pytest.raises(IndexError):
+        stack.peek()
+    with pytest.raises(IndexError):
+        stack.pop()
+
+def test_stack_bindings_randomized_against_list():
+    """Test a long random sequence of operations against a Python list."""
+    rng = random.Random(1234)
+    stack = Stack()
+    model = []
+    for _ in range(200000):
+        op = rng.random()
+        if op < 0.5 or not model:
+            value = rng.randint(-2**31, 2**31 - 1)
+            stack.push(value)
+            model.append(value)
+        elif op < 0.75:
+            assert stack.pop() == model.pop()
+        else:
+            assert stack.peek() == model[-1]
+    assert len(stack) == len(model)
+
+def test_stack_bindings_close_is_idempotent():
+    """Test that a stack can be freed explicitly and again when collected."""
+    stack = Stack()
+    stack.push(1)
+    stack.close()
+    stack.close()
+
+def test_stack_bindings_bulk_operations():
+    """Test push_range and pop_n with array.array and bytes buffers."""
+    stack = Stack()
+    stack.push_range(array.array("i", range(100000)))
+    assert len(stack) == 100000
+    assert stack.peek() == 99999
+
+    popped = stack.pop_n(10)
+    assert popped == array.array("i", range(99999, 99989, -1))
+    assert len(stack.pop_n(10**6)) == 99990
+    assert stack.is_empty()
+    assert len(stack.pop_n(5)) == 0
+
+    stack.push_range(array.array("i", [1, -2, 3]).tobytes())
+    assert list(stack.pop_n(3)) == [3, -2, 1]
+
+    stack.push_range((ctypes.c_int * 3)(4, -5, 6))
+    assert list(stack.pop_n(3)) == [6, -5, 4]
+
+def test_stack_bindings_bulk_push_rejects_other_types():
+    """Test that buffers of anything but C ints are refused."""
+    stack = Stack()
+    with pytest.raises(TypeError):
+        stack.push_range(array.array("d", [1.0, 2.0]))
+    # Integers of the wrong byte order would be pushed garbled
+    swapped = ctypes.c_int32.__ctype_be__ if sys.byteorder == "little" else ctypes.c_int32.__ctype_le__
+    with pytest.raises(TypeError):
+        stack.push_range((swapped * 3)(1, 2, 3))
+    with pytest.raises(ValueError):
+        stack.push_range(b"abc")
+    assert stack.is_empty()
+
+def test_stack_bindings_bulk_push_numpy():
+    """Test push_range with a NumPy int32 array."""
+    numpy = pytest.importorskip("numpy")
+    stack = Stack()
+    stack.push_range(numpy.arange(1000, dtype=numpy.int32))
+    assert list(stack.pop_n(3)) == [999, 998, 997]
+
+def test_stack_bindings_capacity_control():
+    """Test reserve, shrink_to_fit and a shrinking growth policy through the bindings."""
+    stack = Stack()
+    stack.reserve(1000)
+    assert stack.capacity() >= 1000
+    stack.push_range(array.array("i", range(10)))
+    stack.shrink_to_fit()
+    assert stack.capacity() == 10
+
+    shrinking = Stack(shrink_below=0.25)
+    shrinking.push_range(array.array("i", range(100000)))
+    peak = shrinking.capacity()
+    shrinking.pop_n(99000)
+    assert shrinking.capacity() < peak // 4
+    assert shrinking.peek() == 999
+
+    with pytest.raises(ValueError):
+        Stack(growth_factor=1.0)
+    with pytest.raises(ValueError):
+        Stack(shrink_below=0.6)
+
+def test_stack_bindings_snapshot_round_trip(tmp_path):
+    """Test saving a stack to a snapshot file and loading it back."""
+    path = tmp_path / "stack.snap"
+    stack = Stack()
+    stack.push_range(array.array("i", [5, -1, 2**31 - 1, -2**31]))
+    stack.save(path)
+
+    data = path.read_bytes()
+    assert data[:8] == b"STKSNAP\0"
+    assert len(data) == 24 + 4 * 4
+    assert data[24:28] == (5).to_bytes(4, "little")
+
+    loaded = Stack.load(path)
+    assert list(loaded.pop_n(10)) == [-2**31, 2**31 - 1, -1, 5]
+    assert len(stack) == 4
+
+    with pytest.raises(OSError):
+        Stack.load(tmp_path / "missing.snap")
+    path.write_bytes(data[:-1])
+    with pytest.raises(OSError, match="truncated"):
+        Stack.load(path)